@@ -20,6 +20,11 @@ def create_app():
     db.init_app(app)
     CORS(app)
     
+    from .keys import key_manager
+    from .hashing import password_hasher
+    key_manager.init_app(app)
+    password_hasher.init_app(app)
+    
     # Registrar blueprints
     from .routes import auth_bp
     app.register_blueprint(auth_bp)
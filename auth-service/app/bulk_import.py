@@ -0,0 +1,101 @@
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from .models import User
+from . import db
+from .hashing import password_hasher
+import csv
+import io
+import json
+
+TRUE_VALUES = {"1", "true", "yes", "si", "sí"}
+
+def parse_rows(body: str, mimetype: str) -> list:
+    """Convertir el cuerpo NDJSON o CSV en una lista de (fila, dict|error)"""
+    rows = []
+    if mimetype == "text/csv":
+        reader = csv.DictReader(io.StringIO(body))
+        for line_number, record in enumerate(reader, start=2):
+            rows.append((line_number, {key.strip(): (value or "").strip() for key, value in record.items() if key}))
+    else:
+        for line_number, line in enumerate(body.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                rows.append((line_number, "Invalid JSON"))
+                continue
+            rows.append((line_number, record if isinstance(record, dict) else "Row must be a JSON object"))
+    return rows
+
+def _parse_is_admin(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in TRUE_VALUES
+
+def import_users(rows: list, chunk_size: int = 1000) -> list:
+    """Crear usuarios en lote y retornar el resultado por fila.
+
+    Una consulta por bloque para detectar emails existentes, hashing paralelo
+    en el pool de procesos e inserción por bloques con INSERT multi-fila.
+    """
+    results = {}
+    candidates = []
+    seen = set()
+    for line_number, record in rows:
+        if isinstance(record, str):
+            results[line_number] = {"row": line_number, "status": "error", "error": record}
+            continue
+        email = str(record.get("email") or "").strip()
+        password = record.get("password")
+        if not email or "@" not in email or not password:
+            results[line_number] = {"row": line_number, "email": email, "status": "error",
+                                    "error": "Email and password required"}
+        elif email in seen:
+            results[line_number] = {"row": line_number, "email": email, "status": "error",
+                                    "error": "Duplicate email in request"}
+        else:
+            seen.add(email)
+            candidates.append((line_number, email, str(password), _parse_is_admin(record.get("is_admin"))))
+
+    emails = [email for _, email, _, _ in candidates]
+    existing = set()
+    for start in range(0, len(emails), chunk_size):
+        existing.update(
+            email for (email,) in db.session.query(User.email).filter(User.email.in_(emails[start:start + chunk_size]))
+        )
+
+    new_users = []
+    for line_number, email, password, is_admin in candidates:
+        if email in existing:
+            results[line_number] = {"row": line_number, "email": email, "status": "error",
+                                    "error": "Email already registered"}
+        else:
+            new_users.append((line_number, email, password, is_admin))
+
+    hashes = password_hasher.hash_passwords([password for _, _, password, _ in new_users])
+    for start in range(0, len(new_users), chunk_size):
+        chunk = new_users[start:start + chunk_size]
+        values = [
+            {"email": email, "password": hashed, "is_admin": is_admin}
+            for (_, email, _, is_admin), hashed in zip(chunk, hashes[start:start + chunk_size])
+        ]
+        try:
+            db.session.execute(insert(User), values)
+            db.session.commit()
+            for line_number, email, _, _ in chunk:
+                results[line_number] = {"row": line_number, "email": email, "status": "created"}
+        except IntegrityError:
+            # Alguien registró uno de los emails mientras tanto: reintentar fila por fila
+            db.session.rollback()
+            for (line_number, email, _, _), value in zip(chunk, values):
+                try:
+                    db.session.execute(insert(User), [value])
+                    db.session.commit()
+                    results[line_number] = {"row": line_number, "email": email, "status": "created"}
+                except IntegrityError:
+                    db.session.rollback()
+                    results[line_number] = {"row": line_number, "email": email, "status": "error",
+                                            "error": "Email already registered"}
+
+    return [results[line_number] for line_number in sorted(results)]
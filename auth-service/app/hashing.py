@@ -0,0 +1,88 @@
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+import multiprocessing
+import threading
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+def _hash_batch(passwords):
+    return [generate_password_hash(password) for password in passwords]
+
+class HashingPoolSaturated(Exception):
+    """No hay cupo en el pool de hashing; el request debe rechazarse con 503"""
+
+class PasswordHasher:
+    """Ejecuta el KDF de contraseñas en un pool de procesos acotado.
+
+    El hashing es CPU puro, así que en el hilo del request bloquea a todos los
+    demás endpoints (incluido /health). Aquí se limita a ``workers`` procesos
+    con una cola de ``queue_size`` tareas; si la cola está llena se rechaza de
+    inmediato en lugar de acumular latencia.
+    """
+
+    def __init__(self):
+        self.workers = os.cpu_count() or 1
+        self.queue_size = self.workers * 4
+        self.timeout = 10.0
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.workers = app.config.get("HASH_WORKERS") or os.cpu_count() or 1
+        self.queue_size = app.config.get("HASH_QUEUE_SIZE") or self.workers * 4
+        self.timeout = app.config.get("HASH_TIMEOUT", 10.0)
+        # Cupos = procesos ocupados + tareas en espera
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn evita heredar hilos y conexiones del proceso Flask
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                    logger.info(f"Password hashing pool started with {self.workers} workers")
+        return self._executor
+
+    def _submit(self, fn, *args, block: bool = False):
+        if not self._slots.acquire(blocking=block):
+            raise HashingPoolSaturated()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def hash_password(self, password: str) -> str:
+        return self._submit(generate_password_hash, password).result(timeout=self.timeout)
+
+    def verify_password(self, password_hash: str, password: str) -> bool:
+        return self._submit(check_password_hash, password_hash, password).result(timeout=self.timeout)
+
+    def hash_passwords(self, passwords: list, chunk_size: int = 32) -> list:
+        """Hashear muchas contraseñas repartidas entre todos los procesos.
+
+        Se envían como mucho ``workers`` lotes a la vez, para que los cupos de
+        la cola sigan disponibles para /login y /register.
+        """
+        chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+        hashes = []
+        for start in range(0, len(chunks), self.workers):
+            futures = [self._submit(_hash_batch, chunk, block=True) for chunk in chunks[start:start + self.workers]]
+            for future in futures:
+                hashes.extend(future.result(timeout=self.timeout * chunk_size))
+        return hashes
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+password_hasher = PasswordHasher()
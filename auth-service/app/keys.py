@@ -0,0 +1,110 @@
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+class KeyManager:
+    """Administra las llaves RSA con las que se firman y verifican los JWT.
+
+    Las llaves se leen de ``JWT_KEYS_DIR`` (un archivo ``<kid>.pem`` por llave).
+    Para rotar basta con agregar una llave nueva y apuntar ``JWT_ACTIVE_KID`` a
+    ella; las anteriores siguen publicadas en el JWKS hasta que se eliminen.
+    """
+
+    def __init__(self):
+        self.algorithm = "RS256"
+        self.secret_key = None
+        self.active_kid = None
+        self.private_keys = {}
+        self.public_keys = {}
+        self._jwks = {"keys": []}
+
+    def init_app(self, app):
+        self.algorithm = app.config.get("JWT_ALGORITHM", "RS256")
+        self.secret_key = app.config["SECRET_KEY"]
+        if self.algorithm == "RS256":
+            self._load_keys(app.config.get("JWT_KEYS_DIR"), app.config.get("JWT_ACTIVE_KID"))
+
+    def _load_keys(self, keys_dir, active_kid):
+        if keys_dir:
+            os.makedirs(keys_dir, exist_ok=True)
+            for filename in sorted(os.listdir(keys_dir)):
+                if filename.endswith(".pem"):
+                    self._load_key_file(os.path.join(keys_dir, filename))
+
+        if not self.private_keys:
+            kid = self._generate_key(keys_dir)
+            if not keys_dir:
+                logger.warning(f"JWT_KEYS_DIR not set, using ephemeral signing key {kid}")
+
+        if active_kid and active_kid in self.private_keys:
+            self.active_kid = active_kid
+        else:
+            if active_kid:
+                logger.warning(f"Signing key {active_kid} not found, using latest key")
+            self.active_kid = sorted(self.private_keys)[-1]
+
+        self._jwks = {"keys": [self._to_jwk(kid, key) for kid, key in sorted(self.public_keys.items())]}
+        logger.info(f"Loaded {len(self.public_keys)} JWT keys, active kid {self.active_kid}")
+
+    def _load_key_file(self, path):
+        kid = os.path.splitext(os.path.basename(path))[0]
+        with open(path, "rb") as fh:
+            data = fh.read()
+        try:
+            private_key = serialization.load_pem_private_key(data, password=None)
+            self.private_keys[kid] = private_key
+            self.public_keys[kid] = private_key.public_key()
+        except ValueError:
+            # Llave retirada: solo se conserva la parte pública para verificar
+            self.public_keys[kid] = serialization.load_pem_public_key(data)
+
+    def _generate_key(self, keys_dir):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        public_der = private_key.public_key().public_bytes(
+            serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        kid = hashlib.sha256(public_der).hexdigest()[:16]
+
+        if keys_dir:
+            path = os.path.join(keys_dir, f"{kid}.pem")
+            with open(path, "wb") as fh:
+                fh.write(private_key.private_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PrivateFormat.PKCS8,
+                    serialization.NoEncryption()
+                ))
+            logger.info(f"Generated JWT signing key {path}")
+
+        self.private_keys[kid] = private_key
+        self.public_keys[kid] = private_key.public_key()
+        return kid
+
+    def _to_jwk(self, kid, public_key):
+        jwk = json.loads(RSAAlgorithm.to_jwk(public_key))
+        jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+        return jwk
+
+    def signing_key(self):
+        """Retorna (kid, llave) con la que se firman los tokens nuevos"""
+        if self.algorithm == "HS256":
+            return None, self.secret_key
+        return self.active_kid, self.private_keys[self.active_kid]
+
+    def verification_key(self, algorithm, kid):
+        """Retorna la llave para verificar un token según su header"""
+        if algorithm == "HS256":
+            return self.secret_key
+        if algorithm == "RS256":
+            return self.public_keys.get(kid)
+        return None
+
+    def jwks(self):
+        return self._jwks
+
+key_manager = KeyManager()
@@ -1,7 +1,33 @@
 from . import db
+import datetime
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(150), unique=True, nullable=False)
     password = db.Column(db.String(512), nullable=False)
-    is_admin = db.Column(db.Boolean, default=False)
\ No newline at end of file
+    is_admin = db.Column(db.Boolean, default=False)
+
+class RefreshToken(db.Model):
+    """Refresh token opaco; solo se guarda su SHA-256.
+
+    Cada rotación crea un token nuevo en la misma familia y marca el anterior
+    como revocado, de modo que reusar un token rotado delata un robo.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
+    token_hash = db.Column(db.String(64), unique=True, nullable=False)
+    family_id = db.Column(db.String(32), nullable=False, index=True)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    revoked_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
+class RevokedToken(db.Model):
+    """jti de access tokens revocados antes de su exp.
+
+    El id autoincremental sirve de cursor para el feed incremental
+    ``GET /revocations?since=``; las filas se purgan al pasar ``expires_at``.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(32), unique=True, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
@@ -1,14 +1,59 @@
-from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
-from .models import User
+from flask import Blueprint, request, jsonify, current_app
+from .models import User, RefreshToken, RevokedToken
 from . import db
+from .hashing import password_hasher, HashingPoolSaturated
+from .keys import key_manager
+from .bulk_import import parse_rows, import_users
+from .tokens import (
+    issue_access_token, decode_access_token, decode_access_tokens,
+    issue_refresh_token, hash_refresh_token, is_revoked, revoke_access_token,
+    TokenRevokedError
+)
 from sqlalchemy import text
+from functools import wraps
 import jwt
 import datetime
-import os
 
 auth_bp = Blueprint("auth", __name__)
 
+# Máximo de tokens por llamada a /me/batch
+MAX_BATCH_TOKENS = 100
+# Máximo de entradas por página de /revocations
+MAX_REVOCATIONS_PAGE = 1000
+
+def _user_claims(payload):
+    # CAMBIO: Usar "id" en lugar de "user_id" para compatibilidad
+    return {
+        "id": payload["id"],  # CAMBIO: "id" en lugar de "user_id"
+        "email": payload["email"],
+        "is_admin": payload["is_admin"]
+    }
+
+def _require_admin(f):
+    """Decorador: exige un access token válido de administrador"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        auth_header = request.headers.get("Authorization", "")
+        if not auth_header.startswith("Bearer "):
+            return jsonify({"error": "Token required"}), 401
+        try:
+            payload = decode_access_token(auth_header.replace("Bearer ", ""))
+        except jwt.InvalidTokenError:
+            return jsonify({"error": "Invalid token"}), 401
+        if is_revoked(payload):
+            return jsonify({"error": "Token revoked"}), 401
+        if not payload.get("is_admin"):
+            return jsonify({"error": "Admin privileges required"}), 403
+        return f(*args, **kwargs)
+    
+    return decorated_function
+
+def _hashing_overloaded():
+    """Respuesta rápida cuando el pool de hashing está saturado"""
+    response = jsonify({"error": "Service busy, try again later"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
 @auth_bp.route("/register", methods=["POST"])
 def register():
     data = request.get_json()
@@ -18,7 +63,11 @@ def register():
     if User.query.filter_by(email=data["email"]).first():
         return jsonify({"error": "Email already registered"}), 409
     
-    hashed = generate_password_hash(data["password"])
+    try:
+        hashed = password_hasher.hash_password(data["password"])
+    except (HashingPoolSaturated, TimeoutError):
+        return _hashing_overloaded()
+    
     new_user = User(
         email=data["email"], 
         password=hashed, 
@@ -29,6 +78,31 @@ def register():
     
     return jsonify({"message": "User registered successfully"}), 201
 
+@auth_bp.route("/users/bulk", methods=["POST"])
+@_require_admin
+def bulk_import_users():
+    """Alta masiva de usuarios desde NDJSON o CSV (email,password,is_admin)"""
+    rows = parse_rows(request.get_data(as_text=True), request.mimetype)
+    if not rows:
+        return jsonify({"error": "No rows provided"}), 400
+    
+    max_rows = current_app.config.get("BULK_IMPORT_MAX_ROWS", 10000)
+    if len(rows) > max_rows:
+        return jsonify({"error": f"At most {max_rows} rows per request"}), 413
+    
+    try:
+        results = import_users(rows, chunk_size=current_app.config.get("BULK_IMPORT_CHUNK_SIZE", 1000))
+    except (HashingPoolSaturated, TimeoutError):
+        # Nada quedó insertado: el hashing ocurre antes del primer INSERT
+        db.session.rollback()
+        return _hashing_overloaded()
+    created = sum(1 for result in results if result["status"] == "created")
+    return jsonify({
+        "created": created,
+        "failed": len(results) - created,
+        "results": results
+    }), 200
+
 @auth_bp.route("/login", methods=["POST"])
 def login():
     data = request.get_json()
@@ -36,19 +110,59 @@ def login():
         return jsonify({"error": "Email and password required"}), 400
     
     user = User.query.filter_by(email=data["email"]).first()
-    if not user or not check_password_hash(user.password, data["password"]):
+    if not user:
+        return jsonify({"error": "Invalid credentials"}), 401
+    
+    try:
+        valid = password_hasher.verify_password(user.password, data["password"])
+    except (HashingPoolSaturated, TimeoutError):
+        return _hashing_overloaded()
+    if not valid:
         return jsonify({"error": "Invalid credentials"}), 401
     
     # CAMBIO: Usar "id" en lugar de "user_id" y "token" en lugar de "access_token"
-    token = jwt.encode({
-        "id": user.id,  # CAMBIO: "id" en lugar de "user_id"
-        "email": user.email,
-        "is_admin": user.is_admin,
-        "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=1)
-    }, os.getenv("SECRET_KEY"), algorithm="HS256")
+    token = issue_access_token(user)
+    refresh_token = issue_refresh_token(user)
+    db.session.commit()
     
     # CAMBIO: Retornar "token" en lugar de "access_token"
-    return jsonify({"token": token}), 200
+    return jsonify({"token": token, "refresh_token": refresh_token}), 200
+
+@auth_bp.route("/refresh", methods=["POST"])
+def refresh():
+    """Canjear un refresh token por un access token nuevo (sin recalcular el KDF)"""
+    data = request.get_json(silent=True)
+    refresh_token = data.get("refresh_token") if isinstance(data, dict) else None
+    if not isinstance(refresh_token, str) or not refresh_token:
+        return jsonify({"error": "Refresh token required"}), 400
+    
+    row = db.session.query(RefreshToken, User).join(User, RefreshToken.user_id == User.id).filter(
+        RefreshToken.token_hash == hash_refresh_token(refresh_token)
+    ).first()
+    if not row:
+        return jsonify({"error": "Invalid refresh token"}), 401
+    
+    stored, user = row
+    now = datetime.datetime.utcnow()
+    if stored.expires_at <= now:
+        return jsonify({"error": "Refresh token expired"}), 401
+    
+    # Rotación condicional: solo un request concurrente puede consumir el token
+    consumed = RefreshToken.query.filter(
+        RefreshToken.id == stored.id, RefreshToken.revoked_at.is_(None)
+    ).update({"revoked_at": now}, synchronize_session=False)
+    if not consumed:
+        # Reuso de un token ya rotado: se revoca toda la familia
+        RefreshToken.query.filter(
+            RefreshToken.family_id == stored.family_id, RefreshToken.revoked_at.is_(None)
+        ).update({"revoked_at": now}, synchronize_session=False)
+        db.session.commit()
+        return jsonify({"error": "Invalid refresh token"}), 401
+    
+    refresh_token = issue_refresh_token(user, stored.family_id)
+    db.session.commit()
+    
+    return jsonify({"token": issue_access_token(user), "refresh_token": refresh_token}), 200
 
 @auth_bp.route("/me", methods=["GET"])
 def me():
@@ -58,19 +172,105 @@ def me():
     
     token = auth_header.replace("Bearer ", "")
     try:
-        payload = jwt.decode(token, os.getenv("SECRET_KEY"), algorithms=["HS256"])
+        payload = decode_access_token(token)
     except jwt.ExpiredSignatureError:
         return jsonify({"error": "Token expired"}), 401
     except jwt.InvalidTokenError:
         return jsonify({"error": "Invalid token"}), 403
     
-    # CAMBIO: Usar "id" en lugar de "user_id" para compatibilidad
+    if is_revoked(payload):
+        return jsonify({"error": "Token revoked"}), 401
+    
+    return jsonify(_user_claims(payload))
+
+@auth_bp.route("/me/batch", methods=["POST"])
+def me_batch():
+    """Verificar varios tokens en una sola llamada"""
+    data = request.get_json(silent=True)
+    tokens = data.get("tokens") if isinstance(data, dict) else None
+    if not isinstance(tokens, list) or not all(isinstance(token, str) for token in tokens):
+        return jsonify({"error": "tokens must be a list of strings"}), 400
+    if len(tokens) > MAX_BATCH_TOKENS:
+        return jsonify({"error": f"At most {MAX_BATCH_TOKENS} tokens per request"}), 400
+    
+    results = []
+    for result in decode_access_tokens(tokens):
+        if isinstance(result, jwt.ExpiredSignatureError):
+            results.append({"valid": False, "error": "Token expired"})
+        elif isinstance(result, TokenRevokedError):
+            results.append({"valid": False, "error": "Token revoked"})
+        elif isinstance(result, jwt.InvalidTokenError):
+            results.append({"valid": False, "error": "Invalid token"})
+        else:
+            results.append({"valid": True, "claims": _user_claims(result)})
+    
+    return jsonify({"results": results})
+
+@auth_bp.route("/logout", methods=["POST"])
+def logout():
+    """Revocar el access token actual y, si se envía, la familia del refresh token"""
+    auth_header = request.headers.get("Authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return jsonify({"error": "Token required"}), 401
+    
+    try:
+        payload = decode_access_token(auth_header.replace("Bearer ", ""))
+    except jwt.ExpiredSignatureError:
+        return jsonify({"error": "Token expired"}), 401
+    except jwt.InvalidTokenError:
+        return jsonify({"error": "Invalid token"}), 403
+    
+    # El cuerpo es opcional; si viene, se valida antes de revocar nada
+    data = request.get_json(silent=True)
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    refresh_token = data.get("refresh_token")
+    if refresh_token is not None and not isinstance(refresh_token, str):
+        return jsonify({"error": "refresh_token must be a string"}), 400
+    
+    revoke_access_token(payload)
+    
+    if refresh_token:
+        stored = RefreshToken.query.filter_by(token_hash=hash_refresh_token(refresh_token)).first()
+        if stored and stored.user_id == payload["id"]:
+            RefreshToken.query.filter(
+                RefreshToken.family_id == stored.family_id, RefreshToken.revoked_at.is_(None)
+            ).update({"revoked_at": datetime.datetime.utcnow()}, synchronize_session=False)
+    
+    db.session.commit()
+    return jsonify({"message": "Logged out successfully"}), 200
+
+@auth_bp.route("/revocations", methods=["GET"])
+def revocations():
+    """Feed incremental de jti revocados y aún no expirados"""
+    try:
+        since = int(request.args.get("since", 0))
+    except ValueError:
+        return jsonify({"error": "since must be an integer cursor"}), 400
+    
+    rows = RevokedToken.query.filter(
+        RevokedToken.id > since,
+        RevokedToken.expires_at > datetime.datetime.utcnow()
+    ).order_by(RevokedToken.id).limit(MAX_REVOCATIONS_PAGE).all()
+    
     return jsonify({
-        "id": payload["id"],  # CAMBIO: "id" en lugar de "user_id"
-        "email": payload["email"],
-        "is_admin": payload["is_admin"]
+        "revocations": [
+            {"jti": row.jti, "exp": int(row.expires_at.replace(tzinfo=datetime.timezone.utc).timestamp())}
+            for row in rows
+        ],
+        "cursor": rows[-1].id if rows else since,
+        "has_more": len(rows) == MAX_REVOCATIONS_PAGE
     })
 
+@auth_bp.route("/.well-known/jwks.json", methods=["GET"])
+def jwks():
+    """Llaves públicas para que los servicios verifiquen los tokens localmente"""
+    response = jsonify(key_manager.jwks())
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return response
+
 @auth_bp.route("/health", methods=["GET"])
 def health():
     try:
@@ -0,0 +1,118 @@
+from flask import current_app
+from . import db
+from .keys import key_manager
+from .models import RefreshToken, RevokedToken
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+import jwt
+import datetime
+import hashlib
+import secrets
+import uuid
+
+# Serializa las altas en revoked_token (ver revoke_access_token)
+REVOCATION_LOCK_ID = 5190263847
+
+class TokenRevokedError(jwt.InvalidTokenError):
+    """El token fue revocado antes de su expiración"""
+
+def issue_access_token(user) -> str:
+    """Emitir un access token firmado para el usuario"""
+    kid, key = key_manager.signing_key()
+    minutes = current_app.config.get("JWT_ACCESS_TOKEN_MINUTES", 60)
+    payload = {
+        "id": user.id,
+        "email": user.email,
+        "is_admin": user.is_admin,
+        "jti": uuid.uuid4().hex,
+        "exp": datetime.datetime.utcnow() + datetime.timedelta(minutes=minutes)
+    }
+    headers = {"kid": kid} if kid else None
+    return jwt.encode(payload, key, algorithm=key_manager.algorithm, headers=headers)
+
+def decode_access_token(token: str) -> dict:
+    """Verificar firma y expiración de un token.
+
+    Acepta tokens RS256 (por kid) y los HS256 emitidos antes de la rotación a
+    llaves asimétricas. Lanza las excepciones de PyJWT si el token no es válido.
+    """
+    return _decode_with_keys(token, {})
+
+def decode_access_tokens(tokens: list) -> list:
+    """Verificar varios tokens en una pasada compartiendo la búsqueda de llaves.
+
+    Retorna, en el mismo orden, los claims de cada token o la excepción de
+    PyJWT que lo invalida (incluidos los tokens revocados).
+    """
+    keys = {}
+    results = []
+    for token in tokens:
+        try:
+            results.append(_decode_with_keys(token, keys))
+        except jwt.InvalidTokenError as e:
+            results.append(e)
+    
+    # Una sola consulta para todos los jti del lote
+    jtis = {claims["jti"] for claims in results if isinstance(claims, dict) and claims.get("jti")}
+    revoked = set()
+    if jtis:
+        revoked = {row.jti for row in RevokedToken.query.filter(RevokedToken.jti.in_(jtis))}
+    return [
+        TokenRevokedError("Token revoked") if isinstance(claims, dict) and claims.get("jti") in revoked else claims
+        for claims in results
+    ]
+
+def is_revoked(claims: dict) -> bool:
+    jti = claims.get("jti")
+    return bool(jti) and RevokedToken.query.filter_by(jti=jti).first() is not None
+
+def revoke_access_token(claims: dict):
+    """Agregar el jti del token a la denylist; el commit queda a cargo del llamador"""
+    if not claims.get("jti"):
+        return
+    # El id es el cursor de /revocations y se asigna al insertar, no al
+    # confirmar: sin este lock, un /logout que confirma tarde quedaría detrás
+    # de un cursor ya entregado. Con las altas serializadas hasta el commit,
+    # toda fila aún no visible tiene un id mayor que las ya visibles.
+    if db.session.get_bind().dialect.name == "postgresql":
+        db.session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": REVOCATION_LOCK_ID})
+    # Savepoint: si otro /logout con el mismo token ganó la carrera, el jti
+    # único falla solo aquí y la transacción del llamador sigue en pie
+    try:
+        with db.session.begin_nested():
+            db.session.add(RevokedToken(
+                jti=claims["jti"],
+                expires_at=datetime.datetime.utcfromtimestamp(claims["exp"])
+            ))
+    except IntegrityError:
+        pass
+    # Las entradas vencidas ya no sirven: el token expiró por sí solo
+    RevokedToken.query.filter(RevokedToken.expires_at < datetime.datetime.utcnow()).delete(
+        synchronize_session=False
+    )
+
+def _decode_with_keys(token: str, keys: dict) -> dict:
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get("alg")
+    lookup = (algorithm, header.get("kid"))
+    if lookup not in keys:
+        keys[lookup] = key_manager.verification_key(*lookup)
+    key = keys[lookup]
+    if key is None:
+        raise jwt.InvalidTokenError("Unknown signing key")
+    return jwt.decode(token, key, algorithms=[algorithm])
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def issue_refresh_token(user, family_id: str = None) -> str:
+    """Crear un refresh token para el usuario; el commit queda a cargo del llamador"""
+    token = secrets.token_urlsafe(32)
+    days = current_app.config.get("JWT_REFRESH_TOKEN_DAYS", 30)
+    db.session.add(RefreshToken(
+        user_id=user.id,
+        token_hash=hash_refresh_token(token),
+        family_id=family_id or secrets.token_hex(16),
+        expires_at=datetime.datetime.utcnow() + datetime.timedelta(days=days)
+    ))
+    return token
@@ -0,0 +1,62 @@
+"""Benchmark de logins/seg del KDF de contraseñas según el número de procesos.
+
+Uso:
+    python benchmarks/hashing_benchmark.py [--logins 200] [--max-workers N]
+
+Mide check_password_hash (el costo dominante de /login) ejecutado en línea
+y en pools de 1, 2, 4, ... procesos hasta el número de cores.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+import argparse
+import multiprocessing
+import os
+import time
+
+def _worker_counts(max_workers):
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    return counts
+
+def bench_inline(password_hash, logins):
+    start = time.perf_counter()
+    for _ in range(logins):
+        check_password_hash(password_hash, "benchmark-password")
+    return logins / (time.perf_counter() - start)
+
+def bench_pool(password_hash, logins, workers):
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        # Calentar los procesos para no medir el arranque
+        list(executor.map(check_password_hash, [password_hash] * workers, ["x"] * workers))
+        start = time.perf_counter()
+        futures = [
+            executor.submit(check_password_hash, password_hash, "benchmark-password")
+            for _ in range(logins)
+        ]
+        for future in futures:
+            future.result()
+        return logins / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    password_hash = generate_password_hash("benchmark-password")
+    print(f"KDF: {password_hash.split('$')[0]}  cores: {os.cpu_count()}  logins: {args.logins}")
+    print(f"{'workers':>8} {'logins/s':>10} {'speedup':>8}")
+
+    baseline = bench_inline(password_hash, args.logins)
+    print(f"{'inline':>8} {baseline:10.1f} {1.0:8.2f}")
+    for workers in _worker_counts(args.max_workers):
+        rate = bench_pool(password_hash, args.logins, workers)
+        print(f"{workers:>8} {rate:10.1f} {rate / baseline:8.2f}")
+
+if __name__ == "__main__":
+    main()
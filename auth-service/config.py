@@ -15,4 +15,20 @@ class Config:
             'options': '-c statement_timeout=15000'
         }
     }
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    
+    # JWT: RS256 permite que los demás servicios verifiquen tokens con el JWKS
+    JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "RS256")
+    JWT_KEYS_DIR = os.getenv("JWT_KEYS_DIR")
+    JWT_ACTIVE_KID = os.getenv("JWT_ACTIVE_KID")
+    JWT_ACCESS_TOKEN_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_MINUTES", 60))
+    JWT_REFRESH_TOKEN_DAYS = int(os.getenv("JWT_REFRESH_TOKEN_DAYS", 30))
+    
+    # Pool de procesos para el KDF de contraseñas (por defecto, un proceso por core)
+    HASH_WORKERS = int(os.getenv("HASH_WORKERS", 0)) or None
+    HASH_QUEUE_SIZE = int(os.getenv("HASH_QUEUE_SIZE", 0)) or None
+    HASH_TIMEOUT = float(os.getenv("HASH_TIMEOUT", 10))
+    
+    # Alta masiva de usuarios (/users/bulk)
+    BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", 10000))
+    BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", 1000))
\ No newline at end of file
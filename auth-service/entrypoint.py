@@ -1,6 +1,7 @@
 import os  
 import time
 import logging
+import migrate
 from app import create_app, db
 from app.models import User
 from consul_register import ConsulServiceRegistry
@@ -9,6 +10,8 @@ from consul_register import ConsulServiceRegistry
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
 def wait_for_database():
     """Espera a que la base de datos esté disponible usando SQLAlchemy"""
     from sqlalchemy import create_engine
@@ -39,11 +42,10 @@ def main():
     # Crear aplicación
     app = create_app()
     
-    # Crear tablas
+    # Aplicar migraciones y crear el admin
     with app.app_context():
         try:
-            db.create_all()
-            logger.info("Database tables created")
+            migrate.run(MIGRATIONS_DIR, {'dsn': os.getenv("DATABASE_URL")})
             
             # Crear usuario admin si no existe
             if not User.query.filter_by(email="admin@example.com").first():
@@ -58,7 +60,7 @@ def main():
                 logger.info("Admin user created")
                 
         except Exception as e:
-            logger.error(f"Error creating tables: {str(e)}")
+            logger.error(f"Error migrating database: {str(e)}")
             exit(1)
     
     # Registrar en Consul
@@ -0,0 +1,7 @@
+-- Usuarios. IF NOT EXISTS: las bases creadas con db.create_all() ya tienen esta tabla.
+CREATE TABLE IF NOT EXISTS "user" (
+    id SERIAL PRIMARY KEY,
+    email VARCHAR(150) NOT NULL UNIQUE,
+    password VARCHAR(512) NOT NULL,
+    is_admin BOOLEAN
+);
@@ -0,0 +1,13 @@
+-- Refresh tokens opacos (solo el SHA-256) agrupados por familia de rotación
+CREATE TABLE IF NOT EXISTS refresh_token (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES "user" (id),
+    token_hash VARCHAR(64) NOT NULL UNIQUE,
+    family_id VARCHAR(32) NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    revoked_at TIMESTAMP,
+    created_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_refresh_token_user_id ON refresh_token (user_id);
+CREATE INDEX IF NOT EXISTS ix_refresh_token_family_id ON refresh_token (family_id);
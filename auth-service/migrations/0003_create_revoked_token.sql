@@ -0,0 +1,9 @@
+-- jti de access tokens revocados; el id sirve de cursor para GET /revocations?since=
+CREATE TABLE IF NOT EXISTS revoked_token (
+    id SERIAL PRIMARY KEY,
+    jti VARCHAR(32) NOT NULL UNIQUE,
+    expires_at TIMESTAMP NOT NULL,
+    revoked_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_revoked_token_expires_at ON revoked_token (expires_at);
@@ -0,0 +1,100 @@
+"""Feed /revocations con dos logouts intercalados.
+
+Por defecto corre sobre SQLite; con ``TEST_DATABASE_URL`` apuntando a un
+PostgreSQL de pruebas se ejercita el advisory lock de revoke_access_token
+(las tablas se crean y se borran en esa base).
+"""
+import datetime
+import os
+import threading
+import time
+import uuid
+
+import pytest
+from flask import Flask
+
+from app import db
+from app.routes import auth_bp
+from app.tokens import revoke_access_token
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=os.environ.get('TEST_DATABASE_URL', f"sqlite:///{tmp_path / 'auth.db'}"),
+        SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 5} if os.environ.get('TEST_DATABASE_URL') else {}
+    )
+    db.init_app(app)
+    app.register_blueprint(auth_bp)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+def _claims():
+    exp = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+    return {'jti': uuid.uuid4().hex, 'exp': int(exp.replace(tzinfo=datetime.timezone.utc).timestamp())}
+
+def _feed(client, since):
+    """Leer el feed completo desde ``since``; retorna (jtis, cursor)"""
+    jtis = []
+    while True:
+        page = client.get(f'/revocations?since={since}').get_json()
+        jtis.extend(entry['jti'] for entry in page['revocations'])
+        since = page['cursor']
+        if not page['has_more']:
+            return jtis, since
+
+def test_late_commit_is_not_skipped_by_the_cursor(app):
+    first, second = _claims(), _claims()
+    inserted = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def revoke(claims, before_commit=None):
+        try:
+            with app.app_context():
+                revoke_access_token(claims)
+                db.session.flush()
+                if before_commit:
+                    before_commit()
+                db.session.commit()
+                db.session.remove()
+        except Exception as e:
+            errors.append(e)
+
+    def hold_open():
+        inserted.set()
+        release.wait(10)
+
+    # El primer logout obtiene su id y no confirma hasta que se lo indique
+    slow = threading.Thread(target=revoke, args=(first, hold_open))
+    slow.start()
+    assert inserted.wait(10)
+    # El segundo intenta revocar y confirmar mientras el primero sigue abierto
+    fast = threading.Thread(target=revoke, args=(second,))
+    fast.start()
+    time.sleep(0.3)
+
+    client = app.test_client()
+    seen, cursor = _feed(client, 0)
+
+    release.set()
+    slow.join(10)
+    fast.join(10)
+    assert not errors
+
+    later, _ = _feed(client, cursor)
+    assert sorted(seen + later) == sorted([first['jti'], second['jti']])
+
+def test_revoking_twice_keeps_one_entry(app):
+    claims = _claims()
+    with app.app_context():
+        revoke_access_token(claims)
+        db.session.commit()
+        revoke_access_token(claims)
+        db.session.commit()
+    jtis, _ = _feed(app.test_client(), 0)
+    assert jtis == [claims['jti']]
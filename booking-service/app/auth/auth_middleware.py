@@ -1,44 +1,239 @@
-import requests
-import consul
 import os
+import jwt
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
 from flask import request, jsonify
+from app.auth.batch_verifier import BatchTokenVerifier
+from app.auth.jwks_client import JWKSClient, KeyUnavailableError
+from app.auth.revocation_list import RevocationList
+from app.clients.http_client import http_client
+from app.discovery.load_balancer import load_balancer
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _unverified_claims(token: str) -> dict:
+    # Solo se llama con tokens ya verificados, por eso no se valida la firma
+    try:
+        return jwt.decode(token, options={'verify_signature': False})
+    except jwt.InvalidTokenError:
+        return {}
+
+class TokenCache:
+    """Cache LRU de tokens ya verificados.
+
+    La llave es el SHA-256 del token (nunca se guarda el token en claro) y
+    cada entrada vence a más tardar en el ``exp`` del JWT.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, token: str):
+        """Retorna (usuario, jti) si el token está en cache y vigente"""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, user, jti = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(user), jti
+
+    def put(self, token: str, user: dict, exp=None, jti=None):
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        if expires_at <= time.time():
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, dict(user), jti)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
+
 class AuthMiddleware:
     def __init__(self):
-        self.consul_client = consul.Consul(
-            host=os.environ.get('CONSUL_HOST', 'localhost'),
-            port=int(os.environ.get('CONSUL_PORT', 8500))
+        self.balancer = load_balancer
+        # "local" verifica la firma con el JWKS de auth-service; "remote" consulta /me
+        self.verify_mode = os.environ.get('AUTH_VERIFY_MODE', 'local').lower()
+        self.jwks_client = JWKSClient(
+            self.fetch_jwks,
+            cache_ttl=float(os.environ.get('JWKS_CACHE_TTL', 300)),
+            min_refresh_interval=float(os.environ.get('JWKS_MIN_REFRESH_INTERVAL', 30))
+        )
+        self.token_cache = TokenCache(
+            max_size=int(os.environ.get('AUTH_TOKEN_CACHE_SIZE', 10000)),
+            ttl=float(os.environ.get('AUTH_TOKEN_CACHE_TTL', 300))
+        )
+        # En modo remoto, las verificaciones concurrentes viajan juntas a /me/batch
+        self.remote_batching = os.environ.get('AUTH_REMOTE_BATCHING', 'True').lower() == 'true'
+        self.batch_verifier = BatchTokenVerifier(
+            self.verify_tokens_remotely,
+            max_wait=float(os.environ.get('AUTH_BATCH_MAX_WAIT_MS', 5)) / 1000
+        )
+        self.revocation_list = RevocationList(
+            self.fetch_revocations,
+            capacity=int(os.environ.get('AUTH_REVOCATION_CAPACITY', 100000)),
+            poll_interval=float(os.environ.get('AUTH_REVOCATION_POLL_INTERVAL', 5))
+        )
+    
+    def _get_from_auth_service(self, path: str, headers: dict = None):
+        """GET a una instancia de auth-service elegida por el balanceador"""
+        return self.balancer.request(
+            'auth-service',
+            lambda base_url: http_client.get(f"{base_url}{path}", headers=headers)
+        )
+    
+    def _post_to_auth_service(self, path: str, payload: dict):
+        """POST a una instancia de auth-service elegida por el balanceador"""
+        return self.balancer.request(
+            'auth-service',
+            lambda base_url: http_client.post(f"{base_url}{path}", json=payload)
         )
     
-    def discover_auth_service(self):
-        """Descubrir auth-service vía Consul"""
+    def fetch_jwks(self):
+        """Descargar las llaves públicas de auth-service"""
+        try:
+            response = self._get_from_auth_service('/.well-known/jwks.json')
+            if response is None:
+                return None
+            if response.status_code != 200:
+                logger.warning(f"JWKS request failed with status {response.status_code}")
+                return None
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error fetching JWKS: {e}")
+            return None
+    
+    def fetch_revocations(self, cursor: int):
+        """Obtener la página de jti revocados posteriores a ``cursor``"""
         try:
-            services = self.consul_client.health.service('auth-service', passing=True)
-            if services[1]:
-                service = services[1][0]['Service']
-                return f"http://{service['Address']}:{service['Port']}"
-            else:
-                logger.error("Auth service not found in Consul")
+            response = self._get_from_auth_service(f'/revocations?since={cursor}')
+            if response is None:
+                return None
+            if response.status_code != 200:
+                logger.warning(f"Revocations request failed with status {response.status_code}")
                 return None
+            return response.json()
         except Exception as e:
-            logger.error(f"Error discovering auth service: {e}")
+            logger.error(f"Error fetching revocations: {e}")
             return None
     
     def verify_token(self, token: str):
-        """Verificar token con auth-service"""
-        auth_url = self.discover_auth_service()
-        if not auth_url:
+        """Verificar token (con cache) localmente o, como respaldo, con auth-service"""
+        self.revocation_list.start()
+        cached = self.token_cache.get(token)
+        if cached is not None:
+            user, jti = cached
+            return None if self.revocation_list.is_revoked(jti) else user
+        
+        if self.verify_mode == 'local':
+            try:
+                user = self.verify_token_locally(token)
+            except KeyUnavailableError as e:
+                logger.warning(f"Local token verification unavailable, using auth-service: {e}")
+                user = self.verify_token_remotely(token)
+        else:
+            user = self.verify_token_remotely(token)
+        
+        if user:
+            claims = _unverified_claims(token)
+            if self.revocation_list.is_revoked(claims.get('jti')):
+                return None
+            self.token_cache.put(token, user, claims.get('exp'), claims.get('jti'))
+        return user
+    
+    def verify_token_locally(self, token: str):
+        """Verificar firma y expiración del JWT sin salir del proceso"""
+        try:
+            payload = self.jwks_client.decode(token)
+        except jwt.InvalidTokenError as e:
+            logger.info(f"Rejected token: {e}")
             return None
         
+        return {
+            'id': payload['id'],
+            'email': payload['email'],
+            'is_admin': payload['is_admin']
+        }
+    
+    def verify_token_remotely(self, token: str):
+        """Verificar token con auth-service, agrupando llamadas concurrentes"""
+        if self.remote_batching:
+            return self.batch_verifier.verify(token)
+        return self.verify_single_token_remotely(token)
+    
+    def verify_tokens_remotely(self, tokens: list) -> list:
+        """Verificar varios tokens con una sola llamada a /me/batch"""
+        try:
+            response = self._post_to_auth_service('/me/batch', {'tokens': tokens})
+            if response is None:
+                return [None] * len(tokens)
+            if response.status_code == 404:
+                # auth-service sin /me/batch: verificar uno por uno
+                return [self.verify_single_token_remotely(token) for token in tokens]
+            if response.status_code != 200:
+                logger.warning(f"Token batch verification failed with status {response.status_code}")
+                return [None] * len(tokens)
+            return [
+                result['claims'] if result.get('valid') else None
+                for result in response.json()['results']
+            ]
+        except Exception as e:
+            logger.error(f"Error verifying tokens: {e}")
+            return [None] * len(tokens)
+    
+    def verify_single_token_remotely(self, token: str):
+        """Verificar token con auth-service"""
         try:
             headers = {'Authorization': f'Bearer {token}'}
-            response = requests.get(f"{auth_url}/me", headers=headers, timeout=5)
+            response = self._get_from_auth_service('/me', headers=headers)
             
-            if response.status_code == 200:
+            if response is not None and response.status_code == 200:
                 return response.json()
             return None
         except Exception as e:
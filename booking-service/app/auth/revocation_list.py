@@ -0,0 +1,127 @@
+import hashlib
+import math
+import threading
+import time
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class BloomFilter:
+    """Filtro de Bloom de tamaño fijo sobre un bytearray"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.sha256(item.encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:16], 'big') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class RevocationList:
+    """Réplica local de la denylist de ``jti`` de auth-service.
+
+    La consulta es O(1): el filtro de Bloom descarta casi todos los tokens sin
+    tocar el diccionario exacto ``jti -> exp``, que resuelve los falsos
+    positivos. Las entradas se eliminan al pasar su ``exp``, así que la memoria
+    queda acotada por los tokens revocados durante la vida de un access token.
+    Un hilo aplica el feed incremental ``GET /revocations?since=`` y cada
+    ``full_resync_interval`` vuelve a leerlo completo por si algún insert
+    concurrente quedó detrás del cursor.
+    """
+
+    def __init__(self, fetch_delta: Callable[[int], Optional[dict]], capacity: int = 100000,
+                 error_rate: float = 0.001, poll_interval: float = 5, full_resync_interval: float = 300):
+        # fetch_delta(cursor) retorna la página de /revocations o None si falla
+        self.fetch_delta = fetch_delta
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.poll_interval = poll_interval
+        self.full_resync_interval = full_resync_interval
+        self._entries = {}
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._bloom_capacity = capacity
+        self._bloom_items = 0
+        self._cursor = 0
+        self._last_full_sync = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti or jti not in self._bloom:
+            return False
+        exp = self._entries.get(jti)
+        return exp is not None and exp > time.time()
+
+    def start(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='revocation-sync', daemon=True)
+                    self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                logger.error(f"Error syncing revocation list: {e}")
+            self._stopped.wait(self.poll_interval)
+
+    def sync(self):
+        now = time.monotonic()
+        full = self._last_full_sync is None or now - self._last_full_sync >= self.full_resync_interval
+        cursor = 0 if full else self._cursor
+        received = {}
+
+        while True:
+            page = self.fetch_delta(cursor)
+            if page is None:
+                return
+            for entry in page['revocations']:
+                received[entry['jti']] = entry['exp']
+            cursor = page['cursor']
+            if not page.get('has_more'):
+                break
+
+        with self._lock:
+            entries = received if full else {**self._entries, **received}
+            self._apply(entries)
+            self._cursor = cursor
+            if full:
+                self._last_full_sync = now
+
+    def _apply(self, entries: dict):
+        now = time.time()
+        live = {jti: exp for jti, exp in entries.items() if exp > now}
+        # El filtro no admite borrados; se reconstruye cuando la mitad de sus
+        # elementos ya expiró o cuando se supera la capacidad para la que se creó
+        if len(live) > self._bloom_capacity or self._bloom_items > 2 * len(live) + 1000:
+            self._bloom_capacity = max(self.capacity, 2 * len(live))
+            bloom = BloomFilter(self._bloom_capacity, self.error_rate)
+            for jti in live:
+                bloom.add(jti)
+            self._bloom = bloom
+            self._bloom_items = len(live)
+        else:
+            for jti in live.keys() - self._entries.keys():
+                self._bloom.add(jti)
+                self._bloom_items += 1
+        self._entries = live
+
+    def stats(self) -> dict:
+        return {'revoked': len(self._entries), 'cursor': self._cursor, 'bloom_bits': self._bloom.size}
@@ -0,0 +1,75 @@
+import os
+import threading
+import logging
+from http.cookiejar import DefaultCookiePolicy
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+class HttpClient:
+    """Cliente HTTP compartido para las llamadas entre servicios.
+
+    Una sola ``requests.Session`` con un pool keep-alive por upstream
+    (host:puerto), timeouts de conexión y lectura separados y estadísticas
+    de uso de los pools. Es seguro usarla desde varios hilos: la sesión no
+    guarda cookies, que es el único estado mutable que comparte.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 20, pool_block: bool = False,
+                 connect_timeout: float = 2, read_timeout: float = 5):
+        self.timeout = (connect_timeout, read_timeout)
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeout)
+        with self._lock:
+            self.requests += 1
+        try:
+            return self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            with self._lock:
+                self.errors += 1
+            raise
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def stats(self) -> dict:
+        pools = {}
+        container = self.adapter.poolmanager.pools
+        for key in list(container.keys()):
+            pool = container.get(key)
+            if pool is None:
+                continue
+            pools[f"{pool.host}:{pool.port}"] = {
+                'connections_created': pool.num_connections,
+                'requests': pool.num_requests,
+                # La cola de urllib3 se rellena con None como marcadores de cupo
+                'idle_connections': sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0,
+                'max_size': pool.pool.maxsize if pool.pool else 0
+            }
+        with self._lock:
+            return {'requests': self.requests, 'errors': self.errors, 'pools': pools}
+
+http_client = HttpClient(
+    pool_connections=int(os.environ.get('HTTP_POOL_CONNECTIONS', 10)),
+    pool_maxsize=int(os.environ.get('HTTP_POOL_MAXSIZE', 20)),
+    pool_block=os.environ.get('HTTP_POOL_BLOCK', 'False').lower() == 'true',
+    connect_timeout=float(os.environ.get('HTTP_CONNECT_TIMEOUT', 2)),
+    read_timeout=float(os.environ.get('HTTP_READ_TIMEOUT', 5))
+)
@@ -1,41 +1,60 @@
 from flask import Blueprint, request, jsonify
-from app.services.booking_service import BookingService
+from app.services.booking_service import BookingService, SoldOutError
+from app.services.package_replica import PackageReplica
+from app.services.package_service_client import PackageServiceClient
 from app.factories.repository_factory import RepositoryFactory
 from app.auth.auth_middleware import require_auth, require_admin, require_user
-from datetime import datetime
+from datetime import date, datetime
+import os
 import logging
-import requests
 
 logger = logging.getLogger(__name__)
 
 # Crear blueprint
 booking_bp = Blueprint('bookings', __name__)
 
-# Inicializar servicio
-booking_service = BookingService(RepositoryFactory.create_booking_repository())
-
-# URL del package-service
-PACKAGE_SERVICE_URL = "http://package-service:5002"
-
-def package_exists(package_id: str) -> bool:
-    try:
-        url = f"{PACKAGE_SERVICE_URL}/packages/{package_id}"
-        logger.info(f"[package_exists] Consultando URL: {url}")
+# Copia local de paquetes: las lecturas del camino de reserva no salen del proceso
+package_replica = None
+if os.environ.get('PACKAGE_REPLICA_ENABLED', 'true').lower() == 'true':
+    package_replica = PackageReplica(
+        RepositoryFactory.create_package_replica_repository(),
+        PackageServiceClient(),
+        max_staleness=float(os.environ.get('PACKAGE_REPLICA_MAX_STALENESS', 30)),
+        poll_interval=float(os.environ.get('PACKAGE_REPLICA_POLL_INTERVAL', 2)),
+        batch_size=int(os.environ.get('PACKAGE_REPLICA_BATCH_SIZE', 500)),
+        full_resync_interval=float(os.environ.get('PACKAGE_REPLICA_FULL_RESYNC_INTERVAL', 600))
+    )
 
-        response = requests.get(url, timeout=5)
-        logger.info(f"[package_exists] Código respuesta: {response.status_code}")
-        logger.info(f"[package_exists] Contenido respuesta: {response.text}")
-
-        return response.status_code == 200
-    except requests.RequestException as e:
-        logger.warning(f"Error al consultar package-service: {e}")
-        return False
+# Inicializar servicio
+booking_service = BookingService(
+    RepositoryFactory.create_booking_repository(),
+    RepositoryFactory.create_inventory_repository(),
+    package_replica
+)
 
+# Máximo de días por consulta de disponibilidad
+MAX_AVAILABILITY_DAYS = 366
 
 @booking_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({'status': 'ok', 'service': 'booking-service'})
+    health = {'status': 'ok', 'service': 'booking-service'}
+    if package_replica is not None:
+        health['package_replica'] = package_replica.stats()
+    return jsonify(health)
+
+@booking_bp.route('/package-replica/resync', methods=['POST'])
+@require_auth
+@require_admin
+def resync_package_replica():
+    """Volver a armar la copia local de paquetes desde package-service (admin)"""
+    if package_replica is None:
+        return jsonify({'error': 'Package replica is disabled'}), 409
+    try:
+        return jsonify({'message': 'Package replica resynchronized', 'packages': package_replica.resync()})
+    except Exception as e:
+        logger.error(f"Error resynchronizing package replica: {e}")
+        return jsonify({'error': 'Could not resynchronize package replica'}), 502
 
 @booking_bp.route('/bookings', methods=['POST'])
 @require_auth
@@ -60,12 +79,13 @@ def create_booking():
         except ValueError:
             return jsonify({'error': 'Invalid travel_date format. Use ISO format.'}), 400
 
-        # Validar existencia del paquete vía HTTP al package-service
-        if not package_exists(data['package_id']):
+        # Crear la reserva si todo es válido (responde None si el paquete no existe)
+        try:
+            booking = booking_service.create_booking(data, request.current_user)
+        except SoldOutError:
+            return jsonify({'error': 'Not enough seats available for this date'}), 409
+        if not booking:
             return jsonify({'error': 'Package not found'}), 404
-
-        # Crear la reserva si todo es válido
-        booking = booking_service.create_booking(data, request.current_user)
         return jsonify({
             'message': 'Booking created successfully',
             'booking': booking.to_dict()
@@ -104,6 +124,34 @@ def cancel_booking(booking_id):
         logger.error(f"Error cancelling booking: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@booking_bp.route('/packages/<package_id>/availability', methods=['GET'])
+@require_auth
+def get_package_availability(package_id):
+    """Calendario de cupos restantes de un paquete entre start_date y end_date"""
+    try:
+        start_date = request.args.get('start_date')
+        end_date = request.args.get('end_date')
+
+        if not start_date or not end_date:
+            return jsonify({'error': 'start_date and end_date are required'}), 400
+
+        try:
+            start = date.fromisoformat(start_date)
+            end = date.fromisoformat(end_date)
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+
+        if end < start or (end - start).days >= MAX_AVAILABILITY_DAYS:
+            return jsonify({'error': f'Date range must be between 1 and {MAX_AVAILABILITY_DAYS} days'}), 400
+
+        calendar = booking_service.get_availability(package_id, start, end)
+        if calendar is None:
+            return jsonify({'error': 'Package not found'}), 404
+        return jsonify({'package_id': package_id, 'availability': calendar})
+    except Exception as e:
+        logger.error(f"Error getting availability: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @booking_bp.route('/bookings/report', methods=['GET'])
 @require_auth
 @require_admin
@@ -0,0 +1,153 @@
+import os
+import math
+import random
+import threading
+import time
+import logging
+from typing import Callable, Dict, Optional, Tuple
+import requests
+from app.discovery.service_resolver import ServiceInstance, ServiceResolver, service_resolver
+
+logger = logging.getLogger(__name__)
+
+class InstanceStats:
+    """Estado de balanceo de una instancia"""
+
+    def __init__(self):
+        self.outstanding = 0
+        self.ewma_latency = 0.0
+        self.updated_at = time.monotonic()
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+class LoadBalancer:
+    """Balanceo del lado del cliente sobre las instancias del resolver.
+
+    Elige entre dos instancias al azar la de menor costo, con costo =
+    (peticiones en curso + 1) * latencia EWMA. La latencia decae sin tráfico
+    para que una instancia lenta vuelva a probarse. Las instancias que fallan
+    por timeout, error de conexión o 5xx se expulsan temporalmente; cada
+    expulsión consecutiva dura más, hasta ``max_ejection_time``.
+    """
+
+    def __init__(self, resolver: ServiceResolver, ewma_alpha: float = 0.3,
+                 failure_threshold: int = 3, ejection_time: float = 10,
+                 max_ejection_time: float = 120, decay_time: float = 10):
+        self.resolver = resolver
+        self.ewma_alpha = ewma_alpha
+        self.failure_threshold = failure_threshold
+        self.ejection_time = ejection_time
+        self.max_ejection_time = max_ejection_time
+        self.decay_time = decay_time
+        self._stats: Dict[Tuple[str, str], InstanceStats] = {}
+        self._lock = threading.Lock()
+
+    def _get_stats(self, service_name: str, instance: ServiceInstance) -> InstanceStats:
+        key = (service_name, instance.service_id)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = InstanceStats()
+        return stats
+
+    def _latency(self, stats: InstanceStats, now: float) -> float:
+        idle = now - stats.updated_at
+        return stats.ewma_latency * math.exp(-idle / self.decay_time)
+
+    def _cost(self, stats: InstanceStats, now: float) -> float:
+        return (stats.outstanding + 1) * self._latency(stats, now)
+
+    def choose(self, service_name: str) -> Optional[ServiceInstance]:
+        """Reservar una instancia; debe liberarse con ``release``"""
+        instances = self.resolver.get_instances(service_name)
+        if not instances:
+            return None
+
+        with self._lock:
+            now = time.monotonic()
+            candidates = [
+                instance for instance in instances
+                if self._get_stats(service_name, instance).ejected_until <= now
+            ]
+            # Si todas están expulsadas es preferible intentar que no responder
+            if not candidates:
+                candidates = instances
+
+            if len(candidates) == 1:
+                chosen = candidates[0]
+            else:
+                first, second = random.sample(candidates, 2)
+                first_cost = self._cost(self._get_stats(service_name, first), now)
+                second_cost = self._cost(self._get_stats(service_name, second), now)
+                chosen = first if first_cost <= second_cost else second
+
+            self._get_stats(service_name, chosen).outstanding += 1
+            return chosen
+
+    def release(self, service_name: str, instance: ServiceInstance, elapsed: float, failed: bool):
+        """Registrar el resultado de una petición a ``instance``"""
+        with self._lock:
+            now = time.monotonic()
+            stats = self._get_stats(service_name, instance)
+            stats.outstanding = max(stats.outstanding - 1, 0)
+            latency = self._latency(stats, now)
+            stats.ewma_latency = latency + self.ewma_alpha * (elapsed - latency)
+            stats.updated_at = now
+
+            if not failed:
+                stats.consecutive_failures = 0
+                stats.ejections = 0
+                return
+            # Fallas de peticiones que ya estaban en curso al expulsarla
+            if stats.ejected_until > now:
+                return
+
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= self.failure_threshold:
+                stats.ejections += 1
+                duration = min(self.ejection_time * stats.ejections, self.max_ejection_time)
+                stats.ejected_until = now + duration
+                stats.consecutive_failures = 0
+                logger.warning(f"Ejecting {service_name} instance {instance.service_id} for {duration:.0f}s")
+
+    def request(self, service_name: str, send: Callable[[str], requests.Response]) -> Optional[requests.Response]:
+        """Ejecutar ``send(base_url)`` contra la instancia elegida.
+
+        Retorna None si no hay instancias. Los errores de conexión y timeouts
+        se registran como fallas y se propagan al llamador.
+        """
+        instance = self.choose(service_name)
+        if instance is None:
+            logger.error(f"No instances of {service_name} available")
+            return None
+
+        start = time.monotonic()
+        try:
+            response = send(instance.url)
+        except (requests.ConnectionError, requests.Timeout):
+            self.release(service_name, instance, time.monotonic() - start, failed=True)
+            raise
+        except Exception:
+            self.release(service_name, instance, time.monotonic() - start, failed=False)
+            raise
+
+        self.release(service_name, instance, time.monotonic() - start, failed=response.status_code >= 500)
+        return response
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                f"{service}/{instance_id}": {
+                    'outstanding': stats.outstanding,
+                    'ewma_latency_ms': round(self._latency(stats, now) * 1000, 2),
+                    'ejected': stats.ejected_until > now
+                }
+                for (service, instance_id), stats in self._stats.items()
+            }
+
+load_balancer = LoadBalancer(
+    service_resolver,
+    failure_threshold=int(os.environ.get('LB_FAILURE_THRESHOLD', 3)),
+    ejection_time=float(os.environ.get('LB_EJECTION_TIME', 10))
+)
@@ -0,0 +1,114 @@
+import os
+import threading
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import consul
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class ServiceInstance:
+    """Instancia sana de un servicio registrada en Consul"""
+    service_id: str
+    address: str
+    port: int
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.address}:{self.port}"
+
+class ServiceResolver:
+    """Vista en memoria de las instancias sanas de cada servicio.
+
+    Cada servicio consultado obtiene un hilo que hace blocking queries contra
+    Consul (``index`` + ``wait``) y reemplaza la lista solo cuando cambia. Si
+    Consul está lento o caído se sigue sirviendo el último conjunto válido,
+    así que resolver un servicio nunca sale del proceso en el camino caliente.
+    """
+
+    def __init__(self, consul_client=None, wait: str = '30s', initial_timeout: float = 5,
+                 retry_delay: float = 1, max_retry_delay: float = 30):
+        self.consul_client = consul_client or consul.Consul(
+            host=os.environ.get('CONSUL_HOST', 'localhost'),
+            port=int(os.environ.get('CONSUL_PORT', 8500))
+        )
+        self.wait = wait
+        self.initial_timeout = initial_timeout
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._instances: Dict[str, List[ServiceInstance]] = {}
+        self._ready: Dict[str, threading.Event] = {}
+        self._watchers: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def get_instances(self, service_name: str) -> List[ServiceInstance]:
+        """Instancias sanas conocidas; solo la primera llamada espera a Consul"""
+        instances = self._instances.get(service_name)
+        if instances is None:
+            ready = self._ensure_watch(service_name)
+            ready.wait(self.initial_timeout)
+            instances = self._instances.get(service_name)
+        return list(instances or [])
+
+    def resolve(self, service_name: str) -> Optional[str]:
+        """URL base de una instancia del servicio, o None si no hay ninguna"""
+        instances = self.get_instances(service_name)
+        return instances[0].url if instances else None
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """Detener los watches; retorna True si todos los hilos terminaron.
+
+        Un hilo en medio de una blocking query termina cuando esta responde,
+        así que la espera puede llegar al ``wait`` configurado.
+        """
+        self._stopped.set()
+        with self._lock:
+            watchers = list(self._watchers.values())
+        for watcher in watchers:
+            watcher.join(timeout)
+        return not any(watcher.is_alive() for watcher in watchers)
+
+    def _ensure_watch(self, service_name: str) -> threading.Event:
+        with self._lock:
+            if service_name not in self._watchers:
+                self._ready[service_name] = threading.Event()
+                watcher = threading.Thread(
+                    target=self._watch, args=(service_name,),
+                    name=f"consul-watch-{service_name}", daemon=True
+                )
+                self._watchers[service_name] = watcher
+                watcher.start()
+            return self._ready[service_name]
+
+    def _watch(self, service_name: str):
+        index = None
+        delay = self.retry_delay
+        while not self._stopped.is_set():
+            try:
+                new_index, nodes = self.consul_client.health.service(
+                    service_name, passing=True, index=index, wait=self.wait
+                )
+                self._instances[service_name] = [
+                    ServiceInstance(
+                        service_id=node['Service']['ID'],
+                        address=node['Service']['Address'] or node['Node']['Address'],
+                        port=node['Service']['Port']
+                    )
+                    for node in nodes
+                ]
+                self._ready[service_name].set()
+                # Consul pide reiniciar el índice si retrocede (p.ej. tras un restore)
+                new_index = int(new_index or 0)
+                index = new_index if new_index > 0 and (index is None or new_index >= index) else None
+                delay = self.retry_delay
+            except Exception as e:
+                logger.warning(f"Consul watch for {service_name} failed, keeping last known instances: {e}")
+                self._instances.setdefault(service_name, [])
+                self._ready[service_name].set()
+                index = None
+                self._stopped.wait(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+
+service_resolver = ServiceResolver(wait=os.environ.get('CONSUL_WATCH_WAIT', '30s'))
@@ -1,5 +1,9 @@
 from app.repositories.booking_repository import BookingRepository
 from app.repositories.mongo_booking_repository import MongoBookingRepository
+from app.repositories.inventory_repository import InventoryRepository
+from app.repositories.mongo_inventory_repository import MongoInventoryRepository
+from app.repositories.package_replica_repository import PackageReplicaRepository
+from app.repositories.mongo_package_replica_repository import MongoPackageReplicaRepository
 from app.db.mongo_connection import MongoConnection
 import logging
 
@@ -23,4 +27,26 @@ class RepositoryFactory:
             return MongoBookingRepository(db_connection)
         except Exception as e:
             logger.error(f"Error creating booking repository: {e}")
-            raise
\ No newline at end of file
+            raise
+    
+    @staticmethod
+    def create_inventory_repository() -> InventoryRepository:
+        try:
+            db_connection = MongoConnection()
+            if not db_connection.connect():
+                raise ConnectionError("Failed to connect to MongoDB")
+            return MongoInventoryRepository(db_connection)
+        except Exception as e:
+            logger.error(f"Error creating inventory repository: {e}")
+            raise
+    
+    @staticmethod
+    def create_package_replica_repository() -> PackageReplicaRepository:
+        try:
+            db_connection = MongoConnection()
+            if not db_connection.connect():
+                raise ConnectionError("Failed to connect to MongoDB")
+            return MongoPackageReplicaRepository(db_connection)
+        except Exception as e:
+            logger.error(f"Error creating package replica repository: {e}")
+            raise
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import List, Dict
+
+class InventoryRepository(ABC):
+    """Interface abstracta para el inventario de cupos por paquete y fecha"""
+    
+    @abstractmethod
+    def reserve(self, package_id: str, travel_date: str, seats: int, capacity: int) -> bool:
+        """Descontar cupos de forma atómica; False si no alcanzan"""
+        pass
+    
+    @abstractmethod
+    def release(self, package_id: str, travel_date: str, seats: int) -> None:
+        pass
+    
+    @abstractmethod
+    def get_calendar(self, package_id: str, start_date: str, end_date: str) -> List[Dict]:
+        pass
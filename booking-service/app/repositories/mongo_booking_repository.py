@@ -52,8 +52,9 @@ class MongoBookingRepository(BookingRepository):
         return booking
     
     def delete(self, booking_id: str) -> bool:
+        # Solo la primera cancelación cuenta, para no liberar cupos dos veces
         result = self.collection.update_one(
-            {"id": booking_id},
+            {"id": booking_id, "status": {"$ne": "cancelled"}},
             {"$set": {"status": "cancelled", "updated_at": datetime.utcnow().isoformat()}}
         )
         return result.modified_count > 0
@@ -0,0 +1,95 @@
+from typing import List, Dict
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.repositories.inventory_repository import InventoryRepository
+from app.db.mongo_connection import MongoConnection
+from datetime import datetime
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+class MongoInventoryRepository(InventoryRepository):
+    """Cupos restantes por (package_id, travel_date) en la colección inventory.
+
+    Cada documento guarda ``capacity`` y ``remaining``. Reservar es un único
+    ``$inc`` condicionado a que ``remaining`` alcance, así dos reservas
+    concurrentes nunca venden el mismo cupo. El documento se crea la primera
+    vez que se reserva esa fecha, descontando las reservas que ya existían.
+    """
+    
+    def __init__(self, db_connection: MongoConnection):
+        self.db = db_connection
+        self.collection = self.db.get_collection('inventory')
+        self.bookings = self.db.get_collection('bookings')
+        self.collection.create_index(
+            [('package_id', ASCENDING), ('travel_date', ASCENDING)], unique=True, name='package_date'
+        )
+    
+    def reserve(self, package_id: str, travel_date: str, seats: int, capacity: int) -> bool:
+        self._ensure(package_id, travel_date, capacity)
+        result = self.collection.find_one_and_update(
+            {'package_id': package_id, 'travel_date': travel_date, 'remaining': {'$gte': seats}},
+            {'$inc': {'remaining': -seats}, '$set': {'updated_at': datetime.utcnow().isoformat()}},
+            return_document=ReturnDocument.AFTER
+        )
+        return result is not None
+    
+    def release(self, package_id: str, travel_date: str, seats: int) -> None:
+        # Nunca por encima de la capacidad, aunque se libere dos veces
+        self.collection.update_one(
+            {'package_id': package_id, 'travel_date': travel_date},
+            [{'$set': {
+                'remaining': {'$min': ['$capacity', {'$add': ['$remaining', seats]}]},
+                'updated_at': datetime.utcnow().isoformat()
+            }}]
+        )
+    
+    def get_calendar(self, package_id: str, start_date: str, end_date: str) -> List[Dict]:
+        results = self.collection.find(
+            {'package_id': package_id, 'travel_date': {'$gte': start_date, '$lte': end_date}},
+            {'_id': 0, 'travel_date': 1, 'capacity': 1, 'remaining': 1}
+        ).sort('travel_date', ASCENDING)
+        return list(results)
+    
+    def _ensure(self, package_id: str, travel_date: str, capacity: int):
+        """Crear el documento de la fecha o ajustarlo si cambió max_participants"""
+        key = {'package_id': package_id, 'travel_date': travel_date}
+        current = self.collection.find_one(key, {'capacity': 1})
+        if current is None:
+            remaining = max(0, capacity - self._reserved_seats(package_id, travel_date))
+            try:
+                self.collection.update_one(
+                    key,
+                    {'$setOnInsert': {
+                        'capacity': capacity,
+                        'remaining': remaining,
+                        'updated_at': datetime.utcnow().isoformat()
+                    }},
+                    upsert=True
+                )
+            except DuplicateKeyError:
+                # Otro request creó el documento al mismo tiempo
+                pass
+        elif current['capacity'] != capacity:
+            # Solo se aplica si nadie más ajustó la capacidad entre medio
+            self.collection.update_one(
+                {**key, 'capacity': current['capacity']},
+                [{'$set': {
+                    'capacity': capacity,
+                    'remaining': {'$max': [0, {'$add': ['$remaining', capacity - current['capacity']]}]}
+                }}]
+            )
+    
+    def _reserved_seats(self, package_id: str, travel_date: str) -> int:
+        # travel_date de reservas antiguas puede traer hora: se compara por prefijo
+        pipeline = [
+            {'$match': {
+                'package_id': package_id,
+                'status': {'$ne': 'cancelled'},
+                'travel_date': {'$regex': f'^{re.escape(travel_date)}'}
+            }},
+            {'$group': {'_id': None, 'seats': {'$sum': '$participants'}}}
+        ]
+        result = list(self.bookings.aggregate(pipeline))
+        return result[0]['seats'] if result else 0
@@ -0,0 +1,72 @@
+from typing import List, Optional, Dict, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from app.repositories.package_replica_repository import PackageReplicaRepository
+from app.db.mongo_connection import MongoConnection
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATE_ID = 'packages'
+
+class MongoPackageReplicaRepository(PackageReplicaRepository):
+    """Copia de paquetes en la colección package_replica.
+
+    Cada documento usa el ID del paquete como ``_id`` y guarda su ``version``;
+    una escritura solo reemplaza el documento si trae una versión igual o más
+    nueva, así varias instancias de booking-service pueden sincronizar contra
+    la misma base sin pisarse. El cursor del feed vive en replica_state.
+    """
+    
+    def __init__(self, db_connection: MongoConnection):
+        self.db = db_connection
+        self.collection = self.db.get_collection('package_replica')
+        self.state = self.db.get_collection('replica_state')
+    
+    def load(self) -> Tuple[List[Dict], Optional[str]]:
+        packages = list(self.collection.find({}, {'_id': 0}))
+        state = self.state.find_one({'_id': STATE_ID}) or {}
+        return packages, state.get('cursor')
+    
+    def apply(self, packages: List[Dict], cursor: Optional[str]) -> None:
+        if not packages:
+            return
+        self.collection.bulk_write([self._upsert(package) for package in packages], ordered=False)
+        if cursor:
+            self._save_cursor(cursor, max(package['version'] for package in packages))
+    
+    def replace_all(self, packages: List[Dict], cursor: Optional[str]) -> None:
+        self.apply(packages, None)
+        # Lo que ya no aparece en el listado completo se borró en el origen
+        self.collection.delete_many({'_id': {'$nin': [package['id'] for package in packages]}})
+        self.state.replace_one(
+            {'_id': STATE_ID},
+            {'cursor': cursor, 'version': max((package['version'] for package in packages), default=0),
+             'updated_at': datetime.utcnow().isoformat()},
+            upsert=True
+        )
+    
+    @staticmethod
+    def _upsert(package: Dict) -> UpdateOne:
+        document = {'_id': package['id'], **package}
+        return UpdateOne(
+            {'_id': package['id']},
+            [{'$replaceWith': {'$cond': [
+                {'$gte': [package['version'], {'$ifNull': ['$version', -1]}]},
+                # $literal: que un nombre como "$x" no se evalúe como expresión
+                {'$literal': document},
+                '$$ROOT'
+            ]}}],
+            upsert=True
+        )
+    
+    def _save_cursor(self, cursor: str, version: int):
+        update = {'$set': {'cursor': cursor, 'version': version, 'updated_at': datetime.utcnow().isoformat()}}
+        result = self.state.update_one({'_id': STATE_ID, 'version': {'$lte': version}}, update)
+        if result.matched_count == 0:
+            try:
+                self.state.insert_one({'_id': STATE_ID, **update['$set']})
+            except DuplicateKeyError:
+                # Otra instancia ya guardó un cursor más adelantado
+                pass
@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Dict, Tuple
+
+class PackageReplicaRepository(ABC):
+    """Interface abstracta para la copia local de paquetes de package-service"""
+    
+    @abstractmethod
+    def load(self) -> Tuple[List[Dict], Optional[str]]:
+        """Paquetes guardados y el cursor del feed hasta el que están aplicados"""
+        pass
+    
+    @abstractmethod
+    def apply(self, packages: List[Dict], cursor: Optional[str]) -> None:
+        """Guardar paquetes (sin retroceder de versión) y avanzar el cursor"""
+        pass
+    
+    @abstractmethod
+    def replace_all(self, packages: List[Dict], cursor: Optional[str]) -> None:
+        """Reemplazar la copia completa; se usa al resincronizar"""
+        pass
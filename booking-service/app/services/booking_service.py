@@ -1,18 +1,29 @@
 from typing import List, Optional, Dict
 from app.dto.booking_dto import BookingDTO
 from app.repositories.booking_repository import BookingRepository
+from app.repositories.inventory_repository import InventoryRepository
 from app.services.package_service_client import PackageServiceClient
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import logging
 
 logger = logging.getLogger(__name__)
 
+class SoldOutError(Exception):
+    """No quedan cupos suficientes para la fecha pedida"""
+
+def travel_day(travel_date: str) -> str:
+    """Fecha (YYYY-MM-DD) con la que se lleva el inventario de un travel_date ISO"""
+    return datetime.fromisoformat(travel_date.replace('Z', '+00:00')).date().isoformat()
+
 class BookingService:
     """Servicio de lógica de negocio para reservas"""
     
-    def __init__(self, booking_repository: BookingRepository):
+    def __init__(self, booking_repository: BookingRepository, inventory_repository: InventoryRepository,
+                 package_client=None):
         self.booking_repository = booking_repository
-        self.package_client = PackageServiceClient()
+        self.inventory_repository = inventory_repository
+        # PackageServiceClient o PackageReplica: misma interfaz de lectura
+        self.package_client = package_client or PackageServiceClient()
     
     def create_booking(self, booking_data: dict, user: dict) -> Optional[BookingDTO]:
         """Crear una nueva reserva"""
@@ -25,6 +36,13 @@ class BookingService:
         participants = booking_data.get('participants', 1)
         total_amount = package['price'] * participants
         
+        # Apartar los cupos antes de guardar la reserva
+        day = travel_day(booking_data.get('travel_date', ''))
+        if not self.inventory_repository.reserve(
+            booking_data['package_id'], day, participants, package['max_participants']
+        ):
+            raise SoldOutError()
+        
         # Crear booking
         booking = BookingDTO(
             package_id=booking_data['package_id'],
@@ -37,7 +55,11 @@ class BookingService:
             status='pending'
         )
         
-        return self.booking_repository.create(booking)
+        try:
+            return self.booking_repository.create(booking)
+        except Exception:
+            self.inventory_repository.release(booking.package_id, day, participants)
+            raise
     
     def get_user_bookings(self, user_id: str) -> List[BookingDTO]:
         """Obtener reservas de un usuario"""
@@ -49,15 +71,40 @@ class BookingService:
         if not booking or booking.user_id != user_id:
             return False
         
-        return self.booking_repository.delete(booking_id)
+        if not self.booking_repository.delete(booking_id):
+            return False
+        
+        self.inventory_repository.release(booking.package_id, travel_day(booking.travel_date), booking.participants)
+        return True
+    
+    def get_availability(self, package_id: str, start_date: date, end_date: date) -> Optional[List[Dict]]:
+        """Cupos restantes por día; las fechas sin reservas tienen la capacidad completa"""
+        package = self.package_client.get_package_by_id(package_id)
+        if not package:
+            return None
+        
+        capacity = package['max_participants']
+        days = {
+            item['travel_date']: item
+            for item in self.inventory_repository.get_calendar(package_id, start_date.isoformat(), end_date.isoformat())
+        }
+        calendar = []
+        for offset in range((end_date - start_date).days + 1):
+            day = (start_date + timedelta(days=offset)).isoformat()
+            item = days.get(day)
+            # Si bajó max_participants el documento se ajusta en la próxima reserva
+            remaining = min(item['remaining'], capacity) if item else capacity
+            calendar.append({'date': day, 'capacity': capacity, 'remaining': remaining})
+        return calendar
     
     def get_bookings_report(self, start_date: str, end_date: str) -> List[Dict]:
         """Obtener reporte de reservas con información de paquetes"""
         report = self.booking_repository.get_bookings_report(start_date, end_date)
         
-        # Enriquecer reporte con información de paquetes
+        # Enriquecer reporte con información de paquetes (una sola llamada)
+        packages = self.package_client.get_packages_by_ids([item['package_id'] for item in report])
         for item in report:
-            package = self.package_client.get_package_by_id(item['package_id'])
+            package = packages.get(item['package_id'])
             if package:
                 item['package_name'] = package['name']
                 item['package_location'] = package['location']
@@ -0,0 +1,219 @@
+from typing import Dict, List, Optional
+from app.repositories.package_replica_repository import PackageReplicaRepository
+from app.services.package_service_client import PackageServiceClient
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Campos de package-service que necesita booking-service
+REPLICA_FIELDS = ('id', 'name', 'price', 'location', 'max_participants', 'is_active')
+
+def _to_replica(change: dict, current: Optional[dict]) -> dict:
+    """Documento local para un evento del feed; una baja conserva lo último conocido"""
+    package = change.get('package')
+    if package:
+        document = {field: package.get(field) for field in REPLICA_FIELDS}
+    else:
+        document = dict(current or {field: None for field in REPLICA_FIELDS})
+        document['id'] = change['id']
+        document['is_active'] = False
+    document['version'] = change['version']
+    return document
+
+class PackageReplica:
+    """Copia local de los paquetes, con la misma interfaz de lectura que ``PackageServiceClient``.
+
+    Los paquetes viven en un dict en memoria respaldado por Mongo (para
+    arrancar sin volver a descargar todo). Un hilo consulta
+    ``GET /packages/changes`` cada ``poll_interval`` segundos y aplica los
+    cambios desde el último cursor. Si la última sincronización completa
+    tiene más de ``max_staleness`` segundos, las lecturas vuelven a
+    consultar package-service por HTTP: la copia nunca responde con datos
+    más viejos que ese límite.
+
+    La frescura supone que el feed no tiene huecos: un cambio que el feed
+    saltara quedaría mal en la copia aunque ``is_fresh()`` diga que está al
+    día. Como red de seguridad, cada ``full_resync_interval`` segundos la
+    copia se rehace completa desde el listado, igual que ``RevocationList``.
+    """
+
+    def __init__(self, repository: PackageReplicaRepository, client: PackageServiceClient,
+                 max_staleness: float = 30, poll_interval: float = 2, batch_size: int = 500,
+                 full_resync_interval: float = 600):
+        self.repository = repository
+        self.client = client
+        self.max_staleness = max_staleness
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.full_resync_interval = full_resync_interval
+        self._packages = {}
+        self._cursor = None
+        self._last_sync = None
+        self._last_full_sync = None
+        # Serializa el hilo de sincronización y las resincronizaciones forzadas
+        self._sync_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.local_reads = 0
+        self.remote_reads = 0
+        self.sync_errors = 0
+        self.changes_applied = 0
+        self.full_resyncs = 0
+
+    def start(self):
+        """Cargar la copia guardada en Mongo y arrancar la sincronización"""
+        try:
+            packages, cursor = self.repository.load()
+            self._packages = {package['id']: package for package in packages}
+            self._cursor = cursor
+            # La copia guardada se reconcilia un intervalo después, no al arrancar
+            self._last_full_sync = time.monotonic()
+            logger.info(f"Package replica loaded {len(packages)} packages from MongoDB")
+        except Exception as e:
+            logger.error(f"Error loading package replica: {e}")
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='package-replica', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def is_fresh(self) -> bool:
+        last_sync = self._last_sync
+        return last_sync is not None and time.monotonic() - last_sync <= self.max_staleness
+
+    def get_package_by_id(self, package_id: str):
+        """Paquete activo desde la copia, o por HTTP si está desactualizada.
+
+        Un ID que la copia no conoce puede ser un paquete recién creado que
+        aún no llega por el feed: ese caso también se consulta por HTTP.
+        """
+        package = self._packages.get(package_id) if self.is_fresh() else None
+        if package is None:
+            self.remote_reads += 1
+            return self.client.get_package_by_id(package_id)
+        self.local_reads += 1
+        return dict(package) if package['is_active'] else None
+
+    def get_packages_by_ids(self, package_ids: list, chunk_size: int = 500) -> dict:
+        if not self.is_fresh():
+            self.remote_reads += 1
+            return self.client.get_packages_by_ids(package_ids, chunk_size)
+        self.local_reads += 1
+        packages = self._packages
+        found = {}
+        unknown = []
+        for package_id in package_ids:
+            package = packages.get(package_id)
+            if package is None:
+                unknown.append(package_id)
+            elif package['is_active']:
+                found[package_id] = dict(package)
+        if unknown:
+            self.remote_reads += 1
+            found.update(self.client.get_packages_by_ids(unknown, chunk_size))
+        return found
+
+    def sync(self) -> int:
+        """Aplicar los cambios posteriores al cursor; retorna cuántos se aplicaron"""
+        with self._sync_lock:
+            last_full_sync = self._last_full_sync
+            if (self._cursor is None or last_full_sync is None
+                    or time.monotonic() - last_full_sync >= self.full_resync_interval):
+                return self._resync()
+            # La antigüedad se cuenta desde que empezó la lectura
+            started = time.monotonic()
+            applied = 0
+            while True:
+                page = self.client.get_changes(self._cursor, self.batch_size)
+                documents = self._apply(page['changes'])
+                self._cursor = page['next'] or self._cursor
+                self._persist(documents, self._cursor)
+                applied += len(documents)
+                if not page['has_more']:
+                    break
+            self._last_sync = started
+            return applied
+
+    def resync(self) -> int:
+        """Descartar la copia y volver a armarla desde el listado completo"""
+        with self._sync_lock:
+            return self._resync(strict=True)
+
+    def _resync(self, strict: bool = False) -> int:
+        started = time.monotonic()
+        packages = {}
+        cursor = None
+        while True:
+            page = self.client.get_changes(cursor, self.batch_size)
+            for change in page['changes']:
+                packages[change['id']] = _to_replica(change, packages.get(change['id']))
+            cursor = page['next'] or cursor
+            if not page['has_more']:
+                break
+
+        self._packages = packages
+        self._cursor = cursor
+        self._last_sync = started
+        self._last_full_sync = started
+        self.full_resyncs += 1
+        try:
+            self.repository.replace_all(list(packages.values()), cursor)
+        except Exception as e:
+            logger.error(f"Error saving package replica: {e}")
+            if strict:
+                raise
+        logger.info(f"Package replica resynchronized with {len(packages)} packages")
+        return len(packages)
+
+    def _apply(self, changes: List[dict]) -> List[dict]:
+        if not changes:
+            return []
+        documents = []
+        # Copia y reemplazo: los lectores nunca ven el dict a medio modificar
+        packages = dict(self._packages)
+        for change in changes:
+            current = packages.get(change['id'])
+            if current is not None and current['version'] > change['version']:
+                continue
+            document = _to_replica(change, current)
+            packages[change['id']] = document
+            documents.append(document)
+        self._packages = packages
+        self.changes_applied += len(documents)
+        return documents
+
+    def _persist(self, documents: List[dict], cursor: Optional[str]):
+        # Si Mongo falla, la copia en memoria sigue sirviendo; el cursor
+        # guardado no avanza y el próximo arranque vuelve a aplicar estos cambios
+        try:
+            self.repository.apply(documents, cursor)
+        except Exception as e:
+            logger.error(f"Error saving package replica changes: {e}")
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                applied = self.sync()
+                if applied:
+                    logger.info(f"Package replica applied {applied} changes")
+            except Exception as e:
+                self.sync_errors += 1
+                logger.warning(f"Package replica sync failed: {e}")
+            self._stopped.wait(self.poll_interval)
+
+    def stats(self) -> Dict:
+        last_sync = self._last_sync
+        return {
+            'packages': len(self._packages),
+            'fresh': self.is_fresh(),
+            'age_seconds': round(time.monotonic() - last_sync, 3) if last_sync is not None else None,
+            'max_staleness': self.max_staleness,
+            'local_reads': self.local_reads,
+            'remote_reads': self.remote_reads,
+            'changes_applied': self.changes_applied,
+            'full_resyncs': self.full_resyncs,
+            'sync_errors': self.sync_errors
+        }
@@ -1,7 +1,6 @@
-import requests
-import consul
-import os
 import logging
+from app.clients.http_client import http_client
+from app.discovery.load_balancer import load_balancer
 
 logger = logging.getLogger(__name__)
 
@@ -9,36 +8,60 @@ class PackageServiceClient:
     """Cliente para comunicarse con package-service"""
     
     def __init__(self):
-        self.consul_client = consul.Consul(
-            host=os.environ.get('CONSUL_HOST', 'localhost'),
-            port=int(os.environ.get('CONSUL_PORT', 8500))
-        )
-    
-    def discover_package_service(self):
-        """Descubrir package-service vía Consul"""
-        try:
-            services = self.consul_client.health.service('package-service', passing=True)
-            if services[1]:
-                service = services[1][0]['Service']
-                return f"http://{service['Address']}:{service['Port']}"
-            else:
-                logger.error("Package service not found in Consul")
-                return None
-        except Exception as e:
-            logger.error(f"Error discovering package service: {e}")
-            return None
+        self.balancer = load_balancer
     
     def get_package_by_id(self, package_id: str):
         """Obtener información de un paquete por ID"""
-        package_url = self.discover_package_service()
-        if not package_url:
-            return None
-        
         try:
-            response = requests.get(f"{package_url}/packages/{package_id}", timeout=5)
-            if response.status_code == 200:
+            response = self.balancer.request(
+                'package-service',
+                lambda base_url: http_client.get(f"{base_url}/packages/{package_id}")
+            )
+            if response is not None and response.status_code == 200:
                 return response.json()
             return None
         except Exception as e:
             logger.error(f"Error getting package info: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def get_packages_by_ids(self, package_ids: list, chunk_size: int = 500) -> dict:
+        """Obtener varios paquetes con POST /packages/batch (una llamada por bloque).
+
+        Retorna ``{id: paquete}`` solo con los encontrados. Si package-service
+        aún no expone el endpoint, se consulta uno por uno.
+        """
+        package_ids = [package_id for package_id in dict.fromkeys(package_ids) if isinstance(package_id, str)]
+        packages = {}
+        for start in range(0, len(package_ids), chunk_size):
+            chunk = package_ids[start:start + chunk_size]
+            try:
+                response = self.balancer.request(
+                    'package-service',
+                    lambda base_url: http_client.post(f"{base_url}/packages/batch", json={'ids': chunk})
+                )
+            except Exception as e:
+                logger.error(f"Error getting packages batch: {e}")
+                continue
+            
+            if response is not None and response.status_code == 200:
+                packages.update(response.json()['packages'])
+            elif response is not None and response.status_code in (404, 405):
+                for package_id in chunk:
+                    package = self.get_package_by_id(package_id)
+                    if package:
+                        packages[package_id] = package
+        return packages
+    
+    def get_changes(self, since: str = None, limit: int = 500):
+        """Leer un lote de GET /packages/changes; lanza excepción si no se pudo"""
+        params = {'limit': limit}
+        if since:
+            params['since'] = since
+        response = self.balancer.request(
+            'package-service',
+            lambda base_url: http_client.get(f"{base_url}/packages/changes", params=params)
+        )
+        if response is None:
+            raise ConnectionError("No package-service instances available")
+        response.raise_for_status()
+        return response.json()
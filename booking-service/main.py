@@ -1,7 +1,7 @@
 import os
 import logging
 from app import create_app
-from app.controllers.booking_controller import booking_bp
+from app.controllers.booking_controller import booking_bp, package_replica
 from consul_register import ConsulServiceRegistry
 
 # Configurar logging
@@ -15,6 +15,10 @@ def main():
     # Registrar blueprints
     app.register_blueprint(booking_bp)
     
+    # Cargar la copia local de paquetes y empezar a sincronizarla
+    if package_replica is not None:
+        package_replica.start()
+    
     # Registrar servicio en Consul
     registry = ConsulServiceRegistry()
     registry.register_service()
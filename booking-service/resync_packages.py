@@ -0,0 +1,31 @@
+"""Resincronizar a mano la copia local de paquetes guardada en MongoDB.
+
+Uso:
+    python resync_packages.py
+
+Descarga el listado completo desde ``GET /packages/changes`` y reemplaza la
+colección package_replica y su cursor. Las instancias en ejecución siguen
+con su copia en memoria; para rehacer también esa copia se usa
+``POST /package-replica/resync``.
+"""
+import logging
+import sys
+from app.factories.repository_factory import RepositoryFactory
+from app.services.package_replica import PackageReplica
+from app.services.package_service_client import PackageServiceClient
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main() -> int:
+    replica = PackageReplica(RepositoryFactory.create_package_replica_repository(), PackageServiceClient())
+    try:
+        count = replica.resync()
+    except Exception as e:
+        logger.error(f"Package replica resync failed: {e}")
+        return 1
+    logger.info(f"Package replica resynchronized with {count} packages")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
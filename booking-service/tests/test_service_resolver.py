@@ -0,0 +1,86 @@
+import time
+
+import consul
+import pytest
+
+from app.discovery.service_resolver import ServiceInstance, ServiceResolver
+from fake_consul import FakeConsul
+
+def _eventually(condition, timeout: float = 3):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+@pytest.fixture
+def fake_consul():
+    fake = FakeConsul().start()
+    yield fake
+    fake.stop()
+
+@pytest.fixture
+def resolver(fake_consul):
+    resolver = ServiceResolver(
+        consul.Consul(host=fake_consul.host, port=fake_consul.port),
+        wait='1s', initial_timeout=2, retry_delay=0.05, max_retry_delay=0.1
+    )
+    yield resolver
+    resolver.stop(timeout=3)
+
+def test_instances_added_and_removed_propagate(fake_consul, resolver):
+    fake_consul.set_instances('auth-service', [('a1', '10.0.0.1', 5000)])
+    assert resolver.get_instances('auth-service') == [ServiceInstance('a1', '10.0.0.1', 5000)]
+    assert resolver.resolve('auth-service') == 'http://10.0.0.1:5000'
+
+    fake_consul.set_instances('auth-service', [('a1', '10.0.0.1', 5000), ('a2', '10.0.0.2', 5000)])
+    assert _eventually(lambda: len(resolver.get_instances('auth-service')) == 2)
+
+    fake_consul.set_instances('auth-service', [('a2', '10.0.0.2', 5000)])
+    assert _eventually(lambda: resolver.get_instances('auth-service') == [ServiceInstance('a2', '10.0.0.2', 5000)])
+
+def test_changes_arrive_through_the_blocking_query(fake_consul, resolver):
+    fake_consul.set_instances('auth-service', [('a1', '10.0.0.1', 5000)])
+    resolver.get_instances('auth-service')
+    requests = fake_consul.requests
+    started = time.monotonic()
+    fake_consul.set_instances('auth-service', [])
+    assert _eventually(lambda: resolver.get_instances('auth-service') == [])
+    # Despertado por el cambio, no por vencer el wait de 1s ni por sondeo
+    assert time.monotonic() - started < 0.5
+    assert fake_consul.requests - requests <= 2
+
+def test_last_known_instances_survive_consul_errors(fake_consul, resolver):
+    fake_consul.set_instances('auth-service', [('a1', '10.0.0.1', 5000)])
+    known = resolver.get_instances('auth-service')
+
+    fake_consul.failing = True
+    fake_consul.set_instances('auth-service', [])  # despierta la blocking query en curso
+    failures = fake_consul.requests
+    assert _eventually(lambda: fake_consul.requests > failures + 2)
+    assert resolver.get_instances('auth-service') == known
+
+    fake_consul.failing = False
+    fake_consul.set_instances('auth-service', [('a3', '10.0.0.3', 5000)])
+    assert _eventually(lambda: resolver.get_instances('auth-service') == [ServiceInstance('a3', '10.0.0.3', 5000)])
+
+def test_unreachable_consul_does_not_block_callers(fake_consul, resolver):
+    fake_consul.failing = True
+    started = time.monotonic()
+    assert resolver.get_instances('booking-service') == []
+    assert resolver.resolve('booking-service') is None
+    assert time.monotonic() - started < 1
+
+def test_stop_ends_the_watch_threads(fake_consul, resolver):
+    fake_consul.set_instances('auth-service', [('a1', '10.0.0.1', 5000)])
+    resolver.get_instances('auth-service')
+    resolver.get_instances('booking-service')
+    watchers = list(resolver._watchers.values())
+    assert all(watcher.is_alive() for watcher in watchers)
+
+    assert resolver.stop(timeout=3)
+    assert not any(watcher.is_alive() for watcher in watchers)
+    requests = fake_consul.requests
+    time.sleep(0.2)
+    assert fake_consul.requests == requests
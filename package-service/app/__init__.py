@@ -1,7 +1,9 @@
 from flask import Flask
 from flask_cors import CORS
+from app.json_provider import OrjsonProvider
 
 def create_app():
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     CORS(app)
     return app
\ No newline at end of file
@@ -0,0 +1,319 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Mount, Route
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import http_date, parse_accept_header, parse_date, parse_etags, quote_etag
+from app.auth.auth_middleware import auth_middleware
+from app.controllers.package_controller import (
+    public_catalogue, change_feed, changes_waiters, _catalogue_etag, _parse_changes_params, _sse_event,
+    CHANGES_KEEPALIVE, CHANGES_POLL_INTERVAL, CHANGES_RETRY_AFTER, CHANGES_SAFETY_LAG
+)
+from app.dto.package_dto import version_to_timestamp
+from app.factories.repository_factory import RepositoryFactory
+from app.json_provider import dumps_bytes
+from app.services.package_validator import parse_page_params, wants_page
+import asyncio
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Repositorio de lectura asíncrono; el pool se abre en el lifespan
+package_repository = RepositoryFactory.create_async_package_repository()
+
+class OrjsonResponse(Response):
+    media_type = 'application/json'
+
+    def render(self, content) -> bytes:
+        return dumps_bytes(content)
+
+def _error(message: str, status_code: int) -> Response:
+    return OrjsonResponse({'error': message}, status_code=status_code)
+
+def _not_modified(request, etag: str, last_modified: datetime = None) -> bool:
+    """Mismas reglas que el controlador Flask: If-None-Match y luego If-Modified-Since"""
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match:
+        return parse_etags(if_none_match).contains(etag)
+    if_modified_since = parse_date(request.headers.get('if-modified-since'))
+    if if_modified_since and last_modified:
+        return last_modified.replace(microsecond=0) <= if_modified_since
+    return False
+
+async def _conditional_response(request, etag: str, last_modified: datetime, cache_control: str, build,
+                                settled: bool = True) -> Response:
+    """Responder 304 si el cliente ya tiene esta versión; si no, esperar a build().
+
+    Igual que en Flask, un 200 de una versión no asentada sale sin validadores.
+    """
+    if last_modified:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    if _not_modified(request, etag, last_modified):
+        response = Response(status_code=304)
+    else:
+        response = await build()
+        if response.status_code != 200:
+            return response
+    response.headers['Cache-Control'] = cache_control
+    if response.status_code == 304 or settled:
+        response.headers['ETag'] = quote_etag(etag)
+        if last_modified:
+            response.headers['Last-Modified'] = http_date(last_modified)
+    return response
+
+async def _authenticate(request):
+    """Usuario del token Bearer, o None; la verificación puede bloquear y va al threadpool"""
+    token = request.headers.get('authorization')
+    if not token:
+        return None
+    token = token.split(' ')[1] if token.startswith('Bearer ') else token
+    return await run_in_threadpool(auth_middleware.verify_token, token)
+
+async def _page_response(request, available_only: bool) -> Response:
+    try:
+        limit, cursor, fields = parse_page_params(request.query_params)
+        page = await package_repository.find_page(limit, cursor, fields, available_only)
+    except ValueError as e:
+        return _error(str(e), 400)
+    return OrjsonResponse(page.to_dict())
+
+async def get_packages(request):
+    """Listar todos los paquetes (disponible para todos los usuarios autenticados)"""
+    if not request.headers.get('authorization'):
+        return _error('No token provided', 401)
+    if not await _authenticate(request):
+        return _error('Invalid token', 401)
+    try:
+        version = await package_repository.get_catalogue_version()
+
+        async def build():
+            if wants_page(request.query_params):
+                return await _page_response(request, available_only=False)
+            packages = await package_repository.find_all()
+            return OrjsonResponse({'packages': packages, 'total': len(packages)})
+
+        return await _conditional_response(
+            request, _catalogue_etag(version, available_only=False), version.last_modified, 'private, no-cache', build,
+            version.settled
+        )
+    except Exception as e:
+        logger.error(f"Error getting packages: {e}")
+        return _error('Internal server error', 500)
+
+async def get_public_packages(request):
+    """Listar paquetes disponibles (sin autenticación)"""
+    try:
+        snapshot = public_catalogue.snapshot()
+        if snapshot is not None and not wants_page(request.query_params):
+            compressed = parse_accept_header(request.headers.get('accept-encoding'))['gzip'] > 0
+            etag = f'{snapshot.etag}-gzip' if compressed else snapshot.etag
+
+            async def build_snapshot():
+                response = Response(snapshot.gzip_body if compressed else snapshot.body, media_type='application/json')
+                if compressed:
+                    response.headers['Content-Encoding'] = 'gzip'
+                return response
+
+            response = await _conditional_response(
+                request, etag, snapshot.last_modified, 'public, no-cache', build_snapshot
+            )
+            response.headers['Vary'] = 'Accept-Encoding'
+            return response
+
+        version = await package_repository.get_catalogue_version()
+
+        async def build():
+            if wants_page(request.query_params):
+                return await _page_response(request, available_only=True)
+            packages = await package_repository.find_available()
+            return OrjsonResponse({
+                'packages': [package.to_public_dict() for package in packages],
+                'total': len(packages)
+            })
+
+        return await _conditional_response(
+            request, _catalogue_etag(version, available_only=True), version.last_modified, 'public, no-cache', build,
+            version.settled
+        )
+    except Exception as e:
+        logger.error(f"Error getting public packages: {e}")
+        return _error('Internal server error', 500)
+
+async def get_package_by_id(request):
+    """Obtener un paquete específico por su ID"""
+    try:
+        package_id = str(request.path_params['package_id'])
+        # Primero solo la versión: un 304 no lee ni serializa el paquete
+        version = await package_repository.find_version(package_id)
+        if version is None:
+            return _error('Package not found', 404)
+
+        async def build():
+            package = await package_repository.find_by_id(package_id)
+            if not package:
+                return _error('Package not found', 404)
+            return OrjsonResponse(package)
+
+        return await _conditional_response(
+            request, str(version), version_to_timestamp(version), 'public, no-cache', build
+        )
+    except Exception as e:
+        logger.error(f"Error getting package by ID: {e}")
+        return _error('Internal server error', 500)
+
+class ChangeSignal:
+    """Avisos del ChangeFeed (que corre en un hilo) para las corrutinas en espera.
+
+    ``current()`` es el evento que se marcará con el próximo aviso; se toma
+    antes de consultar, igual que ``change_feed.sequence`` en Flask.
+    """
+
+    def __init__(self):
+        self._event = asyncio.Event()
+
+    def current(self) -> asyncio.Event:
+        return self._event
+
+    def notify(self):
+        event, self._event = self._event, asyncio.Event()
+        event.set()
+
+change_signal = ChangeSignal()
+
+async def _wait_for_notification(event: asyncio.Event, timeout: float):
+    """Esperar un aviso; retorna el evento para la próxima espera o None si no llegó"""
+    if not change_feed.connected:
+        timeout = min(timeout, CHANGES_POLL_INTERVAL)
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+    except asyncio.TimeoutError:
+        return None
+    event = change_signal.current()
+    # El margen de seguridad se espera en el event loop, sin ocupar un hilo
+    await asyncio.sleep(CHANGES_SAFETY_LAG)
+    return event
+
+async def _long_poll_changes(since, limit: int, wait: float, event: asyncio.Event):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while True:
+        changes = await package_repository.find_changes(since, limit, CHANGES_SAFETY_LAG)
+        remaining = deadline - loop.time()
+        if changes.changes or remaining <= 0:
+            return changes
+        woken = await _wait_for_notification(event, remaining)
+        if woken is not None:
+            event = woken
+
+async def _stream_changes(changes, limit: int, event: asyncio.Event, release):
+    """Eventos SSE como en Flask; la desconexión del cliente cancela la espera"""
+    try:
+        yield f'retry: {int(CHANGES_POLL_INTERVAL * 1000)}\n\n'
+        while True:
+            for change in changes.changes:
+                yield _sse_event(change)
+            if not changes.has_more:
+                woken = await _wait_for_notification(event, CHANGES_KEEPALIVE)
+                if woken is None:
+                    yield ': keepalive\n\n'
+                else:
+                    event = woken
+            changes = await package_repository.find_changes(changes.next_cursor, limit, CHANGES_SAFETY_LAG)
+    finally:
+        release()
+
+def _waiter_release():
+    """Liberar una sola vez el lugar tomado en changes_waiters"""
+    released = False
+
+    def release():
+        nonlocal released
+        if not released:
+            released = True
+            changes_waiters.release()
+    return release
+
+async def get_package_changes(request):
+    """Altas, cambios y bajas de paquetes posteriores a un cursor (ver el controlador Flask)"""
+    release = None
+    try:
+        limit, wait = _parse_changes_params(request.query_params)
+        since = request.query_params.get('since') or request.headers.get('last-event-id') or None
+        accept = parse_accept_header(request.headers.get('accept'), MIMEAccept)
+        sse = accept.best_match(['application/json', 'text/event-stream']) == 'text/event-stream'
+
+        if sse or wait > 0:
+            if not changes_waiters.acquire():
+                response = _error('Too many change feed waiters', 503)
+                response.headers['Retry-After'] = str(CHANGES_RETRY_AFTER)
+                return response
+            release = _waiter_release()
+
+        event = change_signal.current()
+        if sse:
+            # La primera consulta va fuera del stream para responder 400 a un cursor inválido
+            changes = await package_repository.find_changes(since, limit, CHANGES_SAFETY_LAG)
+            stream_release, release = release, None
+            return StreamingResponse(
+                _stream_changes(changes, limit, event, stream_release),
+                media_type='text/event-stream',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+                # Por si el stream no llegó a empezar
+                background=BackgroundTask(stream_release)
+            )
+
+        changes = await _long_poll_changes(since, limit, wait, event)
+        return OrjsonResponse(changes.to_dict())
+    except ValueError as e:
+        return _error(str(e), 400)
+    except Exception as e:
+        logger.error(f"Error getting package changes: {e}")
+        return _error('Internal server error', 500)
+    finally:
+        if release is not None:
+            release()
+
+def create_asgi_app(flask_app) -> Starlette:
+    """Servir las lecturas calientes en asyncio y el resto con la app Flask.
+
+    GET /packages, /packages/public, /packages/<id> y /packages/changes se
+    atienden en el event loop con el repositorio asyncpg; cualquier otra ruta
+    (escrituras, búsqueda, batch, /health) pasa sin cambios a Flask a través
+    de un puente WSGI. Los long-poll y streams de cambios esperan en el event
+    loop, así que su tope es ``ASGI_CHANGES_MAX_WAITERS`` y no depende de los
+    hilos del puente.
+    """
+    connection = RepositoryFactory.get_async_connection()
+    changes_waiters.capacity = int(os.environ.get('ASGI_CHANGES_MAX_WAITERS', 1000))
+
+    @asynccontextmanager
+    async def lifespan(app):
+        loop = asyncio.get_running_loop()
+        change_feed.subscribe(lambda events: loop.call_soon_threadsafe(change_signal.notify))
+        await connection.connect()
+        try:
+            yield
+        finally:
+            await connection.disconnect()
+
+    wsgi_workers = int(os.environ.get('ASGI_WSGI_WORKERS', 10))
+    return Starlette(
+        routes=[
+            Route('/packages', get_packages, methods=['GET']),
+            Route('/packages/public', get_public_packages, methods=['GET']),
+            Route('/packages/changes', get_package_changes, methods=['GET']),
+            # Solo UUID: /packages/search, /packages/export, etc. siguen en Flask
+            Route('/packages/{package_id:uuid}', get_package_by_id, methods=['GET']),
+            Mount('/', WSGIMiddleware(flask_app, workers=wsgi_workers))
+        ],
+        # Equivalente a CORS(app) de Flask, para que ambas rutas respondan igual
+        middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+        lifespan=lifespan
+    )
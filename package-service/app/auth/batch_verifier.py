@@ -0,0 +1,72 @@
+import threading
+import time
+import logging
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class BatchTokenVerifier:
+    """Agrupa verificaciones remotas concurrentes en un solo POST /me/batch.
+
+    El primer hilo que llega espera ``max_wait`` segundos a que se sumen otros
+    y luego envía todos los tokens pendientes; los demás hilos solo esperan su
+    resultado. Un mismo token pedido varias veces se verifica una sola vez.
+    Si el lote tarda más de ``timeout`` o falla, el resultado es None, igual
+    que una verificación remota fallida: nunca se propaga una excepción.
+    """
+
+    def __init__(self, verify_batch: Callable[[List[str]], List[Optional[dict]]],
+                 max_batch: int = 100, max_wait: float = 0.005, timeout: float = 10):
+        self.verify_batch = verify_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self._pending = {}
+        self._flushing = False
+        self._lock = threading.Lock()
+
+    def verify(self, token: str) -> Optional[dict]:
+        with self._lock:
+            future = self._pending.get(token)
+            if future is None:
+                future = self._pending[token] = Future()
+            leader = not self._flushing
+            self._flushing = True
+
+        if leader:
+            time.sleep(self.max_wait)
+            try:
+                self._flush()
+            except Exception as e:
+                logger.error(f"Error flushing token batch: {e}")
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            logger.warning(f"Token batch verification timed out after {self.timeout}s")
+            return None
+
+    def _flush(self):
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._flushing = False
+
+        tokens = list(pending)
+        try:
+            for start in range(0, len(tokens), self.max_batch):
+                chunk = tokens[start:start + self.max_batch]
+                try:
+                    results = self.verify_batch(chunk)
+                except Exception as e:
+                    logger.error(f"Error verifying token batch: {e}")
+                    results = None
+                if results is None or len(results) != len(chunk):
+                    results = [None] * len(chunk)
+                for token, result in zip(chunk, results):
+                    pending[token].set_result(result)
+        finally:
+            # Ningún seguidor queda esperando un resultado que no llegará
+            for future in pending.values():
+                if not future.done():
+                    future.set_result(None)
@@ -0,0 +1,102 @@
+import threading
+import time
+import jwt
+import logging
+
+logger = logging.getLogger(__name__)
+
+class KeyUnavailableError(Exception):
+    """No hay llaves locales con las que verificar el token"""
+
+class JWKSClient:
+    """Cache de las llaves públicas publicadas por auth-service.
+
+    Las llaves se descargan una vez y se refrescan al vencer el TTL o cuando
+    llega un token firmado con un ``kid`` desconocido (rotación), con un
+    intervalo mínimo entre descargas para no amplificar tokens falsos.
+
+    La descarga ocurre fuera del lock y una sola a la vez. Mientras está en
+    curso, las llaves conocidas se siguen sirviendo del cache; solo los
+    tokens con un ``kid`` desconocido esperan (hasta ``refresh_wait``) a que
+    termine, porque sin ella no se pueden verificar. Un TTL vencido se
+    refresca en segundo plano sin demorar al request que lo detectó.
+    """
+
+    def __init__(self, fetch_jwks, cache_ttl: float = 300, min_refresh_interval: float = 30,
+                 refresh_wait: float = 5):
+        # fetch_jwks() retorna el documento JWKS o None si no se pudo obtener
+        self.fetch_jwks = fetch_jwks
+        self.cache_ttl = cache_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.refresh_wait = refresh_wait
+        self._keys = {}
+        self._fetched_at = None
+        self._last_attempt = None
+        self._refreshing = False
+        self._cond = threading.Condition()
+
+    def _fetch_keys(self):
+        jwks = self.fetch_jwks()
+        if jwks is None:
+            return None
+
+        keys = {}
+        for jwk in jwks.get('keys', []):
+            try:
+                key = jwt.PyJWK(jwk)
+                keys[key.key_id] = key.key
+            except jwt.PyJWKError as e:
+                logger.warning(f"Ignoring unusable JWK {jwk.get('kid')}: {e}")
+        return keys
+
+    def _refresh(self, started: float):
+        """Descargar el JWKS sin lock y reemplazar el dict de llaves al terminar"""
+        try:
+            keys = self._fetch_keys()
+        except Exception as e:
+            logger.error(f"Error fetching JWKS: {e}")
+            keys = None
+        with self._cond:
+            if keys is not None:
+                self._keys = keys
+                self._fetched_at = started
+                logger.info(f"JWKS refreshed with {len(keys)} keys")
+            self._refreshing = False
+            self._cond.notify_all()
+
+    def get_signing_key(self, kid: str):
+        with self._cond:
+            now = time.monotonic()
+            known = kid in self._keys
+            stale = self._fetched_at is None or now - self._fetched_at > self.cache_ttl
+            can_retry = self._last_attempt is None or now - self._last_attempt >= self.min_refresh_interval
+            refresh = (stale or not known) and can_retry and not self._refreshing
+            if refresh:
+                self._refreshing = True
+                self._last_attempt = now
+
+        if refresh and known:
+            threading.Thread(target=self._refresh, args=(now,), name='jwks-refresh', daemon=True).start()
+        elif refresh:
+            self._refresh(now)
+        elif not known:
+            with self._cond:
+                # Una descarga en curso puede traer el kid nuevo
+                if not self._cond.wait_for(lambda: not self._refreshing, self.refresh_wait):
+                    raise KeyUnavailableError("JWKS refresh still in progress")
+
+        keys = self._keys
+        if not keys:
+            raise KeyUnavailableError("No JWKS available")
+        if kid not in keys:
+            raise jwt.InvalidTokenError(f"Unknown signing key {kid}")
+        return keys[kid]
+
+    def decode(self, token: str) -> dict:
+        """Verificar un token RS256 localmente y retornar sus claims"""
+        header = jwt.get_unverified_header(token)
+        if header.get('alg') != 'RS256':
+            # Tokens HS256 antiguos solo se pueden verificar en auth-service
+            raise KeyUnavailableError(f"Unsupported algorithm {header.get('alg')}")
+        key = self.get_signing_key(header.get('kid'))
+        return jwt.decode(token, key, algorithms=['RS256'])
@@ -1,8 +1,23 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, make_response, stream_with_context
 from app.services.package_service import PackageService
+from app.services.public_catalogue import PublicCatalogue, CatalogueSnapshot
+from app.services.change_feed import ChangeFeed, WaiterLimit
+from app.services.package_validator import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, parse_page_params, validate_package_data, wants_page
+)
+from app.dto.package_dto import PATCHABLE_FIELDS, version_to_timestamp, PackageSearchCriteria, CatalogueVersionDTO
+from app.repositories.package_repository import PackageDataError, StaleVersionError
 from app.factories.repository_factory import RepositoryFactory
+from app.repositories.cached_package_repository import CachedPackageRepository
 from app.auth.auth_middleware import require_auth, require_admin
+import os
+import csv
+import io
+import json
+import orjson
+import time
 import logging
+from datetime import date, datetime, timezone
 
 logger = logging.getLogger(__name__)
 
@@ -11,11 +26,121 @@ package_bp = Blueprint('packages', __name__)
 
 # Inicializar servicio
 package_service = PackageService(RepositoryFactory.create_package_repository())
+public_catalogue = PublicCatalogue(
+    package_service, refresh_interval=float(os.environ.get('PUBLIC_CATALOGUE_REFRESH_INTERVAL', 30))
+)
+
+change_feed = ChangeFeed(RepositoryFactory.get_connection())
+
+def _on_package_changes(events):
+    """Descartar lo que este proceso tiene en memoria cuando cambia un paquete en cualquier réplica"""
+    repository = package_service.package_repository
+    if isinstance(repository, CachedPackageRepository):
+        # Cada aviso trae los IDs de una sentencia, o null si fueron demasiados
+        if events is None or any(event.get('ids') is None for event in events):
+            repository.invalidate()
+        else:
+            for event in events:
+                for package_id in event['ids']:
+                    repository.invalidate(str(package_id))
+    public_catalogue.invalidate(force=False)
+
+change_feed.subscribe(_on_package_changes)
+
+BATCH_MAX_IDS = int(os.environ.get('PACKAGES_BATCH_MAX_IDS', 500))
+BULK_MAX_ROWS = int(os.environ.get('PACKAGES_BULK_MAX_ROWS', 5000))
+BULK_CHUNK_SIZE = int(os.environ.get('PACKAGES_BULK_CHUNK_SIZE', 500))
+CHANGES_DEFAULT_LIMIT = int(os.environ.get('PACKAGES_CHANGES_LIMIT', 100))
+CHANGES_MAX_LIMIT = int(os.environ.get('PACKAGES_CHANGES_MAX_LIMIT', 1000))
+CHANGES_MAX_WAIT = float(os.environ.get('PACKAGES_CHANGES_MAX_WAIT', 30))
+# Antigüedad mínima de un cambio para entregarlo (ver find_changes)
+CHANGES_SAFETY_LAG = float(os.environ.get('PACKAGES_CHANGES_SAFETY_LAG', 1))
+CHANGES_KEEPALIVE = float(os.environ.get('PACKAGES_CHANGES_KEEPALIVE', 15))
+# Long-poll y streams simultáneos; cada uno retiene un hilo mientras espera
+changes_waiters = WaiterLimit(int(os.environ.get('PACKAGES_CHANGES_MAX_WAITERS', 8)))
+CHANGES_RETRY_AFTER = int(os.environ.get('PACKAGES_CHANGES_RETRY_AFTER', 5))
+# Sin LISTEN activo, los que esperan vuelven a consultar cada tanto
+CHANGES_POLL_INTERVAL = 5.0
+EXPORT_FIELDS = [
+    'id', 'name', 'description', 'price', 'duration_days', 'max_participants', 'location',
+    'includes', 'available_from', 'available_to', 'created_at', 'updated_at'
+]
+
+def _get_packages_page(available_only: bool):
+    try:
+        limit, cursor, fields = parse_page_params(request.args)
+        page = package_service.get_packages_page(limit, cursor, fields, available_only)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(page.to_dict())
+
+def _not_modified(etag: str, last_modified: datetime = None) -> bool:
+    """Evaluar If-None-Match y, si no viene, If-Modified-Since"""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+def _conditional_response(etag: str, last_modified: datetime, cache_control: str, build, settled: bool = True):
+    """Responder 304 si el cliente ya tiene esta versión; si no, construir el cuerpo con build().
+
+    Con una versión no asentada el 200 sale sin validadores: el cliente nunca
+    guarda un ETag que podría seguir igual después de un cambio. Comparar sí
+    es seguro, porque los validadores que tiene el cliente son asentados.
+    """
+    if last_modified:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    if _not_modified(etag, last_modified):
+        response = make_response('', 304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+    response.headers['Cache-Control'] = cache_control
+    if response.status_code == 304 or settled:
+        response.set_etag(etag)
+        if last_modified:
+            response.last_modified = last_modified
+    return response
+
+def _catalogue_etag(version: CatalogueVersionDTO, available_only: bool) -> str:
+    # Los disponibles dependen también de la fecha actual
+    scope = f'available-{version.today.isoformat()}' if available_only else 'all'
+    return f'{scope}-{version.version}-{version.total}'
+
+def _snapshot_response(snapshot: CatalogueSnapshot):
+    """Entregar el snapshot tal cual, comprimido si el cliente acepta gzip"""
+    compressed = request.accept_encodings['gzip'] > 0
+    # Cada codificación es una representación distinta y necesita su propio ETag
+    etag = f'{snapshot.etag}-gzip' if compressed else snapshot.etag
+    
+    def build():
+        response = Response(snapshot.gzip_body if compressed else snapshot.body, mimetype='application/json')
+        if compressed:
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
+    
+    response = _conditional_response(etag, snapshot.last_modified, 'public, no-cache', build)
+    response.vary.add('Accept-Encoding')
+    return response
 
 @package_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({'status': 'ok', 'service': 'package-service'})
+    health = {
+        'status': 'ok',
+        'service': 'package-service',
+        'db_pool': RepositoryFactory.get_connection().stats()
+    }
+    if isinstance(package_service.package_repository, CachedPackageRepository):
+        health['package_cache'] = package_service.package_repository.stats()
+    health['public_catalogue'] = public_catalogue.stats()
+    health['change_feed'] = change_feed.stats()
+    health['change_feed']['waiters'] = changes_waiters.stats()
+    if RepositoryFactory._async_connection is not None:
+        health['async_db_pool'] = RepositoryFactory._async_connection.stats()
+    return jsonify(health)
 
 @package_bp.route('/packages', methods=['POST'])
 @require_auth
@@ -24,26 +149,12 @@ def create_package():
     """Crear nuevo paquete turístico"""
     try:
         data = request.get_json()
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
-        
-        # Validar campos requeridos
-        required_fields = ['name', 'description', 'price', 'duration_days', 'max_participants', 'location']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        # Validar tipos de datos
-        if not isinstance(data['price'], (int, float)) or data['price'] <= 0:
-            return jsonify({'error': 'Price must be a positive number'}), 400
-        
-        if not isinstance(data['duration_days'], int) or data['duration_days'] <= 0:
-            return jsonify({'error': 'Duration days must be a positive integer'}), 400
-        
-        if not isinstance(data['max_participants'], int) or data['max_participants'] <= 0:
-            return jsonify({'error': 'Max participants must be a positive integer'}), 400
+        error = validate_package_data(data)
+        if error:
+            return jsonify({'error': error}), 400
         
         package = package_service.create_package(data)
+        public_catalogue.invalidate()
         return jsonify({
             'message': 'Package created successfully',
             'package': package.to_dict()
@@ -53,16 +164,132 @@ def create_package():
         logger.error(f"Error creating package: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+def _parse_bulk_rows():
+    """Filas del cuerpo: un arreglo JSON o NDJSON (application/x-ndjson)"""
+    if request.mimetype == 'application/x-ndjson':
+        rows = []
+        for line in request.get_data(as_text=True).splitlines():
+            if line.strip():
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    rows.append(None)
+        return rows
+    data = request.get_json(silent=True)
+    return data if isinstance(data, list) else None
+
+@package_bp.route('/packages/bulk', methods=['POST'])
+@require_auth
+@require_admin
+def create_packages_bulk():
+    """Crear muchos paquetes, una transacción por lote, con resultado por fila"""
+    try:
+        rows = _parse_bulk_rows()
+        if not rows:
+            return jsonify({'error': 'Expected a JSON array or NDJSON body with at least one package'}), 400
+        if len(rows) > BULK_MAX_ROWS:
+            return jsonify({'error': f'At most {BULK_MAX_ROWS} packages per request'}), 413
+        
+        results = []
+        valid = []
+        for index, row in enumerate(rows):
+            error = validate_package_data(row) if row is not None else 'Invalid JSON'
+            if error:
+                results.append({'index': index, 'status': 'error', 'error': error})
+            else:
+                results.append(None)
+                valid.append((index, row))
+        
+        created_count = 0
+        for start in range(0, len(valid), BULK_CHUNK_SIZE):
+            chunk = valid[start:start + BULK_CHUNK_SIZE]
+            try:
+                created = package_service.create_packages([row for _, row in chunk], chunk_size=BULK_CHUNK_SIZE)
+            except PackageDataError:
+                # La base rechazó algo que la validación no detectó: reintentar
+                # el lote fila por fila para no dar por fallidas las válidas
+                created = []
+                for index, row in chunk:
+                    try:
+                        created.extend(package_service.create_packages([row]))
+                    except PackageDataError as e:
+                        results[index] = {'index': index, 'status': 'error', 'error': f'Rejected by database: {e}'}
+                    else:
+                        results[index] = {'index': index, 'status': 'created', 'id': created[-1].id}
+                created_count += len(created)
+                continue
+            for (index, _), package in zip(chunk, created):
+                results[index] = {'index': index, 'status': 'created', 'id': package.id}
+            created_count += len(created)
+        if created_count:
+            public_catalogue.invalidate()
+        
+        return jsonify({
+            'created': created_count,
+            'failed': len(rows) - created_count,
+            'results': results
+        }), 201 if created_count else 400
+    except Exception as e:
+        logger.error(f"Error creating packages in bulk: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+def _export_ndjson(packages):
+    for package in packages:
+        yield orjson.dumps(package.to_public_dict()) + b'\n'
+
+def _export_csv(packages):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for package in packages:
+        data = package.to_public_dict()
+        data['includes'] = '|'.join(data['includes'])
+        writer.writerow([data[field] for field in EXPORT_FIELDS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+@package_bp.route('/packages/export', methods=['GET'])
+@require_auth
+@require_admin
+def export_packages():
+    """Exportar el catálogo activo en NDJSON o CSV, en streaming"""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+    
+    packages = package_service.export_packages()
+    if export_format == 'csv':
+        body, mimetype = _export_csv(packages), 'text/csv'
+    else:
+        body, mimetype = _export_ndjson(packages), 'application/x-ndjson'
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=packages.{export_format}'
+    return response
+
 @package_bp.route('/packages', methods=['GET'])
 @require_auth
 def get_packages():
     """Listar todos los paquetes (disponible para todos los usuarios autenticados)"""
     try:
-        packages = package_service.get_all_packages()
-        return jsonify({
-            'packages': [package.to_dict() for package in packages],
-            'total': len(packages)
-        })
+        # La versión se lee antes que los datos: un ETag viejo con datos nuevos
+        # solo provoca un 200 extra, nunca un 304 con contenido desactualizado
+        version = package_service.get_catalogue_version()
+        
+        def build():
+            if wants_page(request.args):
+                return _get_packages_page(available_only=False)
+            packages = package_service.get_all_packages()
+            return jsonify({
+                # El proveedor orjson serializa los DTO directamente
+                'packages': packages,
+                'total': len(packages)
+            })
+        
+        return _conditional_response(
+            _catalogue_etag(version, available_only=False), version.last_modified, 'private, no-cache', build,
+            version.settled
+        )
     except Exception as e:
         logger.error(f"Error getting packages: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -71,47 +298,281 @@ def get_packages():
 def get_public_packages():
     """Listar paquetes disponibles (sin autenticación)"""
     try:
-        packages = package_service.get_available_packages()
+        snapshot = public_catalogue.snapshot()
+        if snapshot is not None and not wants_page(request.args):
+            return _snapshot_response(snapshot)
+        
+        version = package_service.get_catalogue_version()
+        
+        def build():
+            if wants_page(request.args):
+                return _get_packages_page(available_only=True)
+            packages = package_service.get_available_packages()
+            return jsonify({
+                'packages': [package.to_public_dict() for package in packages],
+                'total': len(packages)
+            })
+        
+        return _conditional_response(
+            _catalogue_etag(version, available_only=True), version.last_modified, 'public, no-cache', build,
+            version.settled
+        )
+    except Exception as e:
+        logger.error(f"Error getting public packages: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+def _parse_search_criteria() -> PackageSearchCriteria:
+    """Construir los criterios desde el query string; lanza ValueError si son inválidos"""
+    args = request.args
+    
+    def number(name, cast):
+        value = args.get(name)
+        if value in (None, ''):
+            return None
+        try:
+            return cast(value)
+        except ValueError:
+            raise ValueError(f'{name} must be a number')
+    
+    def iso_date(name):
+        value = args.get(name)
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value).isoformat()
+        except ValueError:
+            raise ValueError(f'{name} must be a date (YYYY-MM-DD)')
+    
+    criteria = PackageSearchCriteria(
+        text=args.get('q', '').strip() or None,
+        location=args.get('location', '').strip() or None,
+        min_price=number('min_price', float),
+        max_price=number('max_price', float),
+        duration_days=number('duration_days', int),
+        date_from=iso_date('date_from'),
+        date_to=iso_date('date_to'),
+        limit=number('limit', int) or DEFAULT_PAGE_SIZE,
+        offset=number('offset', int) or 0
+    )
+    if not 1 <= criteria.limit <= MAX_PAGE_SIZE:
+        raise ValueError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+    if criteria.offset < 0:
+        raise ValueError('offset must not be negative')
+    return criteria
+
+@package_bp.route('/packages/search', methods=['GET'])
+def search_packages():
+    """Buscar paquetes por ubicación, precio, duración, fechas y texto (sin autenticación)"""
+    try:
+        criteria = _parse_search_criteria()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        return jsonify(package_service.search_packages(criteria).to_dict())
+    except Exception as e:
+        logger.error(f"Error searching packages: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@package_bp.route('/packages/batch', methods=['POST'])
+def get_packages_batch():
+    """Obtener varios paquetes por ID en una sola consulta"""
+    try:
+        data = request.get_json(silent=True) or {}
+        ids = data.get('ids') if isinstance(data, dict) else None
+        if not isinstance(ids, list) or not ids or not all(isinstance(package_id, str) for package_id in ids):
+            return jsonify({'error': 'ids must be a non-empty list of strings'}), 400
+        if len(ids) > BATCH_MAX_IDS:
+            return jsonify({'error': f'At most {BATCH_MAX_IDS} ids per request'}), 413
+        
+        packages = package_service.get_packages_by_ids(ids)
         return jsonify({
-            'packages': [package.to_dict() for package in packages],
-            'total': len(packages)
+            'packages': packages,
+            'missing': [package_id for package_id in dict.fromkeys(ids) if package_id not in packages]
         })
     except Exception as e:
-        logger.error(f"Error getting public packages: {e}")
+        logger.error(f"Error getting packages batch: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+def _parse_changes_params(args):
+    """Leer limit y wait de GET /packages/changes; lanza ValueError si son inválidos"""
+    try:
+        limit = int(args.get('limit', CHANGES_DEFAULT_LIMIT))
+        wait = float(args.get('wait', 0))
+    except ValueError:
+        raise ValueError('limit and wait must be numbers')
+    if not 1 <= limit <= CHANGES_MAX_LIMIT:
+        raise ValueError(f'limit must be between 1 and {CHANGES_MAX_LIMIT}')
+    if not 0 <= wait <= CHANGES_MAX_WAIT:
+        raise ValueError(f'wait must be between 0 and {CHANGES_MAX_WAIT:g} seconds')
+    return limit, wait
+
+def _sse_event(change) -> str:
+    data = orjson.dumps(change.to_dict()).decode('utf-8')
+    return f'id: {change.cursor}\nevent: {change.type}\ndata: {data}\n\n'
+
+def _waiters_exhausted_response(response):
+    """503 cuando se alcanzó el tope de esperas; el cliente reintenta después de Retry-After"""
+    response.status_code = 503
+    response.headers['Retry-After'] = str(CHANGES_RETRY_AFTER)
+    return response
+
+def _wait_for_notification(sequence: int, timeout: float):
+    """Esperar un aviso del feed; retorna la secuencia para la próxima espera o None si no llegó"""
+    if not change_feed.connected:
+        timeout = min(timeout, CHANGES_POLL_INTERVAL)
+    if not change_feed.wait(sequence, timeout):
+        return None
+    # Tomada antes de la pausa, para no perder avisos que lleguen durante ella
+    sequence = change_feed.sequence
+    # El cambio avisado se entrega recién al superar el margen de seguridad
+    time.sleep(CHANGES_SAFETY_LAG)
+    return sequence
+
+def _long_poll_changes(since, limit: int, wait: float, sequence: int):
+    deadline = time.monotonic() + wait
+    while True:
+        changes = package_service.get_changes(since, limit, CHANGES_SAFETY_LAG)
+        remaining = deadline - time.monotonic()
+        if changes.changes or remaining <= 0:
+            return changes
+        woken = _wait_for_notification(sequence, remaining)
+        if woken is not None:
+            sequence = woken
+
+def _stream_changes(changes, limit: int, sequence: int):
+    """Eventos SSE: lo pendiente y después cada cambio nuevo, con keepalive"""
+    yield f'retry: {int(CHANGES_POLL_INTERVAL * 1000)}\n\n'
+    while True:
+        for change in changes.changes:
+            yield _sse_event(change)
+        if not changes.has_more:
+            woken = _wait_for_notification(sequence, CHANGES_KEEPALIVE)
+            if woken is None:
+                yield ': keepalive\n\n'
+            else:
+                sequence = woken
+        changes = package_service.get_changes(changes.next_cursor, limit, CHANGES_SAFETY_LAG)
+
+@package_bp.route('/packages/changes', methods=['GET'])
+def get_package_changes():
+    """Altas, cambios y bajas de paquetes posteriores a un cursor.
+
+    Sin ``since`` se recorre desde el inicio. Con ``wait`` (segundos) la
+    respuesta espera a que haya cambios; con ``Accept: text/event-stream``
+    se abre un stream SSE que acepta ``Last-Event-ID`` para reanudar.
+    Las respuestas que esperan (``wait`` o SSE) tienen un tope de
+    ``PACKAGES_CHANGES_MAX_WAITERS``; pasado el tope responden 503.
+    """
+    waiting = False
+    try:
+        limit, wait = _parse_changes_params(request.args)
+        since = request.args.get('since') or request.headers.get('Last-Event-ID') or None
+        sse = request.accept_mimetypes.best_match(['application/json', 'text/event-stream']) == 'text/event-stream'
+        
+        if sse or wait > 0:
+            if not changes_waiters.acquire():
+                return _waiters_exhausted_response(jsonify({'error': 'Too many change feed waiters'}))
+            waiting = True
+        
+        # La secuencia se toma antes de la primera consulta: un aviso entre
+        # medio no se pierde
+        sequence = change_feed.sequence
+        if sse:
+            # La primera consulta va fuera del stream para responder 400 a un cursor inválido
+            changes = package_service.get_changes(since, limit, CHANGES_SAFETY_LAG)
+            response = Response(_stream_changes(changes, limit, sequence), mimetype='text/event-stream')
+            response.headers['Cache-Control'] = 'no-cache'
+            response.headers['X-Accel-Buffering'] = 'no'
+            # El lugar se libera cuando el servidor cierra el stream
+            response.call_on_close(changes_waiters.release)
+            waiting = False
+            return response
+        
+        return jsonify(_long_poll_changes(since, limit, wait, sequence).to_dict())
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error getting package changes: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+    finally:
+        if waiting:
+            changes_waiters.release()
+
+def _expected_version(data: dict):
+    """Versión esperada desde If-Match o el campo ``version`` del cuerpo.
+
+    Retorna (versión o None, error). Los ETag de un paquete son su versión.
+    """
+    if request.if_match:
+        if request.if_match.star_tag:
+            return None, None
+        tags = request.if_match.as_set()
+        if len(tags) != 1 or not next(iter(tags)).isdigit():
+            return None, 'If-Match must be a single package ETag'
+        return int(next(iter(tags))), None
+    if 'version' in data:
+        if not isinstance(data['version'], int) or isinstance(data['version'], bool):
+            return None, 'version must be an integer'
+        return data['version'], None
+    return None, None
+
+def _update_package(package_id: str, strict: bool):
+    data = request.get_json(silent=True)
+    error = validate_package_data(data, partial=True)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    expected_version, error = _expected_version(data)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    changes = {key: value for key, value in data.items() if key != 'version'}
+    if not strict:
+        # PUT conserva su comportamiento: los campos no editables se ignoran
+        changes = {key: value for key, value in changes.items() if key in PATCHABLE_FIELDS}
+    if not changes:
+        return jsonify({'error': 'No updatable fields provided'}), 400
+    
+    try:
+        package = package_service.update_package(package_id, changes, expected_version)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except StaleVersionError:
+        return jsonify({'error': 'Package was modified by another request'}), 412
+    if not package:
+        return jsonify({'error': 'Package not found'}), 404
+    public_catalogue.invalidate()
+    
+    response = jsonify({
+        'message': 'Package updated successfully',
+        'package': package
+    })
+    response.set_etag(str(package.version))
+    return response
+
 @package_bp.route('/packages/<package_id>', methods=['PUT'])
 @require_auth
 @require_admin
 def update_package(package_id):
     """Actualizar paquete turístico"""
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
-        
-        # Validar tipos de datos si están presentes
-        if 'price' in data and (not isinstance(data['price'], (int, float)) or data['price'] <= 0):
-            return jsonify({'error': 'Price must be a positive number'}), 400
-        
-        if 'duration_days' in data and (not isinstance(data['duration_days'], int) or data['duration_days'] <= 0):
-            return jsonify({'error': 'Duration days must be a positive integer'}), 400
-        
-        if 'max_participants' in data and (not isinstance(data['max_participants'], int) or data['max_participants'] <= 0):
-            return jsonify({'error': 'Max participants must be a positive integer'}), 400
-        
-        package = package_service.update_package(package_id, data)
-        if not package:
-            return jsonify({'error': 'Package not found'}), 404
-        
-        return jsonify({
-            'message': 'Package updated successfully',
-            'package': package.to_dict()
-        })
+        return _update_package(package_id, strict=False)
     except Exception as e:
         logger.error(f"Error updating package: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@package_bp.route('/packages/<package_id>', methods=['PATCH'])
+@require_auth
+@require_admin
+def patch_package(package_id):
+    """Actualizar solo los campos enviados, con control de concurrencia por If-Match"""
+    try:
+        return _update_package(package_id, strict=True)
+    except Exception as e:
+        logger.error(f"Error patching package: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @package_bp.route('/packages/<package_id>', methods=['DELETE'])
 @require_auth
 @require_admin
@@ -119,6 +580,7 @@ def delete_package(package_id):
     """Eliminar paquete turístico"""
     try:
         if package_service.delete_package(package_id):
+            public_catalogue.invalidate()
             return jsonify({'message': 'Package deleted successfully'})
         else:
             return jsonify({'error': 'Package not found'}), 404
@@ -130,10 +592,20 @@ def delete_package(package_id):
 def get_package_by_id(package_id):
     """Obtener un paquete específico por su ID"""
     try:
-        package = package_service.get_package_by_id(package_id)
-        if not package:
+        # Primero solo la versión: un 304 no lee ni serializa el paquete
+        version = package_service.get_package_version(package_id)
+        if version is None:
             return jsonify({'error': 'Package not found'}), 404
-        return jsonify(package.to_dict()), 200
+        
+        def build():
+            # Si cambió entre ambas lecturas el cliente guarda un ETag viejo
+            # con datos nuevos: solo provoca un 200 extra
+            package = package_service.get_package_by_id(package_id)
+            if not package:
+                return jsonify({'error': 'Package not found'}), 404
+            return jsonify(package)
+        
+        return _conditional_response(str(version), version_to_timestamp(version), 'public, no-cache', build)
     except Exception as e:
         logger.error(f"Error getting package by ID: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -0,0 +1,89 @@
+import asyncio
+import asyncpg
+import os
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AsyncPostgresConnection:
+    """Pool asyncpg para el modo de servicio ASGI.
+
+    Usa las mismas variables PG_* que ``PostgresConnection``. El pool vive en
+    el event loop que lo abre, por eso ``connect`` se llama desde el lifespan
+    de la aplicación ASGI y no al importar el módulo. Las tablas las crea el
+    pool síncrono; aquí solo se leen.
+    """
+
+    def __init__(self):
+        self.config = {
+            'host': os.environ.get('PG_HOST', 'localhost'),
+            'database': os.environ.get('PG_DATABASE', 'packages_db'),
+            'user': os.environ.get('PG_USER', 'postgres'),
+            'password': os.environ.get('PG_PASSWORD', 'postgres'),
+            'port': int(os.environ.get('PG_PORT', 5432))
+        }
+        self.min_size = int(os.environ.get('PG_ASYNC_POOL_MIN', os.environ.get('PG_POOL_MIN', 2)))
+        self.max_size = max(self.min_size, int(os.environ.get('PG_ASYNC_POOL_MAX', os.environ.get('PG_POOL_MAX', 20))))
+        self.timeout = float(os.environ.get('PG_POOL_TIMEOUT', 5))
+        self.connect_retries = int(os.environ.get('PG_CONNECT_RETRIES', 5))
+        self.pool = None
+        self._metrics = {'queries': 0, 'query_time_total': 0.0}
+
+    async def connect(self):
+        """Abrir el pool, reintentando con backoff mientras la base arranca"""
+        for attempt in range(1, self.connect_retries + 1):
+            try:
+                self.pool = await asyncpg.create_pool(
+                    min_size=self.min_size,
+                    max_size=self.max_size,
+                    timeout=self.timeout,
+                    **self.config
+                )
+                logger.info(f"asyncpg pool established ({self.min_size}-{self.max_size} connections)")
+                return
+            except (OSError, asyncpg.PostgresError) as e:
+                if attempt == self.connect_retries:
+                    logger.error(f"Error connecting to PostgreSQL: {e}")
+                    raise
+                delay = min(2 ** attempt, 30)
+                logger.warning(f"PostgreSQL not ready ({e}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+
+    async def disconnect(self):
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+            logger.info("asyncpg pool closed")
+
+    async def fetch(self, query: str, *args) -> list:
+        start = time.perf_counter()
+        try:
+            return await self.pool.fetch(query, *args, timeout=self.timeout)
+        finally:
+            self._record(start)
+
+    async def fetchrow(self, query: str, *args):
+        start = time.perf_counter()
+        try:
+            return await self.pool.fetchrow(query, *args, timeout=self.timeout)
+        finally:
+            self._record(start)
+
+    def _record(self, start: float):
+        self._metrics['queries'] += 1
+        self._metrics['query_time_total'] += time.perf_counter() - start
+
+    def stats(self) -> dict:
+        if self.pool is None:
+            return {'connected': False}
+        queries = self._metrics['queries']
+        return {
+            'connected': True,
+            'size': self.pool.get_size(),
+            'idle': self.pool.get_idle_size(),
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            'queries': queries,
+            'avg_query_ms': round(self._metrics['query_time_total'] * 1000 / queries, 3) if queries else 0.0
+        }
@@ -1,13 +1,29 @@
 import psycopg2
 import psycopg2.extras
+import psycopg2.extensions
+import collections
+import threading
+import time
+import uuid
 import os
 import logging
+from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+class PoolTimeoutError(Exception):
+    """No se obtuvo una conexión del pool dentro del tiempo de espera"""
+
 class PostgresConnection:
+    """Pool de conexiones PostgreSQL seguro entre hilos.
+
+    Cada consulta o unidad de trabajo toma una conexión propia y la devuelve al
+    terminar, así los requests concurrentes no se serializan sobre un único
+    socket. Mantiene al menos ``min_size`` conexiones abiertas y crea nuevas
+    hasta ``max_size``; si todas están ocupadas se espera hasta ``timeout``.
+    """
+    
     def __init__(self):
-        self.connection = None
         self.config = {
             'host': os.environ.get('PG_HOST', 'localhost'),
             'database': os.environ.get('PG_DATABASE', 'packages_db'),
@@ -15,58 +31,238 @@ class PostgresConnection:
             'password': os.environ.get('PG_PASSWORD', 'postgres'),
             'port': int(os.environ.get('PG_PORT', 5432))
         }
+        self.min_size = int(os.environ.get('PG_POOL_MIN', 2))
+        self.max_size = max(self.min_size, int(os.environ.get('PG_POOL_MAX', 20)))
+        self.timeout = float(os.environ.get('PG_POOL_TIMEOUT', 5))
+        # Las conexiones inactivas más tiempo que esto se validan antes de usarse
+        self.validate_after = float(os.environ.get('PG_POOL_VALIDATE_AFTER', 30))
+        self.connect_retries = int(os.environ.get('PG_CONNECT_RETRIES', 5))
+        self._idle = collections.deque()
+        self._size = 0
+        self._cond = threading.Condition()
+        self._metrics = {
+            'checkouts': 0, 'wait_time_total': 0.0, 'wait_time_max': 0.0,
+            'timeouts': 0, 'created': 0, 'discarded': 0
+        }
     
     def connect(self):
+        """Abrir las conexiones mínimas del pool"""
         try:
-            self.connection = psycopg2.connect(**self.config)
-            self.connection.autocommit = True
-            logger.info("PostgreSQL connection established")
-            self._create_tables()
+            connections = [self._open_connection() for _ in range(self.min_size)]
         except Exception as e:
             logger.error(f"Error connecting to PostgreSQL: {e}")
             raise
+        with self._cond:
+            self._size += len(connections)
+            self._idle.extend((connection, time.monotonic()) for connection in connections)
+            self._cond.notify_all()
+        logger.info(f"PostgreSQL pool established ({self.min_size}-{self.max_size} connections)")
     
     def disconnect(self):
-        if self.connection:
-            self.connection.close()
-            logger.info("PostgreSQL connection closed")
+        with self._cond:
+            idle, self._idle = self._idle, collections.deque()
+            self._size -= len(idle)
+        for connection, _ in idle:
+            self._close(connection)
+        logger.info("PostgreSQL pool closed")
     
-    def execute_query(self, query: str, params: tuple = None, fetch: bool = False):
-        if not self.connection:
-            self.connect()
-        
-        cursor = self.connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+    @contextmanager
+    def get_connection(self):
+        """Tomar una conexión (en autocommit) del pool y devolverla al salir"""
+        connection = self._checkout()
+        broken = False
         try:
-            cursor.execute(query, params)
-            if fetch:
-                return cursor.fetchall()
-            return cursor.rowcount
-        except Exception as e:
-            logger.error(f"Error executing query: {e}")
+            yield connection
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            # El socket probablemente murió: no devolverlo al pool
+            broken = True
             raise
         finally:
-            cursor.close()
+            # finally cubre también GeneratorExit cuando se abandona un stream
+            if broken:
+                self._discard(connection)
+            else:
+                self._release(connection)
+    
+    @contextmanager
+    def transaction(self):
+        """Ejecutar varias sentencias sobre una misma conexión como una transacción"""
+        with self.get_connection() as connection:
+            connection.autocommit = False
+            try:
+                cursor = connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+                try:
+                    yield cursor
+                finally:
+                    cursor.close()
+                connection.commit()
+            except Exception:
+                if not connection.closed:
+                    connection.rollback()
+                raise
+            finally:
+                if not connection.closed:
+                    connection.autocommit = True
+    
+    def execute_query(self, query: str, params: tuple = None, fetch: bool = False):
+        with self.get_connection() as connection:
+            cursor = connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            try:
+                cursor.execute(query, params)
+                if fetch:
+                    return cursor.fetchall()
+                return cursor.rowcount
+            except Exception as e:
+                logger.error(f"Error executing query: {e}")
+                raise
+            finally:
+                cursor.close()
     
-    def _create_tables(self):
-        """Crear tablas si no existen"""
-        create_table_query = """
-        CREATE TABLE IF NOT EXISTS packages (
-            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-            name VARCHAR(255) NOT NULL,
-            description TEXT,
-            price DECIMAL(10,2) NOT NULL CHECK (price > 0),
-            duration_days INTEGER NOT NULL CHECK (duration_days > 0),
-            max_participants INTEGER NOT NULL CHECK (max_participants > 0),
-            location VARCHAR(255) NOT NULL,
-            includes TEXT[],
-            available_from DATE,
-            available_to DATE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            is_active BOOLEAN DEFAULT TRUE
-        );
+    def stream_query(self, query: str, params: tuple = None, batch_size: int = 1000):
+        """Iterar el resultado con un cursor del servidor, de a ``batch_size`` filas.
 
-        CREATE INDEX IF NOT EXISTS idx_packages_active ON packages(is_active);
-        CREATE INDEX IF NOT EXISTS idx_packages_location ON packages(location);
+        La conexión queda tomada mientras se consume el generador; cerrarlo
+        antes de tiempo la devuelve al pool.
         """
-        self.execute_query(create_table_query)
\ No newline at end of file
+        with self.get_connection() as connection:
+            connection.autocommit = False
+            cursor = connection.cursor(name=f'stream_{uuid.uuid4().hex}', cursor_factory=psycopg2.extras.RealDictCursor)
+            cursor.itersize = batch_size
+            try:
+                cursor.execute(query, params)
+                for row in cursor:
+                    yield row
+            finally:
+                if not connection.closed:
+                    cursor.close()
+                    connection.rollback()
+                    connection.autocommit = True
+    
+    def open_listener(self, channel: str):
+        """Conexión dedicada (fuera del pool) suscrita con LISTEN a ``channel``"""
+        connection = psycopg2.connect(**self.config)
+        connection.autocommit = True
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"LISTEN {channel}")
+        finally:
+            cursor.close()
+        return connection
+    
+    def stats(self) -> dict:
+        with self._cond:
+            checkouts = self._metrics['checkouts']
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'checkouts': checkouts,
+                'wait_time_avg_ms': round(self._metrics['wait_time_total'] / checkouts * 1000, 3) if checkouts else 0.0,
+                'wait_time_max_ms': round(self._metrics['wait_time_max'] * 1000, 3),
+                'timeouts': self._metrics['timeouts'],
+                'created': self._metrics['created'],
+                'discarded': self._metrics['discarded']
+            }
+    
+    def _checkout(self):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        while True:
+            connection, idle_since, create = None, None, False
+            with self._cond:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._metrics['timeouts'] += 1
+                        raise PoolTimeoutError(f"No PostgreSQL connection available after {self.timeout}s")
+                    self._cond.wait(remaining)
+                if self._idle:
+                    connection, idle_since = self._idle.pop()
+                else:
+                    # Reservar el cupo antes de conectar fuera del lock
+                    self._size += 1
+                    create = True
+            
+            if create:
+                try:
+                    connection = self._open_connection()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_usable(connection, idle_since):
+                self._discard(connection)
+                continue
+            
+            waited = time.monotonic() - started
+            with self._cond:
+                self._metrics['checkouts'] += 1
+                self._metrics['wait_time_total'] += waited
+                self._metrics['wait_time_max'] = max(self._metrics['wait_time_max'], waited)
+            return connection
+    
+    def _release(self, connection):
+        if connection.closed:
+            self._discard(connection)
+            return
+        if connection.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except psycopg2.Error:
+                self._discard(connection)
+                return
+        with self._cond:
+            # LIFO: la conexión recién usada es la que menos probablemente
+            # necesite validarse en el próximo checkout
+            self._idle.append((connection, time.monotonic()))
+            self._cond.notify()
+    
+    def _discard(self, connection):
+        self._close(connection)
+        with self._cond:
+            self._size -= 1
+            self._metrics['discarded'] += 1
+            self._cond.notify()
+    
+    def _is_usable(self, connection, idle_since: float) -> bool:
+        if connection.closed:
+            return False
+        if time.monotonic() - idle_since < self.validate_after:
+            return True
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+            return True
+        except psycopg2.Error:
+            logger.warning("Discarding stale PostgreSQL connection")
+            return False
+    
+    def _open_connection(self):
+        """Abrir una conexión reintentando con backoff exponencial"""
+        delay = 0.5
+        for attempt in range(1, self.connect_retries + 1):
+            try:
+                connection = psycopg2.connect(**self.config)
+                connection.autocommit = True
+                with self._cond:
+                    self._metrics['created'] += 1
+                return connection
+            except psycopg2.OperationalError as e:
+                if attempt == self.connect_retries:
+                    raise
+                logger.warning(f"PostgreSQL connection attempt {attempt} failed: {e}; retrying in {delay}s")
+                time.sleep(delay)
+                delay = min(delay * 2, 8)
+    
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
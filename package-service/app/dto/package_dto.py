@@ -1,8 +1,23 @@
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
-@dataclass
+_EPOCH = datetime(1970, 1, 1)
+
+# Campos que un administrador puede modificar (PUT/PATCH)
+PATCHABLE_FIELDS = (
+    'name', 'description', 'price', 'duration_days', 'max_participants',
+    'location', 'includes', 'available_from', 'available_to'
+)
+
+def timestamp_to_version(value: datetime) -> int:
+    """Microsegundos desde epoch de un timestamp UTC (sin zona horaria)"""
+    return (value.replace(tzinfo=None) - _EPOCH) // timedelta(microseconds=1)
+
+def version_to_timestamp(version: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=version)
+
+@dataclass(slots=True)
 class PackageDTO:
     """Data Transfer Object para paquetes turísticos"""
     id: Optional[str] = None
@@ -26,15 +41,129 @@ class PackageDTO:
         if self.updated_at is None:
             self.updated_at = datetime.utcnow().isoformat()
     
+    @property
+    def version(self) -> int:
+        """Versión de la fila derivada de updated_at; sirve como ETag"""
+        return timestamp_to_version(datetime.fromisoformat(self.updated_at)) if self.updated_at else 0
+    
     def to_dict(self):
-        return asdict(self)
+        data = self.to_public_dict()
+        data['cost_price'] = self.cost_price
+        return data
     
     def to_public_dict(self):
-        """Versión segura para mostrar al público"""
-        data = self.to_dict()
-        data.pop('cost_price', None)  # Eliminamos información interna
-        return data
+        """Versión segura para mostrar al público (sin cost_price)"""
+        # Armado a mano: asdict hace una copia recursiva por cada paquete
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'price': self.price,
+            'duration_days': self.duration_days,
+            'max_participants': self.max_participants,
+            'location': self.location,
+            'includes': list(self.includes),
+            'available_from': self.available_from,
+            'available_to': self.available_to,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'is_active': self.is_active
+        }
     
     @classmethod
     def from_dict(cls, data: dict):
-        return cls(**data)
\ No newline at end of file
+        return cls(**data)
+
+@dataclass
+class CatalogueVersionDTO:
+    """Versión del catálogo completo: último cambio y cantidad de paquetes activos.
+
+    ``settled`` es False mientras haya una escritura abierta que empezó antes
+    de ``last_modified``: al confirmar cambiaría el contenido sin mover el
+    máximo ni el total, así que esa versión no sirve como validador.
+    """
+    last_modified: Optional[datetime] = None
+    total: int = 0
+    today: Optional[date] = None
+    settled: bool = True
+    
+    @property
+    def version(self) -> int:
+        return timestamp_to_version(self.last_modified) if self.last_modified else 0
+
+@dataclass
+class PackagePageDTO:
+    """Página de paquetes con el cursor para pedir la siguiente"""
+    items: List[dict] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    limit: int = 0
+    
+    def to_dict(self):
+        return {
+            'packages': self.items,
+            'next': self.next_cursor,
+            'limit': self.limit
+        }
+
+@dataclass(slots=True)
+class PackageChangeDTO:
+    """Un evento del feed de cambios; las bajas (tombstones) no llevan paquete"""
+    id: str
+    type: str  # create, update o delete
+    version: int
+    updated_at: str
+    cursor: str
+    package: Optional[PackageDTO] = None
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'type': self.type,
+            'version': self.version,
+            'updated_at': self.updated_at,
+            'cursor': self.cursor,
+            'package': self.package.to_public_dict() if self.package else None
+        }
+
+@dataclass
+class PackageChangesDTO:
+    """Lote de cambios en orden de (updated_at, id) y el cursor para continuar"""
+    changes: List[PackageChangeDTO] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    
+    def to_dict(self):
+        return {
+            'changes': [change.to_dict() for change in self.changes],
+            'next': self.next_cursor,
+            'has_more': self.has_more
+        }
+
+@dataclass
+class PackageSearchCriteria:
+    """Filtros de GET /packages/search; los campos en None no filtran"""
+    text: Optional[str] = None
+    location: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    duration_days: Optional[int] = None
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    limit: int = 20
+    offset: int = 0
+
+@dataclass
+class PackageSearchResultDTO:
+    """Resultado de una búsqueda, ordenado por relevancia"""
+    items: List[PackageDTO] = field(default_factory=list)
+    total: int = 0
+    limit: int = 0
+    offset: int = 0
+    
+    def to_dict(self):
+        return {
+            'packages': [package.to_public_dict() for package in self.items],
+            'total': self.total,
+            'limit': self.limit,
+            'offset': self.offset
+        }
\ No newline at end of file
@@ -1,19 +1,73 @@
 from app.repositories.package_repository import PackageRepository
 from app.repositories.postgres_package_repository import PostgresPackageRepository
+from app.repositories.cached_package_repository import CachedPackageRepository
+from app.repositories.async_package_repository import AsyncPackageRepository
 from app.db.postgres_connection import PostgresConnection
+import os
+import threading
 
 class RepositoryFactory:
     """Factory para crear repositorios"""
     
+    # Un solo pool compartido por todos los repositorios del proceso
+    _connection = None
+    _cached_repository = None
+    _async_connection = None
+    _lock = threading.Lock()
+    
+    @classmethod
+    def get_connection(cls) -> PostgresConnection:
+        if cls._connection is None:
+            with cls._lock:
+                if cls._connection is None:
+                    db_connection = PostgresConnection()
+                    db_connection.connect()
+                    cls._connection = db_connection
+        return cls._connection
+    
+    @classmethod
+    def get_cached_repository(cls) -> CachedPackageRepository:
+        """Cache compartido, para que las escrituras invaliden a todos los lectores"""
+        if cls._cached_repository is None:
+            repository = PostgresPackageRepository(cls.get_connection())
+            with cls._lock:
+                if cls._cached_repository is None:
+                    cls._cached_repository = CachedPackageRepository(
+                        repository,
+                        max_size=int(os.environ.get('PACKAGE_CACHE_SIZE', 10000)),
+                        ttl=float(os.environ.get('PACKAGE_CACHE_TTL', 60)),
+                        negative_ttl=float(os.environ.get('PACKAGE_CACHE_NEGATIVE_TTL', 5))
+                    )
+        return cls._cached_repository
+    
+    @staticmethod
+    def cache_enabled() -> bool:
+        return os.environ.get('PACKAGE_CACHE_ENABLED', 'true').lower() == 'true'
+    
     @staticmethod
     def create_package_repository() -> PackageRepository:
-        db_connection = PostgresConnection()
-        db_connection.connect()
-        return PostgresPackageRepository(db_connection)
+        if RepositoryFactory.cache_enabled():
+            return RepositoryFactory.get_cached_repository()
+        return PostgresPackageRepository(RepositoryFactory.get_connection())
     
     @staticmethod
     def create_public_package_repository() -> PackageRepository:
         """Repositorio con acceso solo de lectura para endpoints públicos"""
-        db_connection = PostgresConnection()
-        db_connection.connect()
-        return PostgresPackageRepository(db_connection)
\ No newline at end of file
+        if RepositoryFactory.cache_enabled():
+            return RepositoryFactory.get_cached_repository()
+        return PostgresPackageRepository(RepositoryFactory.get_connection())
+    
+    @classmethod
+    def get_async_connection(cls):
+        """Pool asyncpg del modo ASGI; se abre en el lifespan de la app, no aquí"""
+        if cls._async_connection is None:
+            # Import diferido: el modo WSGI no necesita asyncpg instalado
+            from app.db.async_postgres_connection import AsyncPostgresConnection
+            cls._async_connection = AsyncPostgresConnection()
+        return cls._async_connection
+    
+    @staticmethod
+    def create_async_package_repository() -> AsyncPackageRepository:
+        """Repositorio de lectura sobre asyncpg, usado cuando SERVER_MODE=asgi"""
+        from app.repositories.asyncpg_package_repository import AsyncpgPackageRepository
+        return AsyncpgPackageRepository(RepositoryFactory.get_async_connection())
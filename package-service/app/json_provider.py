@@ -0,0 +1,32 @@
+from decimal import Decimal
+from flask.json.provider import JSONProvider
+import orjson
+
+def _default(value):
+    # Tipos que orjson no serializa por sí solo
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps_bytes(obj) -> bytes:
+    """Serializar a bytes con las mismas reglas del proveedor (se usa también en ASGI)"""
+    return orjson.dumps(obj, default=_default)
+
+class OrjsonProvider(JSONProvider):
+    """Proveedor JSON de Flask sobre orjson.
+
+    Escribe directo a bytes y serializa dataclasses, datetime y UUID de forma
+    nativa, sin pasar por dicts intermedios ni por el encoder de la stdlib.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype='application/json')
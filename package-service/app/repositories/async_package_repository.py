@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+from app.dto.package_dto import PackageDTO, CatalogueVersionDTO, PackageChangesDTO, PackagePageDTO
+
+class AsyncPackageRepository(ABC):
+    """Interface asíncrona para las lecturas de paquetes del modo ASGI.
+
+    Cubre solo los caminos de lectura; las escrituras siguen en
+    ``PackageRepository``.
+    """
+
+    @abstractmethod
+    async def find_by_id(self, package_id: str) -> Optional[PackageDTO]:
+        pass
+
+    @abstractmethod
+    async def find_version(self, package_id: str) -> Optional[int]:
+        pass
+
+    @abstractmethod
+    async def find_by_ids(self, package_ids: List[str]) -> Dict[str, PackageDTO]:
+        pass
+
+    @abstractmethod
+    async def find_all(self) -> List[PackageDTO]:
+        pass
+
+    @abstractmethod
+    async def find_available(self) -> List[PackageDTO]:
+        pass
+
+    @abstractmethod
+    async def find_page(self, limit: int, cursor: Optional[str] = None, fields: Optional[List[str]] = None,
+                        available_only: bool = False) -> PackagePageDTO:
+        pass
+
+    @abstractmethod
+    async def get_catalogue_version(self, lag: float = 1.0) -> CatalogueVersionDTO:
+        pass
+
+    @abstractmethod
+    async def find_changes(self, since: Optional[str] = None, limit: int = 100, lag: float = 1.0) -> PackageChangesDTO:
+        pass
@@ -0,0 +1,172 @@
+from typing import Dict, List, Optional
+from app.repositories.async_package_repository import AsyncPackageRepository
+from app.repositories.postgres_package_repository import (
+    PACKAGE_COLUMNS, row_to_change, row_to_dict, row_to_dto, encode_cursor, decode_cursor
+)
+from app.dto.package_dto import timestamp_to_version, PackageDTO, CatalogueVersionDTO, PackageChangesDTO, PackagePageDTO
+from app.db.async_postgres_connection import AsyncPostgresConnection
+from datetime import datetime
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _parse_uuid(value: str) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(value)
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+class AsyncpgPackageRepository(AsyncPackageRepository):
+    """Lecturas de paquetes sobre asyncpg.
+
+    Las consultas son las mismas de ``PostgresPackageRepository`` con
+    parámetros ``$n``; los ``Record`` se indexan por nombre, así que se
+    reutilizan ``row_to_dto``, ``row_to_dict`` y el formato del cursor.
+    """
+
+    def __init__(self, db_connection: AsyncPostgresConnection):
+        self.db = db_connection
+
+    async def find_by_id(self, package_id: str) -> Optional[PackageDTO]:
+        parsed = _parse_uuid(package_id)
+        if parsed is None:
+            return None
+        query = f"""
+        SELECT {', '.join(PACKAGE_COLUMNS)}
+        FROM packages WHERE id = $1 AND is_active = TRUE
+        """
+        row = await self.db.fetchrow(query, parsed)
+        return row_to_dto(row) if row else None
+
+    async def find_version(self, package_id: str) -> Optional[int]:
+        parsed = _parse_uuid(package_id)
+        if parsed is None:
+            return None
+        row = await self.db.fetchrow("SELECT updated_at FROM packages WHERE id = $1 AND is_active = TRUE", parsed)
+        return timestamp_to_version(row['updated_at']) if row else None
+
+    async def find_by_ids(self, package_ids: List[str]) -> Dict[str, PackageDTO]:
+        """Buscar varios paquetes activos en una sola consulta; los IDs inválidos se ignoran"""
+        requested = {}
+        for package_id in package_ids:
+            parsed = _parse_uuid(package_id)
+            if parsed is not None:
+                requested[parsed] = package_id
+        if not requested:
+            return {}
+
+        query = f"""
+        SELECT {', '.join(PACKAGE_COLUMNS)}
+        FROM packages WHERE id = ANY($1::uuid[]) AND is_active = TRUE
+        """
+        result = await self.db.fetch(query, list(requested))
+        return {requested[row['id']]: row_to_dto(row) for row in result}
+
+    async def find_all(self) -> List[PackageDTO]:
+        query = f"""
+        SELECT {', '.join(PACKAGE_COLUMNS)}
+        FROM packages WHERE is_active = TRUE
+        ORDER BY created_at DESC
+        """
+        return [row_to_dto(row) for row in await self.db.fetch(query)]
+
+    async def find_available(self) -> List[PackageDTO]:
+        query = f"""
+        SELECT {', '.join(PACKAGE_COLUMNS)}
+        FROM packages
+        WHERE is_active = TRUE
+        AND available_from <= CURRENT_DATE
+        AND available_to >= CURRENT_DATE
+        ORDER BY created_at DESC, id DESC
+        """
+        return [row_to_dto(row) for row in await self.db.fetch(query)]
+
+    async def find_page(self, limit: int, cursor: Optional[str] = None, fields: Optional[List[str]] = None,
+                        available_only: bool = False) -> PackagePageDTO:
+        """Página keyset igual a ``PostgresPackageRepository.find_page``"""
+        columns = list(fields) if fields else list(PACKAGE_COLUMNS)
+        unknown = set(columns) - set(PACKAGE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        selected = list(dict.fromkeys(columns + ['created_at', 'id']))
+
+        conditions = ["is_active = TRUE"]
+        params = []
+        if available_only:
+            conditions.append("available_from <= CURRENT_DATE AND available_to >= CURRENT_DATE")
+        if cursor:
+            # asyncpg exige los tipos nativos, no las cadenas del cursor
+            created_at, package_id = decode_cursor(cursor)
+            conditions.append("(created_at, id) < ($1::timestamp, $2::uuid)")
+            params.extend([datetime.fromisoformat(created_at), uuid.UUID(package_id)])
+
+        params.append(limit + 1)
+        query = f"""
+        SELECT {', '.join(selected)}
+        FROM packages WHERE {' AND '.join(conditions)}
+        ORDER BY created_at DESC, id DESC
+        LIMIT ${len(params)}
+        """
+        result = await self.db.fetch(query, *params)
+
+        rows = result[:limit]
+        next_cursor = None
+        if len(result) > limit:
+            last = rows[-1]
+            next_cursor = encode_cursor(last['created_at'], last['id'])
+        return PackagePageDTO(
+            items=[row_to_dict(row, columns) for row in rows],
+            next_cursor=next_cursor,
+            limit=limit
+        )
+
+    async def _visibility_bound(self, lag: float):
+        """Mismo límite que ``PostgresPackageRepository``; se lee antes que los datos"""
+        row = await self.db.fetchrow("""
+        SELECT LEAST(
+            LOCALTIMESTAMP - $1::float8 * INTERVAL '1 second',
+            (SELECT MIN(xact_start) FROM pg_stat_activity
+             WHERE backend_xid IS NOT NULL AND datname = current_database())::timestamp
+        ) AS bound
+        """, lag)
+        return row['bound']
+
+    async def get_catalogue_version(self, lag: float = 1.0) -> CatalogueVersionDTO:
+        bound = await self._visibility_bound(lag)
+        query = """
+        SELECT (SELECT MAX(updated_at) FROM packages) AS last_modified,
+               (SELECT COUNT(*) FROM packages WHERE is_active = TRUE) AS total,
+               CURRENT_DATE AS today
+        """
+        row = await self.db.fetchrow(query)
+        return CatalogueVersionDTO(
+            last_modified=row['last_modified'], total=row['total'], today=row['today'],
+            settled=row['last_modified'] is None or row['last_modified'] < bound
+        )
+
+    async def find_changes(self, since: Optional[str] = None, limit: int = 100, lag: float = 1.0) -> PackageChangesDTO:
+        """Feed de cambios igual a ``PostgresPackageRepository.find_changes``"""
+        bound = await self._visibility_bound(lag)
+        conditions = ["updated_at < $1"]
+        params = [bound]
+        if since:
+            updated_at, package_id = decode_cursor(since)
+            conditions.append("(updated_at, id) > ($2::timestamp, $3::uuid)")
+            params.extend([datetime.fromisoformat(updated_at), uuid.UUID(package_id)])
+
+        params.append(limit + 1)
+        query = f"""
+        SELECT {', '.join(PACKAGE_COLUMNS)}
+        FROM packages WHERE {' AND '.join(conditions)}
+        ORDER BY updated_at, id
+        LIMIT ${len(params)}
+        """
+        result = await self.db.fetch(query, *params)
+
+        changes = [row_to_change(row) for row in result[:limit]]
+        return PackageChangesDTO(
+            changes=changes,
+            next_cursor=changes[-1].cursor if changes else since,
+            has_more=len(result) > limit
+        )
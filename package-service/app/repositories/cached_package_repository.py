@@ -0,0 +1,216 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import replace
+from typing import Dict, Iterator, List, Optional
+from app.repositories.package_repository import PackageRepository
+from app.dto.package_dto import PackageDTO, CatalogueVersionDTO, PackageChangesDTO, PackagePageDTO, PackageSearchCriteria, PackageSearchResultDTO
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Marca de "no existe" para el cache negativo
+_MISSING = object()
+
+def _copy(package: Optional[PackageDTO]) -> Optional[PackageDTO]:
+    # update_package modifica el DTO que recibe; nunca se entrega el objeto cacheado
+    if package is None:
+        return None
+    return replace(package, includes=list(package.includes))
+
+class CachedPackageRepository(PackageRepository):
+    """Decorador con cache read-through para ``find_by_id``.
+
+    Mantiene un LRU acotado con TTL, recuerda por ``negative_ttl`` los IDs que
+    no existen y agrupa las lecturas concurrentes de un mismo ID en una sola
+    consulta. Las escrituras de este proceso invalidan la entrada al momento;
+    las de otras réplicas se ven a más tardar al vencer el TTL.
+    """
+
+    def __init__(self, repository: PackageRepository, max_size: int = 10000,
+                 ttl: float = 60, negative_ttl: float = 5):
+        self.repository = repository
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # Cambia con cada invalidación; protege las cargas por lote
+        self._generation = 0
+
+    def find_by_id(self, package_id: str) -> Optional[PackageDTO]:
+        with self._lock:
+            entry = self._entries.get(package_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(package_id)
+                if entry[1] is _MISSING:
+                    self.negative_hits += 1
+                    return None
+                self.hits += 1
+                return _copy(entry[1])
+
+            self.misses += 1
+            future = self._inflight.get(package_id)
+            leader = future is None
+            if leader:
+                future = self._inflight[package_id] = Future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return _copy(future.result())
+
+        try:
+            package = self.repository.find_by_id(package_id)
+        except Exception as e:
+            with self._lock:
+                if self._inflight.get(package_id) is future:
+                    del self._inflight[package_id]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            # Si hubo una escritura durante la consulta, el resultado puede
+            # estar desactualizado: se entrega pero no se guarda
+            if self._inflight.get(package_id) is future:
+                del self._inflight[package_id]
+                self._store(package_id, package)
+        future.set_result(package)
+        return _copy(package)
+
+    def find_version(self, package_id: str) -> Optional[int]:
+        """Versión desde el cache si la entrada está vigente; si no, desde la base sin cachear"""
+        with self._lock:
+            entry = self._entries.get(package_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(package_id)
+                return None if entry[1] is _MISSING else entry[1].version
+        return self.repository.find_version(package_id)
+
+    def find_by_ids(self, package_ids: List[str]) -> Dict[str, PackageDTO]:
+        """Resolver desde el cache lo posible y el resto en una sola consulta"""
+        found = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            generation = self._generation
+            for package_id in dict.fromkeys(package_ids):
+                entry = self._entries.get(package_id)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(package_id)
+                    if entry[1] is _MISSING:
+                        self.negative_hits += 1
+                    else:
+                        self.hits += 1
+                        found[package_id] = _copy(entry[1])
+                else:
+                    self.misses += 1
+                    missing.append(package_id)
+
+        if missing:
+            loaded = self.repository.find_by_ids(missing)
+            with self._lock:
+                # Si hubo escrituras durante la consulta no se guarda nada
+                if self._generation == generation:
+                    for package_id in missing:
+                        self._store(package_id, loaded.get(package_id))
+            for package_id, package in loaded.items():
+                found[package_id] = _copy(package)
+        return found
+
+    def create(self, package: PackageDTO) -> PackageDTO:
+        created = self.repository.create(package)
+        self.invalidate(created.id)
+        return created
+
+    def create_many(self, packages: List[PackageDTO], chunk_size: int = 500) -> List[PackageDTO]:
+        created = self.repository.create_many(packages, chunk_size)
+        for package in created:
+            self.invalidate(package.id)
+        return created
+
+    def update(self, package: PackageDTO) -> PackageDTO:
+        updated = self.repository.update(package)
+        self.invalidate(package.id)
+        return updated
+
+    def patch(self, package_id: str, changes: dict, expected_version: Optional[int] = None) -> Optional[PackageDTO]:
+        try:
+            return self.repository.patch(package_id, changes, expected_version)
+        finally:
+            # También ante StaleVersionError: la copia cacheada ya no es la vigente
+            self.invalidate(package_id)
+
+    def delete(self, package_id: str) -> bool:
+        deleted = self.repository.delete(package_id)
+        self.invalidate(package_id)
+        return deleted
+
+    def find_all(self) -> List[PackageDTO]:
+        return self.repository.find_all()
+
+    def stream_all(self, batch_size: int = 1000) -> Iterator[PackageDTO]:
+        return self.repository.stream_all(batch_size)
+
+    def find_available(self) -> List[PackageDTO]:
+        return self.repository.find_available()
+
+    def find_page(self, limit: int, cursor: Optional[str] = None, fields: Optional[List[str]] = None,
+                  available_only: bool = False) -> PackagePageDTO:
+        return self.repository.find_page(limit, cursor, fields, available_only)
+
+    def search(self, criteria: PackageSearchCriteria) -> PackageSearchResultDTO:
+        return self.repository.search(criteria)
+
+    def get_catalogue_version(self, lag: float = 1.0) -> CatalogueVersionDTO:
+        # Es la consulta barata que permite responder 304; no se cachea
+        return self.repository.get_catalogue_version(lag)
+    
+    def find_changes(self, since: Optional[str] = None, limit: int = 100, lag: float = 1.0) -> PackageChangesDTO:
+        return self.repository.find_changes(since, limit, lag)
+
+    def invalidate(self, package_id: Optional[str] = None):
+        """Descartar una entrada, o todo el cache si no se indica ID"""
+        with self._lock:
+            self.invalidations += 1
+            self._generation += 1
+            if package_id is None:
+                self._entries.clear()
+                self._inflight.clear()
+            else:
+                self._entries.pop(package_id, None)
+                self._inflight.pop(package_id, None)
+
+    def _store(self, package_id: str, package: Optional[PackageDTO]):
+        if package is None:
+            entry = (time.monotonic() + self.negative_ttl, _MISSING)
+        else:
+            entry = (time.monotonic() + self.ttl, _copy(package))
+        self._entries[package_id] = entry
+        self._entries.move_to_end(package_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_ratio': round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0.0
+            }
@@ -1,6 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from app.dto.package_dto import PackageDTO
+from typing import Dict, Iterator, List, Optional
+from app.dto.package_dto import PackageDTO, CatalogueVersionDTO, PackageChangesDTO, PackagePageDTO, PackageSearchCriteria, PackageSearchResultDTO
+
+class StaleVersionError(Exception):
+    """El paquete cambió desde la versión que el cliente indicó (If-Match)"""
+
+class PackageDataError(ValueError):
+    """La base rechazó los datos de un paquete (tipo, largo o restricción)"""
 
 class PackageRepository(ABC):
     """Interface abstracta para el repositorio de paquetes"""
@@ -9,18 +15,61 @@ class PackageRepository(ABC):
     def create(self, package: PackageDTO) -> PackageDTO:
         pass
     
+    @abstractmethod
+    def create_many(self, packages: List[PackageDTO], chunk_size: int = 500) -> List[PackageDTO]:
+        pass
+    
     @abstractmethod
     def find_by_id(self, package_id: str) -> Optional[PackageDTO]:
         pass
     
+    @abstractmethod
+    def find_version(self, package_id: str) -> Optional[int]:
+        """Versión de un paquete activo sin leer el resto de la fila"""
+        pass
+    
+    @abstractmethod
+    def find_by_ids(self, package_ids: List[str]) -> Dict[str, PackageDTO]:
+        pass
+    
     @abstractmethod
     def find_all(self) -> List[PackageDTO]:
         pass
     
+    @abstractmethod
+    def stream_all(self, batch_size: int = 1000) -> Iterator[PackageDTO]:
+        pass
+    
+    @abstractmethod
+    def find_available(self) -> List[PackageDTO]:
+        pass
+    
+    @abstractmethod
+    def find_page(self, limit: int, cursor: Optional[str] = None, fields: Optional[List[str]] = None,
+                  available_only: bool = False) -> PackagePageDTO:
+        pass
+    
+    @abstractmethod
+    def search(self, criteria: PackageSearchCriteria) -> PackageSearchResultDTO:
+        pass
+    
+    @abstractmethod
+    def get_catalogue_version(self, lag: float = 1.0) -> CatalogueVersionDTO:
+        pass
+    
+    @abstractmethod
+    def find_changes(self, since: Optional[str] = None, limit: int = 100, lag: float = 1.0) -> PackageChangesDTO:
+        pass
+    
     @abstractmethod
     def update(self, package: PackageDTO) -> PackageDTO:
         pass
     
+    @abstractmethod
+    def patch(self, package_id: str, changes: dict, expected_version: Optional[int] = None) -> Optional[PackageDTO]:
+        """Actualizar solo los campos dados; lanza StaleVersionError si la versión no coincide"""
+        pass
+    
     @abstractmethod
     def delete(self, package_id: str) -> bool:
         pass
\ No newline at end of file
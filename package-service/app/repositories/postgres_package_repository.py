@@ -1,11 +1,94 @@
-from typing import List, Optional
-from app.repositories.package_repository import PackageRepository
-from app.dto.package_dto import PackageDTO
+from typing import Dict, Iterator, List, Optional
+from app.repositories.package_repository import PackageDataError, PackageRepository, StaleVersionError
+from app.dto.package_dto import PATCHABLE_FIELDS, timestamp_to_version, version_to_timestamp, PackageDTO, PackageChangeDTO, PackageChangesDTO, CatalogueVersionDTO, PackagePageDTO, PackageSearchCriteria, PackageSearchResultDTO
 from app.db.postgres_connection import PostgresConnection
+from datetime import datetime
+import psycopg2.extras
+import base64
+import json
+import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Columnas de la tabla en el orden en que se seleccionan
+PACKAGE_COLUMNS = (
+    'id', 'name', 'description', 'price', 'duration_days', 'max_participants',
+    'location', 'includes', 'available_from', 'available_to',
+    'created_at', 'updated_at', 'is_active'
+)
+
+def _iso_or_empty(value) -> str:
+    return value.isoformat() if value else ""
+
+# Conversión de cada columna al tipo que expone el DTO
+_COLUMN_CONVERTERS = {
+    'id': str,
+    'price': float,
+    'includes': lambda value: value or [],
+    'available_from': _iso_or_empty,
+    'available_to': _iso_or_empty,
+    'created_at': lambda value: value.isoformat(),
+    'updated_at': lambda value: value.isoformat(),
+}
+
+def row_to_dict(row: dict, columns=PACKAGE_COLUMNS) -> dict:
+    """Convertir una fila de la tabla packages en un dict serializable"""
+    result = {}
+    for column in columns:
+        converter = _COLUMN_CONVERTERS.get(column)
+        value = row[column]
+        result[column] = converter(value) if converter else value
+    return result
+
+def row_to_dto(row: dict) -> PackageDTO:
+    """Construir el DTO directo desde la fila, sin dict intermedio"""
+    available_from = row['available_from']
+    available_to = row['available_to']
+    return PackageDTO(
+        str(row['id']), row['name'], row['description'], float(row['price']),
+        row['duration_days'], row['max_participants'], row['location'],
+        row['includes'] or [],
+        available_from.isoformat() if available_from else "",
+        available_to.isoformat() if available_to else "",
+        row['created_at'].isoformat(), row['updated_at'].isoformat(),
+        row['is_active']
+    )
+
+def row_to_change(row: dict) -> PackageChangeDTO:
+    """Evento del feed para una fila; las filas inactivas son tombstones"""
+    if not row['is_active']:
+        change_type = 'delete'
+    elif row['created_at'] == row['updated_at']:
+        change_type = 'create'
+    else:
+        change_type = 'update'
+    return PackageChangeDTO(
+        id=str(row['id']),
+        type=change_type,
+        version=timestamp_to_version(row['updated_at']),
+        updated_at=row['updated_at'].isoformat(),
+        cursor=encode_cursor(row['updated_at'], row['id']),
+        package=row_to_dto(row) if row['is_active'] else None
+    )
+
+def _escape_like(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def encode_cursor(created_at, package_id) -> str:
+    """Cursor opaco con la posición (created_at, id) de la última fila"""
+    raw = json.dumps([created_at.isoformat(), str(package_id)]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, package_id = json.loads(raw)
+        # Validar aquí para no llevar un cursor manipulado hasta la base
+        return datetime.fromisoformat(created_at).isoformat(), str(uuid.UUID(package_id))
+    except (ValueError, TypeError, AttributeError) as e:
+        raise ValueError('Invalid cursor') from e
+
 class PostgresPackageRepository(PackageRepository):
     """Implementación PostgreSQL del repositorio de paquetes"""
     
@@ -33,6 +116,35 @@ class PostgresPackageRepository(PackageRepository):
         
         return package
     
+    def create_many(self, packages: List[PackageDTO], chunk_size: int = 500) -> List[PackageDTO]:
+        """Insertar varios paquetes con INSERT multi-fila, todo en una transacción"""
+        query = """
+        INSERT INTO packages (name, description, price, duration_days, max_participants,
+                            location, includes, available_from, available_to)
+        VALUES %s
+        RETURNING id, created_at, updated_at
+        """
+        values = [
+            (
+                package.name, package.description, package.price, package.duration_days,
+                package.max_participants, package.location, package.includes,
+                package.available_from or None, package.available_to or None
+            )
+            for package in packages
+        ]
+        try:
+            with self.db.transaction() as cursor:
+                # RETURNING respeta el orden de VALUES, así cada fila vuelve a su DTO
+                result = psycopg2.extras.execute_values(cursor, query, values, page_size=chunk_size, fetch=True)
+        except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+            raise PackageDataError(e.diag.message_primary or str(e)) from e
+        
+        for package, row in zip(packages, result):
+            package.id = str(row['id'])
+            package.created_at = row['created_at'].isoformat()
+            package.updated_at = row['updated_at'].isoformat()
+        return packages
+    
     def find_by_id(self, package_id: str) -> Optional[PackageDTO]:
         query = """
         SELECT id, name, description, price, duration_days, max_participants,
@@ -43,20 +155,33 @@ class PostgresPackageRepository(PackageRepository):
         result = self.db.execute_query(query, (package_id,), fetch=True)
         
         if result:
-            row = result[0]
-            return PackageDTO(
-                id=str(row['id']), name=row['name'], description=row['description'],
-                price=float(row['price']), duration_days=row['duration_days'],
-                max_participants=row['max_participants'], location=row['location'],
-                includes=row['includes'] or [], 
-                available_from=row['available_from'].isoformat() if row['available_from'] else "",
-                available_to=row['available_to'].isoformat() if row['available_to'] else "",
-                created_at=row['created_at'].isoformat(),
-                updated_at=row['updated_at'].isoformat(),
-                is_active=row['is_active']
-            )
+            return row_to_dto(result[0])
         return None
     
+    def find_version(self, package_id: str) -> Optional[int]:
+        query = "SELECT updated_at FROM packages WHERE id = %s AND is_active = TRUE"
+        result = self.db.execute_query(query, (package_id,), fetch=True)
+        return timestamp_to_version(result[0]['updated_at']) if result else None
+    
+    def find_by_ids(self, package_ids: List[str]) -> Dict[str, PackageDTO]:
+        """Buscar varios paquetes activos en una sola consulta; los IDs inválidos se ignoran"""
+        # UUID canónico -> ID tal como lo pidió el cliente
+        requested = {}
+        for package_id in package_ids:
+            try:
+                requested[str(uuid.UUID(package_id))] = package_id
+            except (ValueError, TypeError, AttributeError):
+                continue
+        if not requested:
+            return {}
+        
+        query = f"""
+        SELECT {', '.join(PACKAGE_COLUMNS)}
+        FROM packages WHERE id = ANY(%s::uuid[]) AND is_active = TRUE
+        """
+        result = self.db.execute_query(query, (list(requested),), fetch=True)
+        return {requested[str(row['id'])]: row_to_dto(row) for row in result}
+    
     def find_all(self) -> List[PackageDTO]:
         query = """
         SELECT id, name, description, price, duration_days, max_participants,
@@ -67,20 +192,184 @@ class PostgresPackageRepository(PackageRepository):
         """
         result = self.db.execute_query(query, fetch=True)
         
-        packages = []
-        for row in result:
-            packages.append(PackageDTO(
-                id=str(row['id']), name=row['name'], description=row['description'],
-                price=float(row['price']), duration_days=row['duration_days'],
-                max_participants=row['max_participants'], location=row['location'],
-                includes=row['includes'] or [],
-                available_from=row['available_from'].isoformat() if row['available_from'] else "",
-                available_to=row['available_to'].isoformat() if row['available_to'] else "",
-                created_at=row['created_at'].isoformat(),
-                updated_at=row['updated_at'].isoformat(),
-                is_active=row['is_active']
-            ))
-        return packages
+        return [row_to_dto(row) for row in result]
+    
+    def stream_all(self, batch_size: int = 1000) -> Iterator[PackageDTO]:
+        """Recorrer todos los paquetes activos con memoria constante"""
+        query = f"""
+        SELECT {', '.join(PACKAGE_COLUMNS)}
+        FROM packages WHERE is_active = TRUE
+        ORDER BY created_at DESC, id DESC
+        """
+        for row in self.db.stream_query(query, batch_size=batch_size):
+            yield row_to_dto(row)
+    
+    def find_page(self, limit: int, cursor: Optional[str] = None, fields: Optional[List[str]] = None,
+                  available_only: bool = False) -> PackagePageDTO:
+        """Página de paquetes activos ordenada por (created_at, id) descendente.
+
+        Usa keyset pagination sobre idx_packages_active_created: cada página
+        cuesta lo mismo sin importar qué tan adentro del catálogo esté.
+        """
+        columns = list(fields) if fields else list(PACKAGE_COLUMNS)
+        unknown = set(columns) - set(PACKAGE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        # created_at e id se necesitan siempre para construir el cursor
+        selected = list(dict.fromkeys(columns + ['created_at', 'id']))
+        
+        conditions = ["is_active = TRUE"]
+        params = []
+        if available_only:
+            conditions.append("available_from <= CURRENT_DATE AND available_to >= CURRENT_DATE")
+        if cursor:
+            conditions.append("(created_at, id) < (%s::timestamp, %s::uuid)")
+            params.extend(decode_cursor(cursor))
+        
+        query = f"""
+        SELECT {', '.join(selected)}
+        FROM packages WHERE {' AND '.join(conditions)}
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+        """
+        params.append(limit + 1)
+        result = self.db.execute_query(query, tuple(params), fetch=True)
+        
+        rows = result[:limit]
+        next_cursor = None
+        if len(result) > limit:
+            last = rows[-1]
+            next_cursor = encode_cursor(last['created_at'], last['id'])
+        return PackagePageDTO(
+            items=[row_to_dict(row, columns) for row in rows],
+            next_cursor=next_cursor,
+            limit=limit
+        )
+    
+    def search(self, criteria: PackageSearchCriteria) -> PackageSearchResultDTO:
+        """Buscar paquetes activos con filtros y texto libre.
+
+        El texto se resuelve con search_vector (índice GIN) y se ordena por
+        ts_rank; location usa el índice de trigramas para búsquedas parciales.
+        El total sale de la misma consulta con COUNT(*) OVER().
+        """
+        conditions = ["is_active = TRUE"]
+        params = []
+        rank = "0"
+        if criteria.text:
+            rank = "ts_rank(search_vector, query)"
+            conditions.append("search_vector @@ query")
+        if criteria.location:
+            conditions.append("location ILIKE %s")
+            params.append(f"%{_escape_like(criteria.location)}%")
+        if criteria.min_price is not None:
+            conditions.append("price >= %s")
+            params.append(criteria.min_price)
+        if criteria.max_price is not None:
+            conditions.append("price <= %s")
+            params.append(criteria.max_price)
+        if criteria.duration_days is not None:
+            conditions.append("duration_days = %s")
+            params.append(criteria.duration_days)
+        # Paquetes cuya disponibilidad se cruza con la ventana pedida
+        if criteria.date_from:
+            conditions.append("available_to >= %s")
+            params.append(criteria.date_from)
+        if criteria.date_to:
+            conditions.append("available_from <= %s")
+            params.append(criteria.date_to)
+        
+        source = "packages"
+        if criteria.text:
+            source = "packages, websearch_to_tsquery('spanish', %s) AS query"
+            params.insert(0, criteria.text)
+        
+        query = f"""
+        SELECT {', '.join(PACKAGE_COLUMNS)}, {rank} AS rank, COUNT(*) OVER() AS total
+        FROM {source}
+        WHERE {' AND '.join(conditions)}
+        ORDER BY rank DESC, created_at DESC, id DESC
+        LIMIT %s OFFSET %s
+        """
+        params.extend([criteria.limit, criteria.offset])
+        result = self.db.execute_query(query, tuple(params), fetch=True)
+        
+        return PackageSearchResultDTO(
+            items=[row_to_dto(row) for row in result],
+            total=result[0]['total'] if result else 0,
+            limit=criteria.limit,
+            offset=criteria.offset
+        )
+    
+    def _visibility_bound(self, lag: float):
+        """Inicio de la transacción de escritura abierta más vieja, o ahora - ``lag``.
+
+        Se lee en una sentencia previa a los datos: todo lo que confirmó antes
+        de leerlo es visible en el snapshot de la consulta siguiente.
+        """
+        return self.db.execute_query("""
+        SELECT LEAST(
+            LOCALTIMESTAMP - %s * INTERVAL '1 second',
+            (SELECT MIN(xact_start) FROM pg_stat_activity
+             WHERE backend_xid IS NOT NULL AND datname = current_database())::timestamp
+        ) AS bound
+        """, (lag,), fetch=True)[0]['bound']
+    
+    def get_catalogue_version(self, lag: float = 1.0) -> CatalogueVersionDTO:
+        """Último updated_at de toda la tabla y cantidad de paquetes activos.
+
+        Incluye filas inactivas para que un borrado también cambie la versión;
+        el máximo se resuelve con idx_packages_updated sin leer los paquetes.
+        Si una escritura abierta empezó antes de ese máximo, al confirmar
+        tendría un updated_at menor y la versión no cambiaría: en ese caso la
+        versión queda como no asentada (``settled=False``).
+        """
+        bound = self._visibility_bound(lag)
+        query = """
+        SELECT (SELECT MAX(updated_at) FROM packages) AS last_modified,
+               (SELECT COUNT(*) FROM packages WHERE is_active = TRUE) AS total,
+               CURRENT_DATE AS today
+        """
+        row = self.db.execute_query(query, fetch=True)[0]
+        return CatalogueVersionDTO(
+            last_modified=row['last_modified'], total=row['total'], today=row['today'],
+            settled=row['last_modified'] is None or row['last_modified'] < bound
+        )
+    
+    def find_changes(self, since: Optional[str] = None, limit: int = 100, lag: float = 1.0) -> PackageChangesDTO:
+        """Filas (activas o no) con (updated_at, id) posterior al cursor.
+
+        Recorre idx_packages_updated. updated_at es la hora de inicio de la
+        transacción que escribió, así que una transacción que confirma tarde
+        (una carga masiva, un UPDATE que espera un lock) puede quedar "detrás"
+        de filas ya entregadas. Por eso solo se entregan filas anteriores al
+        inicio de la transacción de escritura abierta más vieja, y además con
+        más de ``lag`` segundos de antigüedad (cubre la ventana entre que una
+        transacción empieza y obtiene su xid).
+        """
+        bound = self._visibility_bound(lag)
+        conditions = ["updated_at < %s"]
+        params = [bound]
+        if since:
+            conditions.append("(updated_at, id) > (%s::timestamp, %s::uuid)")
+            params.extend(decode_cursor(since))
+        
+        query = f"""
+        SELECT {', '.join(PACKAGE_COLUMNS)}
+        FROM packages WHERE {' AND '.join(conditions)}
+        ORDER BY updated_at, id
+        LIMIT %s
+        """
+        params.append(limit + 1)
+        result = self.db.execute_query(query, tuple(params), fetch=True)
+        
+        changes = [row_to_change(row) for row in result[:limit]]
+        return PackageChangesDTO(
+            changes=changes,
+            # Sin cambios nuevos el cliente conserva su cursor
+            next_cursor=changes[-1].cursor if changes else since,
+            has_more=len(result) > limit
+        )
     
     def update(self, package: PackageDTO) -> PackageDTO:
         query = """
@@ -103,18 +392,63 @@ class PostgresPackageRepository(PackageRepository):
         
         return package
     
+    def patch(self, package_id: str, changes: dict, expected_version: Optional[int] = None) -> Optional[PackageDTO]:
+        """UPDATE de una sola sentencia con solo las columnas recibidas.
+
+        Con ``expected_version`` la fila se actualiza únicamente si su
+        updated_at sigue siendo esa versión, así dos ediciones concurrentes no
+        se pisan: la segunda recibe StaleVersionError.
+        """
+        unknown = set(changes) - set(PATCHABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Fields cannot be updated: {', '.join(sorted(unknown))}")
+        
+        assignments = []
+        params = []
+        for column in PATCHABLE_FIELDS:
+            if column in changes:
+                assignments.append(f"{column} = %s")
+                value = changes[column]
+                # Las fechas vacías del DTO se guardan como NULL
+                params.append(value or None if column in ('available_from', 'available_to') else value)
+        assignments.append("updated_at = CURRENT_TIMESTAMP")
+        
+        conditions = ["id = %s", "is_active = TRUE"]
+        params.append(package_id)
+        if expected_version is not None:
+            conditions.append("updated_at = %s")
+            params.append(version_to_timestamp(expected_version))
+        
+        query = f"""
+        UPDATE packages SET {', '.join(assignments)}
+        WHERE {' AND '.join(conditions)}
+        RETURNING {', '.join(PACKAGE_COLUMNS)}
+        """
+        result = self.db.execute_query(query, tuple(params), fetch=True)
+        if result:
+            return row_to_dto(result[0])
+        
+        # Solo en el camino de falla: distinguir "no existe" de "versión vieja"
+        if expected_version is not None and self.db.execute_query(
+            "SELECT 1 FROM packages WHERE id = %s AND is_active = TRUE", (package_id,), fetch=True
+        ):
+            raise StaleVersionError()
+        return None
+    
     def delete(self, package_id: str) -> bool:
-        query = "UPDATE packages SET is_active = FALSE WHERE id = %s"
+        query = "UPDATE packages SET is_active = FALSE, updated_at = CURRENT_TIMESTAMP WHERE id = %s AND is_active = TRUE"
         result = self.db.execute_query(query, (package_id,))
         return result > 0
     
     def find_available(self) -> List[PackageDTO]:
         """Obtener solo paquetes disponibles"""
-        query = """
-            SELECT * FROM packages 
-            WHERE is_active = TRUE 
-            AND available_from <= CURRENT_DATE 
-            AND available_to >= CURRENT_DATE
+        query = f"""
+        SELECT {', '.join(PACKAGE_COLUMNS)}
+        FROM packages
+        WHERE is_active = TRUE
+        AND available_from <= CURRENT_DATE
+        AND available_to >= CURRENT_DATE
+        ORDER BY created_at DESC, id DESC
         """
         results = self.db.execute_query(query, fetch=True)
-        return [PackageDTO.from_dict(row) for row in results]
+        return [row_to_dto(row) for row in results]
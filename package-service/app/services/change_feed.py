@@ -0,0 +1,154 @@
+from typing import Callable, List, Optional
+from app.db.postgres_connection import PostgresConnection
+import json
+import select
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'package_changes'
+
+class WaiterLimit:
+    """Tope de long-poll y streams abiertos a la vez en ``GET /packages/changes``.
+
+    Cada espera ocupa un hilo del servidor (o del puente WSGI); pasado el tope
+    se rechaza en vez de dejar sin hilos al resto de las rutas.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._active = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def acquire(self) -> bool:
+        """Tomar un lugar sin esperar; False si ya están todos ocupados"""
+        with self._lock:
+            if self._active >= self.capacity:
+                self.rejected += 1
+                return False
+            self._active += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._active -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'active': self._active, 'capacity': self.capacity, 'rejected': self.rejected}
+
+class ChangeFeed:
+    """Escucha los NOTIFY de la tabla packages y despierta a quien espera cambios.
+
+    Un hilo mantiene una conexión dedicada con ``LISTEN package_changes``.
+    El trigger avisa una vez por sentencia (``{"ids": [...]}``, o null si
+    fueron más de 100 filas). Cada lote de avisos se entrega a los suscriptores (invalidación del cache
+    y del catálogo público) y avanza ``sequence``, que es lo que esperan los
+    long-poll y los streams SSE de ``GET /packages/changes``. Los avisos solo
+    despiertan: los datos siempre se leen del índice sobre updated_at, así que
+    un aviso perdido cuesta latencia, no cambios.
+    """
+
+    def __init__(self, db_connection: PostgresConnection, reconnect_delay: float = 1.0):
+        self.db = db_connection
+        self.reconnect_delay = reconnect_delay
+        self._subscribers = []
+        self._cond = threading.Condition()
+        self._sequence = 0
+        self._thread = None
+        self._stopped = threading.Event()
+        self.connected = False
+        self.notifications = 0
+        self._connections = 0
+
+    def subscribe(self, callback: Callable[[Optional[List[dict]]], None]):
+        """Registrar ``callback(eventos)``; recibe None si pudieron perderse avisos"""
+        self._subscribers.append(callback)
+
+    @property
+    def sequence(self) -> int:
+        return self._sequence
+
+    def wait(self, sequence: int, timeout: float) -> bool:
+        """Esperar hasta ``timeout`` a que llegue un aviso posterior a ``sequence``"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._sequence != sequence, timeout)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='package-change-feed', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        delay = self.reconnect_delay
+        while not self._stopped.is_set():
+            try:
+                connection = self.db.open_listener(CHANNEL)
+            except Exception as e:
+                logger.error(f"Error opening change feed listener: {e}")
+                self._stopped.wait(delay)
+                delay = min(delay * 2, 30)
+                continue
+
+            if self._connections:
+                # Mientras no hubo LISTEN pudieron perderse avisos
+                self._publish(None)
+            self.connected = True
+            self._connections += 1
+            delay = self.reconnect_delay
+            logger.info(f"Listening for package changes on '{CHANNEL}'")
+            try:
+                self._listen(connection)
+            except Exception as e:
+                logger.error(f"Change feed listener failed: {e}")
+            finally:
+                self.connected = False
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+    def _listen(self, connection):
+        while not self._stopped.is_set():
+            # El timeout permite notar stop() y una conexión caída sin avisos
+            if select.select([connection], [], [], 5.0) == ([], [], []):
+                cursor = connection.cursor()
+                try:
+                    cursor.execute("SELECT 1")
+                finally:
+                    cursor.close()
+            else:
+                connection.poll()
+            events = []
+            while connection.notifies:
+                notify = connection.notifies.pop(0)
+                try:
+                    events.append(json.loads(notify.payload))
+                except ValueError:
+                    logger.warning(f"Ignoring malformed change notification: {notify.payload!r}")
+            if events:
+                self.notifications += len(events)
+                self._publish(events)
+
+    def _publish(self, events: Optional[List[dict]]):
+        for callback in self._subscribers:
+            try:
+                callback(events)
+            except Exception as e:
+                logger.error(f"Error handling package change notification: {e}")
+        with self._cond:
+            self._sequence += 1
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        return {
+            'connected': self.connected,
+            'notifications': self.notifications,
+            'reconnects': max(0, self._connections - 1),
+            'sequence': self._sequence
+        }
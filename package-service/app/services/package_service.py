@@ -1,6 +1,5 @@
-import datetime
-from typing import List, Optional
-from app.dto.package_dto import PackageDTO
+from typing import Dict, Iterator, List, Optional
+from app.dto.package_dto import PackageDTO, CatalogueVersionDTO, PackageChangesDTO, PackagePageDTO, PackageSearchCriteria, PackageSearchResultDTO
 from app.repositories.package_repository import PackageRepository
 import logging
 
@@ -17,31 +16,60 @@ class PackageService:
         package = PackageDTO.from_dict(package_data)
         return self.package_repository.create(package)
     
+    def create_packages(self, packages_data: List[dict], chunk_size: int = 500) -> List[PackageDTO]:
+        """Crear varios paquetes ya validados; cada llamada es una transacción (un lote del alta masiva)"""
+        packages = [PackageDTO.from_dict(data) for data in packages_data]
+        return self.package_repository.create_many(packages, chunk_size)
+    
+    def export_packages(self, batch_size: int = 1000) -> Iterator[PackageDTO]:
+        """Recorrer el catálogo activo completo sin cargarlo en memoria"""
+        return self.package_repository.stream_all(batch_size)
+    
     def get_all_packages(self) -> List[PackageDTO]:
         """Obtener todos los paquetes activos"""
         return self.package_repository.find_all()
     
+    def get_packages_page(self, limit: int, cursor: Optional[str] = None, fields: Optional[List[str]] = None,
+                          available_only: bool = False) -> PackagePageDTO:
+        """Obtener una página de paquetes activos (o solo disponibles)"""
+        return self.package_repository.find_page(limit, cursor, fields, available_only)
+    
+    def search_packages(self, criteria: PackageSearchCriteria) -> PackageSearchResultDTO:
+        """Buscar paquetes por filtros y texto libre, ordenados por relevancia"""
+        return self.package_repository.search(criteria)
+    
+    def get_catalogue_version(self) -> CatalogueVersionDTO:
+        """Versión del catálogo para respuestas condicionales"""
+        return self.package_repository.get_catalogue_version()
+    
+    def get_changes(self, since: Optional[str] = None, limit: int = 100, lag: float = 1.0) -> PackageChangesDTO:
+        """Altas, cambios y bajas posteriores al cursor ``since``"""
+        return self.package_repository.find_changes(since, limit, lag)
+    
     def get_available_packages(self) -> List[PackageDTO]:
         """Obtener solo paquetes disponibles (público)"""
-        now = datetime.utcnow().isoformat()
-        return self.package_repository.find_available(now)
+        return self.package_repository.find_available()
     
     def get_package_by_id(self, package_id: str) -> Optional[PackageDTO]:
         """Obtener paquete por ID"""
         return self.package_repository.find_by_id(package_id)
     
-    def update_package(self, package_id: str, package_data: dict) -> Optional[PackageDTO]:
-        """Actualizar paquete existente"""
-        existing_package = self.package_repository.find_by_id(package_id)
-        if not existing_package:
-            return None
-        
-        # Actualizar campos
-        for key, value in package_data.items():
-            if hasattr(existing_package, key):
-                setattr(existing_package, key, value)
-        
-        return self.package_repository.update(existing_package)
+    def get_package_version(self, package_id: str) -> Optional[int]:
+        """Versión (ETag) de un paquete activo, sin construir el paquete"""
+        return self.package_repository.find_version(package_id)
+    
+    def get_packages_by_ids(self, package_ids: List[str]) -> Dict[str, PackageDTO]:
+        """Obtener varios paquetes por ID; los que no existen no aparecen"""
+        return self.package_repository.find_by_ids(package_ids)
+    
+    def update_package(self, package_id: str, package_data: dict,
+                       expected_version: Optional[int] = None) -> Optional[PackageDTO]:
+        """Actualizar los campos recibidos en una sola sentencia.
+
+        Lanza StaleVersionError si ``expected_version`` ya no es la vigente y
+        ValueError si se intenta cambiar un campo no editable.
+        """
+        return self.package_repository.patch(package_id, package_data, expected_version)
     
     def delete_package(self, package_id: str) -> bool:
         """Eliminar paquete (soft delete)"""
@@ -0,0 +1,93 @@
+from datetime import date
+from typing import List, Mapping, Optional, Tuple
+import os
+from app.dto.package_dto import PATCHABLE_FIELDS
+
+REQUIRED_FIELDS = ['name', 'description', 'price', 'duration_days', 'max_participants', 'location']
+# Campos que controla el servicio; un alta no puede traerlos
+READ_ONLY_FIELDS = {'id', 'created_at', 'updated_at', 'is_active', 'cost_price'}
+
+# Límites de las columnas de la tabla packages
+MAX_TEXT_LENGTH = 255
+MAX_PRICE = 99999999.99  # DECIMAL(10,2)
+MAX_INTEGER = 2147483647
+
+DEFAULT_PAGE_SIZE = int(os.environ.get('PACKAGES_PAGE_SIZE', 20))
+MAX_PAGE_SIZE = int(os.environ.get('PACKAGES_MAX_PAGE_SIZE', 100))
+
+def validate_package_data(data, partial: bool = False) -> Optional[str]:
+    """Validar los datos de un paquete; retorna el mensaje de error o None.
+
+    Con ``partial`` (actualizaciones) solo se validan los campos presentes.
+    """
+    if not isinstance(data, dict) or not data:
+        return 'No data provided'
+    
+    if not partial:
+        for field in REQUIRED_FIELDS:
+            if field not in data:
+                return f'Missing required field: {field}'
+        read_only = sorted(set(data) & READ_ONLY_FIELDS)
+        if read_only:
+            return f'Field cannot be set: {read_only[0]}'
+        unknown = sorted(set(data) - set(PATCHABLE_FIELDS))
+        if unknown:
+            return f'Unknown field: {unknown[0]}'
+    
+    for field in ('name', 'location'):
+        if field in data and (not isinstance(data[field], str) or not 0 < len(data[field]) <= MAX_TEXT_LENGTH):
+            return f'{field.capitalize()} must be a string of 1 to {MAX_TEXT_LENGTH} characters'
+    
+    if 'description' in data and not isinstance(data['description'], str):
+        return 'Description must be a string'
+    
+    if 'price' in data and (not _is_number(data['price']) or not 0 < data['price'] <= MAX_PRICE):
+        return f'Price must be a positive number up to {MAX_PRICE}'
+    
+    if 'duration_days' in data and not _is_positive_int(data['duration_days']):
+        return 'Duration days must be a positive integer'
+    
+    if 'max_participants' in data and not _is_positive_int(data['max_participants']):
+        return 'Max participants must be a positive integer'
+    
+    if 'includes' in data and (
+        not isinstance(data['includes'], list) or not all(isinstance(item, str) for item in data['includes'])
+    ):
+        return 'Includes must be a list of strings'
+    
+    dates = {}
+    for field in ('available_from', 'available_to'):
+        value = data.get(field)
+        if value in (None, ''):
+            continue
+        try:
+            dates[field] = date.fromisoformat(value)
+        except (TypeError, ValueError):
+            return f'{field} must be a date in YYYY-MM-DD format'
+    if len(dates) == 2 and dates['available_from'] > dates['available_to']:
+        return 'available_from must not be after available_to'
+    
+    return None
+
+def _is_number(value) -> bool:
+    # bool es subclase de int, pero true no es un precio
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _is_positive_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and 0 < value <= MAX_INTEGER
+
+def wants_page(args: Mapping) -> bool:
+    """La paginación es opcional: sin parámetros se mantiene la lista completa"""
+    return any(arg in args for arg in ('limit', 'cursor', 'fields'))
+
+def parse_page_params(args: Mapping) -> Tuple[int, Optional[str], Optional[List[str]]]:
+    """Leer limit, cursor y fields del query string; lanza ValueError si son inválidos"""
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+    
+    fields = [field.strip() for field in args.get('fields', '').split(',') if field.strip()]
+    return limit, args.get('cursor') or None, fields or None
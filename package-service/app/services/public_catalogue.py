@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+from app.services.package_service import PackageService
+import gzip
+import hashlib
+import orjson
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class CatalogueSnapshot:
+    """Respuesta de /packages/public ya serializada y comprimida"""
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    last_modified: Optional[datetime]
+    version: tuple
+    built_at: float
+
+class PublicCatalogue:
+    """Mantiene en memoria el cuerpo de ``GET /packages/public``.
+
+    El request no toca la base: solo entrega los bytes del último snapshot.
+    Un hilo lo reconstruye cuando este proceso escribe un paquete
+    (``invalidate``), cuando cambia la versión del catálogo (escrituras de
+    otras réplicas, revisadas cada ``refresh_interval``) y al cambiar el día,
+    que es cuando entran y salen paquetes de su ventana de disponibilidad.
+    """
+
+    def __init__(self, package_service: PackageService, refresh_interval: float = 30):
+        self.package_service = package_service
+        self.refresh_interval = refresh_interval
+        self._snapshot = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._force = False
+        self.builds = 0
+
+    def snapshot(self) -> Optional[CatalogueSnapshot]:
+        return self._snapshot
+
+    def start(self):
+        """Construir el primer snapshot y arrancar el hilo de refresco"""
+        try:
+            self.rebuild()
+        except Exception as e:
+            # Sin snapshot el endpoint sigue respondiendo desde la base
+            logger.error(f"Error warming public catalogue: {e}")
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='public-catalogue', daemon=True)
+                    self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def invalidate(self, force: bool = True):
+        """Pedir una reconstrucción después de una escritura.
+
+        Sin ``force`` solo se reconstruye si cambió la versión del catálogo
+        (avisos del feed de cambios, que también llegan por escrituras propias).
+        """
+        if force:
+            self._force = True
+        self._wakeup.set()
+
+    def rebuild(self, force: bool = True) -> bool:
+        # La versión se lee antes que los datos, igual que en las respuestas condicionales
+        version = self.package_service.get_catalogue_version()
+        # Una versión no asentada no se recuerda: la próxima revisión reconstruye
+        key = (version.version, version.total, version.today) if version.settled else None
+        current = self._snapshot
+        if not force and current is not None and key is not None and current.version == key:
+            return False
+
+        packages = self.package_service.get_available_packages()
+        body = orjson.dumps(
+            {'packages': [package.to_public_dict() for package in packages], 'total': len(packages)}
+        )
+        self._snapshot = CatalogueSnapshot(
+            body=body,
+            gzip_body=gzip.compress(body, compresslevel=6, mtime=0),
+            etag=hashlib.sha256(body).hexdigest()[:32],
+            last_modified=version.last_modified if version.settled else None,
+            version=key,
+            built_at=time.time()
+        )
+        self.builds += 1
+        logger.info(f"Public catalogue rebuilt with {len(packages)} packages ({len(body)} bytes)")
+        return True
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self._seconds_until_next_check())
+            self._wakeup.clear()
+            force, self._force = self._force, False
+            if self._stopped.is_set():
+                break
+            try:
+                self.rebuild(force=force)
+            except Exception as e:
+                logger.error(f"Error rebuilding public catalogue: {e}")
+
+    def _seconds_until_next_check(self) -> float:
+        # Despertar justo después de medianoche (UTC, como CURRENT_DATE en la base)
+        now = datetime.utcnow()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        return max(0.0, min(self.refresh_interval, (midnight - now).total_seconds() + 1))
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            'ready': snapshot is not None,
+            'builds': self.builds,
+            'bytes': len(snapshot.body) if snapshot else 0,
+            'gzip_bytes': len(snapshot.gzip_body) if snapshot else 0,
+            'age_seconds': round(time.time() - snapshot.built_at, 3) if snapshot else None
+        }
@@ -0,0 +1,97 @@
+"""Benchmark de requests/seg con muchas conexiones concurrentes.
+
+Uso:
+    # Levantar el servicio dos veces, una por modo
+    SERVER_MODE=wsgi SERVICE_PORT=5002 python main.py
+    SERVER_MODE=asgi SERVICE_PORT=5012 python main.py
+
+    python benchmarks/async_benchmark.py http://localhost:5002 http://localhost:5012 \\
+        [--path /packages/public] [--concurrency 1000] [--duration 30] [--token <jwt>]
+
+Cada URL base se mide por separado: ``concurrency`` clientes con conexión
+propia piden ``path`` en bucle durante ``duration`` segundos. Se reportan
+requests/seg, latencias p50/p95/p99 y errores (timeouts, conexiones
+rechazadas y respuestas distintas de 200/304).
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+async def _client(session, url, headers, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            async with session.get(url, headers=headers) as response:
+                await response.read()
+                if response.status not in (200, 304):
+                    errors['status'] += 1
+                    continue
+        except asyncio.TimeoutError:
+            errors['timeout'] += 1
+            continue
+        except aiohttp.ClientError:
+            errors['connection'] += 1
+            # Sin pausa, un servidor caído convierte el benchmark en un bucle ocupado
+            await asyncio.sleep(0.05)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+async def run(base_url: str, args) -> dict:
+    url = base_url.rstrip('/') + args.path
+    headers = {'Accept-Encoding': 'gzip'}
+    if args.token:
+        headers['Authorization'] = f'Bearer {args.token}'
+
+    # Una conexión por cliente, como 1k navegadores distintos
+    connector = aiohttp.TCPConnector(limit=args.concurrency, force_close=False)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    latencies = []
+    errors = {'status': 0, 'timeout': 0, 'connection': 0}
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # Calentar la conexión y los caches del servicio
+        async with session.get(url, headers=headers) as response:
+            await response.read()
+
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(
+            _client(session, url, headers, deadline, latencies, errors) for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'url': url,
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50': _percentile(latencies, 0.50),
+        'p95': _percentile(latencies, 0.95),
+        'p99': _percentile(latencies, 0.99),
+        'errors': errors
+    }
+
+async def main(args):
+    for base_url in args.base_urls:
+        result = await run(base_url, args)
+        errors = ', '.join(f"{name}={count}" for name, count in result['errors'].items())
+        print(f"{result['url']}")
+        print(f"  {result['requests']} requests, {result['rps']:.1f} req/s")
+        print(f"  latency p50={result['p50']:.1f} ms  p95={result['p95']:.1f} ms  p99={result['p99']:.1f} ms")
+        print(f"  errors: {errors}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('base_urls', nargs='+')
+    parser.add_argument('--path', default='/packages/public')
+    parser.add_argument('--concurrency', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--token')
+    asyncio.run(main(parser.parse_args()))
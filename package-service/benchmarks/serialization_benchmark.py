@@ -0,0 +1,104 @@
+"""Benchmark del costo de serializar paquetes, por cada 1000 filas.
+
+Uso:
+    python benchmarks/serialization_benchmark.py [--packages 1000] [--rounds 50]
+
+Compara el camino anterior (mapeo campo a campo a un dataclass, asdict y
+el encoder JSON de la stdlib) con el actual (row_to_dto sobre el DTO con
+__slots__ y orjson serializando los DTO directamente).
+"""
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from app.repositories.postgres_package_repository import row_to_dto
+
+@dataclass
+class LegacyPackageDTO:
+    """El DTO tal como estaba antes: sin slots y serializado con asdict"""
+    id: Optional[str] = None
+    name: str = ""
+    description: str = ""
+    price: float = 0.0
+    duration_days: int = 0
+    max_participants: int = 0
+    location: str = ""
+    includes: List[str] = field(default_factory=list)
+    available_from: str = ""
+    available_to: str = ""
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    is_active: bool = True
+    cost_price: Optional[float] = None
+
+def legacy_row_to_dto(row):
+    return LegacyPackageDTO(
+        id=str(row['id']), name=row['name'], description=row['description'],
+        price=float(row['price']), duration_days=row['duration_days'],
+        max_participants=row['max_participants'], location=row['location'],
+        includes=row['includes'] or [],
+        available_from=row['available_from'].isoformat() if row['available_from'] else "",
+        available_to=row['available_to'].isoformat() if row['available_to'] else "",
+        created_at=row['created_at'].isoformat(),
+        updated_at=row['updated_at'].isoformat(),
+        is_active=row['is_active']
+    )
+
+def make_rows(count):
+    now = datetime.utcnow()
+    return [
+        {
+            'id': uuid.uuid4(), 'name': f'Paquete {i}',
+            'description': 'Recorrido por las iglesias y plazas del centro histórico. ' * 3,
+            'price': Decimal('45.99'), 'duration_days': 3, 'max_participants': 15,
+            'location': 'Centro Histórico, Quito',
+            'includes': ['Guía turístico certificado', 'Transporte local', 'Entrada a iglesias'],
+            'available_from': date(2025, 1, 1), 'available_to': date(2025, 12, 31),
+            'created_at': now, 'updated_at': now, 'is_active': True
+        }
+        for i in range(count)
+    ]
+
+def bench(fn, rows, rounds):
+    fn(rows)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(rows)
+    return (time.perf_counter() - start) / rounds
+
+def legacy(rows):
+    packages = [legacy_row_to_dto(row) for row in rows]
+    return json.dumps({'packages': [asdict(package) for package in packages], 'total': len(packages)}).encode('utf-8')
+
+def current(rows):
+    packages = [row_to_dto(row) for row in rows]
+    return orjson.dumps({'packages': packages, 'total': len(packages)})
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--packages', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    rows = make_rows(args.packages)
+    scale = 1000 / args.packages
+    before = bench(legacy, rows, args.rounds) * scale
+    after = bench(current, rows, args.rounds) * scale
+
+    print(f"{'camino':<28}{'ms / 1k paquetes':>18}")
+    print(f"{'asdict + json (antes)':<28}{before * 1000:>18.2f}")
+    print(f"{'slots + orjson (ahora)':<28}{after * 1000:>18.2f}")
+    print(f"{'mejora':<28}{before / after:>17.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,37 @@
 import os
 import logging
+import migrate
 from app import create_app
-from app.controllers.package_controller import package_bp
+from app.db.postgres_connection import PostgresConnection
 from consul_register import ConsulServiceRegistry
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
 def main():
+    # Migrar el esquema antes de que el controller abra el pool y lea la tabla
+    if os.environ.get('MIGRATE_ON_START', 'true').lower() == 'true':
+        migrate.run(
+            MIGRATIONS_DIR, PostgresConnection().config,
+            with_seed=os.environ.get('SEED_SAMPLE_DATA', 'false').lower() == 'true'
+        )
+    from app.controllers.package_controller import package_bp, public_catalogue, change_feed
+    
     # Crear aplicación Flask
     app = create_app()
     
     # Registrar blueprints
     app.register_blueprint(package_bp)
     
+    # Precalcular el catálogo público antes de recibir tráfico
+    public_catalogue.start()
+    
+    # Escuchar los cambios de paquetes (también de otras réplicas)
+    change_feed.start()
+    
     # Registrar servicio en Consul
     registry = ConsulServiceRegistry()
     registry.register_service()
@@ -24,10 +41,22 @@ def main():
     port = int(os.environ.get('SERVICE_PORT', 5002))
     debug = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
     
-    logger.info(f"Package Service starting on {host}:{port}")
+    # wsgi: servidor de Flask; asgi: lecturas en asyncio y el resto en Flask
+    server_mode = os.environ.get('SERVER_MODE', 'wsgi').lower()
+    
+    logger.info(f"Package Service starting on {host}:{port} ({server_mode})")
     
     # Iniciar aplicación
-    app.run(host=host, port=port, debug=debug)
+    if server_mode == 'asgi':
+        import uvicorn
+        from app.asgi import create_asgi_app
+        uvicorn.run(
+            create_asgi_app(app), host=host, port=port,
+            backlog=int(os.environ.get('ASGI_BACKLOG', 2048)),
+            log_level='debug' if debug else 'info'
+        )
+    else:
+        app.run(host=host, port=port, debug=debug)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,38 @@
+-- Tabla de paquetes e índices de lectura.
+-- IF NOT EXISTS: las bases creadas antes de las migraciones ya tienen este esquema.
+
+CREATE TABLE IF NOT EXISTS packages (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    name VARCHAR(255) NOT NULL,
+    description TEXT,
+    price DECIMAL(10,2) NOT NULL CHECK (price > 0),
+    duration_days INTEGER NOT NULL CHECK (duration_days > 0),
+    max_participants INTEGER NOT NULL CHECK (max_participants > 0),
+    location VARCHAR(255) NOT NULL,
+    includes TEXT[],
+    available_from DATE,
+    available_to DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    is_active BOOLEAN DEFAULT TRUE
+);
+
+CREATE INDEX IF NOT EXISTS idx_packages_active ON packages(is_active);
+CREATE INDEX IF NOT EXISTS idx_packages_location ON packages(location);
+CREATE INDEX IF NOT EXISTS idx_packages_active_created
+    ON packages(created_at DESC, id DESC) WHERE is_active = TRUE;
+CREATE INDEX IF NOT EXISTS idx_packages_price ON packages(price);
+CREATE INDEX IF NOT EXISTS idx_packages_duration ON packages(duration_days);
+CREATE INDEX IF NOT EXISTS idx_packages_updated ON packages(updated_at, id);
+
+-- updated_at al día también en UPDATE hechos fuera del servicio
+CREATE OR REPLACE FUNCTION update_updated_at_column() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER update_packages_updated_at
+    BEFORE UPDATE ON packages
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
@@ -0,0 +1,11 @@
+-- Búsqueda de texto: nombre con más peso que la descripción
+ALTER TABLE packages ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(description, '')), 'B')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS idx_packages_search ON packages USING GIN(search_vector);
+
+-- Trigramas para filtrar location por coincidencia parcial
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_packages_location_trgm ON packages USING GIN(location gin_trgm_ops);
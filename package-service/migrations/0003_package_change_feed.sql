@@ -0,0 +1,17 @@
+-- Feed de cambios: aviso por NOTIFY al confirmar cada alta, cambio o baja
+CREATE OR REPLACE FUNCTION notify_package_change() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('package_changes', json_build_object(
+        'id', NEW.id,
+        'type', CASE WHEN TG_OP = 'INSERT' THEN 'create'
+                     WHEN NOT NEW.is_active THEN 'delete'
+                     ELSE 'update' END,
+        'updated_at', NEW.updated_at
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER packages_notify_change
+    AFTER INSERT OR UPDATE ON packages
+    FOR EACH ROW EXECUTE FUNCTION notify_package_change();
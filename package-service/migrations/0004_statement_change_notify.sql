@@ -0,0 +1,37 @@
+-- Feed de cambios: un aviso por sentencia en vez de uno por fila.
+-- Los avisos solo despiertan a quien espera (los datos se releen de la tabla),
+-- así que una carga masiva no necesita miles de payloads. Hasta 100 IDs viajan
+-- en el aviso para invalidar el cache puntualmente; con más, "ids" es null y el
+-- cache se vacía entero. NOTIFY descarta payloads idénticos de una misma
+-- transacción, así que una carga grande en varios lotes llega como un aviso.
+-- Las tablas de transición no admiten triggers con más de un evento: uno por evento.
+
+CREATE OR REPLACE FUNCTION notify_package_statement() RETURNS TRIGGER AS $$
+DECLARE
+    changed INTEGER;
+    ids JSON;
+BEGIN
+    SELECT COUNT(*) INTO changed FROM changed_packages;
+    IF changed = 0 THEN
+        RETURN NULL;
+    END IF;
+    IF changed <= 100 THEN
+        SELECT json_agg(id) INTO ids FROM changed_packages;
+    END IF;
+    PERFORM pg_notify('package_changes', json_build_object('ids', ids)::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS packages_notify_change ON packages;
+DROP FUNCTION IF EXISTS notify_package_change();
+
+CREATE OR REPLACE TRIGGER packages_notify_insert
+    AFTER INSERT ON packages
+    REFERENCING NEW TABLE AS changed_packages
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_package_statement();
+
+CREATE OR REPLACE TRIGGER packages_notify_update
+    AFTER UPDATE ON packages
+    REFERENCING NEW TABLE AS changed_packages
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_package_statement();
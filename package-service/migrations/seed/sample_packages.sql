@@ -0,0 +1,62 @@
+-- Paquetes de ejemplo para entornos de desarrollo (SEED_SAMPLE_DATA=true).
+-- Solo se insertan si la tabla está vacía, así el script puede correr en cada arranque.
+
+INSERT INTO packages (name, description, price, duration_days, max_participants, location, includes, available_from, available_to)
+SELECT * FROM (VALUES
+    (
+        'Tour Centro Histórico de Quito',
+        'Recorrido por las iglesias y plazas más emblemáticas del centro histórico de Quito, Patrimonio de la Humanidad.',
+        45.99,
+        1,
+        15,
+        'Centro Histórico, Quito',
+        ARRAY['Guía turístico certificado', 'Transporte local', 'Entrada a iglesias', 'Mapa y material informativo'],
+        DATE '2025-01-01',
+        DATE '2025-12-31'
+    ),
+    (
+        'Mitad del Mundo y Pululahua',
+        'Visita al monumento ecuatorial y al cráter del volcán Pululahua con almuerzo típico incluido.',
+        65.00,
+        1,
+        20,
+        'Mitad del Mundo, Quito',
+        ARRAY['Transporte ida y vuelta', 'Guía especializado', 'Entrada al museo', 'Almuerzo típico', 'Actividades interactivas'],
+        '2025-01-01',
+        '2025-12-31'
+    ),
+    (
+        'TelefériQo y Cruz Loma',
+        'Ascenso en teleférico hasta los 4,100 metros de altura con vistas panorámicas de Quito y los volcanes.',
+        55.50,
+        1,
+        12,
+        'TelefériQo, Quito',
+        ARRAY['Boleto del teleférico', 'Guía de montaña', 'Equipo de seguridad', 'Refrigerio', 'Seguro de accidentes'],
+        '2025-01-01',
+        '2025-12-31'
+    ),
+    (
+        'Quito Colonial Nocturno',
+        'Tour nocturno por el centro histórico de Quito con iluminación especial y cena en restaurante tradicional.',
+        75.00,
+        1,
+        10,
+        'Centro Histórico, Quito',
+        ARRAY['Guía nocturno especializado', 'Transporte privado', 'Cena típica', 'Bebidas tradicionales', 'Espectáculo folclórico'],
+        '2025-01-01',
+        '2025-12-31'
+    ),
+    (
+        'Mercados y Gastronomía Quiteña',
+        'Recorrido gastronómico por mercados tradicionales con degustación de platos típicos ecuatorianos.',
+        40.00,
+        1,
+        8,
+        'Mercados de Quito',
+        ARRAY['Guía gastronómico', 'Degustaciones múltiples', 'Recetario digital', 'Transporte entre mercados'],
+        '2025-01-01',
+        '2025-12-31'
+    )
+) AS sample (name, description, price, duration_days, max_participants, location, includes, available_from, available_to)
+WHERE NOT EXISTS (SELECT 1 FROM packages);
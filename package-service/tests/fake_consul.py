@@ -0,0 +1,98 @@
+"""Consul de mentira para pruebas: solo ``GET /v1/health/service/<nombre>``.
+
+Implementa las blocking queries como el real: con ``index`` igual al actual
+la respuesta espera hasta que el servicio cambie o pase ``wait``, y cada
+respuesta trae ``X-Consul-Index``. ``failing = True`` simula un Consul caído.
+"""
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+WAIT_FORMAT = re.compile(r'^(\d+(?:\.\d+)?)(ms|s|m)?$')
+WAIT_UNITS = {'ms': 0.001, 's': 1, 'm': 60, None: 1}
+
+def _parse_wait(value: str) -> float:
+    match = WAIT_FORMAT.match(value or '')
+    if not match:
+        return 300.0
+    return float(match.group(1)) * WAIT_UNITS[match.group(2)]
+
+class FakeConsul:
+    def __init__(self):
+        self.index = 1
+        self.failing = False
+        self.requests = 0
+        self._services = {}
+        self._cond = threading.Condition()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._cond.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def set_instances(self, service: str, instances: list):
+        """Reemplazar las instancias sanas: lista de (id, dirección, puerto)"""
+        with self._cond:
+            self._services[service] = list(instances)
+            self.index += 1
+            self._cond.notify_all()
+
+    def _health(self, service: str, index: int, wait: float):
+        with self._cond:
+            if index and index >= self.index:
+                self._cond.wait_for(lambda: self.index > index, wait)
+            nodes = [
+                {'Node': {'Address': address}, 'Service': {'ID': service_id, 'Address': address, 'Port': port}}
+                for service_id, address, port in self._services.get(service, [])
+            ]
+            return self.index, nodes
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                with fake._cond:
+                    fake.requests += 1
+                if fake.failing or not url.path.startswith('/v1/health/service/'):
+                    self.send_response(500 if fake.failing else 404)
+                    self.end_headers()
+                    return
+                query = parse_qs(url.query)
+                index, nodes = fake._health(
+                    url.path.rsplit('/', 1)[1],
+                    int(query.get('index', ['0'])[0]),
+                    _parse_wait(query.get('wait', [''])[0])
+                )
+                body = json.dumps(nodes).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('X-Consul-Index', str(index))
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
@@ -0,0 +1,106 @@
+"""Versiones del catálogo y de un paquete contra un PostgreSQL de pruebas.
+
+Necesitan ``TEST_DATABASE_URL``; la tabla se crea con la migración 0001 en
+un esquema temporal que se borra al terminar.
+"""
+import os
+import time
+import uuid
+from pathlib import Path
+
+import psycopg2
+import pytest
+
+from app.db.postgres_connection import PostgresConnection
+from app.dto.package_dto import PackageDTO
+from app.repositories.postgres_package_repository import PostgresPackageRepository
+
+DATABASE_URL = os.environ.get('TEST_DATABASE_URL', '').replace('+psycopg2', '')
+MIGRATION = Path(__file__).resolve().parent.parent / 'migrations' / '0001_create_packages.sql'
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason='TEST_DATABASE_URL is not set')
+
+def _package(name: str) -> PackageDTO:
+    return PackageDTO(
+        id=None, name=name, description='', price=100.0, duration_days=3,
+        max_participants=10, location='Cusco', includes=[],
+        available_from='2026-01-01', available_to='2027-12-31'
+    )
+
+@pytest.fixture
+def schema():
+    name = f'test_{uuid.uuid4().hex[:12]}'
+    admin = psycopg2.connect(DATABASE_URL)
+    admin.autocommit = True
+    with admin.cursor() as cursor:
+        cursor.execute(f'CREATE SCHEMA {name}')
+        cursor.execute(f'SET search_path TO {name}, public')
+        cursor.execute(MIGRATION.read_text())
+    yield name
+    with admin.cursor() as cursor:
+        cursor.execute(f'DROP SCHEMA {name} CASCADE')
+    admin.close()
+
+@pytest.fixture
+def connect(schema):
+    opened = []
+
+    def connect():
+        connection = psycopg2.connect(DATABASE_URL, options=f'-c search_path={schema}')
+        opened.append(connection)
+        return connection
+
+    yield connect
+    for connection in opened:
+        connection.close()
+
+@pytest.fixture
+def repository(schema):
+    db = PostgresConnection()
+    db.config = {'dsn': DATABASE_URL, 'options': f'-c search_path={schema}'}
+    db.connect()
+    yield PostgresPackageRepository(db)
+    db.disconnect()
+
+def test_version_is_unsettled_while_an_older_write_is_open(repository, connect):
+    first = repository.create(_package('Machu Picchu'))
+    slow = connect()
+    with slow.cursor() as cursor:
+        # La transacción empieza aquí y su updated_at queda en este instante
+        cursor.execute("SELECT 1")
+        time.sleep(0.05)
+        cursor.execute("UPDATE packages SET name = 'Machu Picchu clásico' WHERE id = %s", (first.id,))
+    time.sleep(0.05)
+    repository.create(_package('Valle Sagrado'))
+
+    during = repository.get_catalogue_version(lag=0)
+    assert not during.settled
+
+    slow.commit()
+    after = repository.get_catalogue_version(lag=0)
+    assert after.settled
+    # El contenido cambió sin mover el máximo ni el total: por eso la
+    # versión anterior no podía entregarse como ETag
+    assert (after.version, after.total) == (during.version, during.total)
+
+def test_settled_version_changes_with_every_later_commit(repository, connect):
+    repository.create(_package('Machu Picchu'))
+    before = repository.get_catalogue_version(lag=0)
+    assert before.settled
+
+    writer = connect()
+    with writer.cursor() as cursor:
+        cursor.execute("UPDATE packages SET price = 120")
+    writer.commit()
+
+    after = repository.get_catalogue_version(lag=0)
+    assert after.settled
+    assert after.version != before.version
+
+def test_find_version_reads_only_active_packages(repository):
+    package = repository.create(_package('Machu Picchu'))
+    assert repository.find_version(package.id) == repository.find_by_id(package.id).version
+
+    repository.delete(package.id)
+    assert repository.find_version(package.id) is None
+    assert repository.find_version(str(uuid.uuid4())) is None
@@ -0,0 +1,219 @@
+"""Migraciones versionadas del esquema PostgreSQL, compartidas por los servicios.
+
+Este archivo es la única copia: cada imagen lo recibe desde el contexto de
+build ``shared`` (ver los Dockerfile) y cada servicio le pasa su propio
+directorio de migraciones y su conexión.
+
+Uso, desde el directorio del servicio:
+    python migrate.py            # aplicar ./migrations
+    python migrate.py --status   # listar aplicadas y pendientes
+    python migrate.py --seed     # migrar y cargar migrations/seed/*.sql
+    python migrate.py --dir otra/carpeta
+
+Cada archivo ``migrations/NNNN_descripcion.sql`` se aplica una sola vez, en
+su propia transacción, y queda registrado en ``schema_migrations``. Si no hay
+pendientes el arranque solo hace una consulta, sin locks de catálogo. Si las
+hay, se toma un advisory lock para que las réplicas que arrancan a la vez no
+apliquen la misma migración dos veces: las demás esperan y luego ven el
+esquema al día.
+
+Desde la línea de comandos la conexión sale de ``DATABASE_URL`` o, si no
+está, de las variables PG_*; ``PG_DATABASE`` es obligatoria para no migrar
+por error la base de otro servicio.
+"""
+import argparse
+import glob
+import hashlib
+import logging
+import os
+import re
+import sys
+import time
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.sql$')
+# Clave del advisory lock; los advisory locks son por base de datos
+LOCK_ID = 7428013659
+
+def settings_from_env() -> dict:
+    """Parámetros de psycopg2.connect desde DATABASE_URL o PG_*"""
+    database_url = os.environ.get('DATABASE_URL')
+    if database_url:
+        return {'dsn': database_url}
+    database = os.environ.get('PG_DATABASE')
+    if not database:
+        raise RuntimeError("Set DATABASE_URL or PG_DATABASE to choose the database to migrate")
+    return {
+        'host': os.environ.get('PG_HOST', 'localhost'),
+        'database': database,
+        'user': os.environ.get('PG_USER', 'postgres'),
+        'password': os.environ.get('PG_PASSWORD', 'postgres'),
+        'port': int(os.environ.get('PG_PORT', 5432))
+    }
+
+def connect(settings: dict, retries: int = None):
+    """Abrir una conexión, esperando a que la base acepte conexiones"""
+    retries = retries or int(os.environ.get('PG_CONNECT_RETRIES', 30))
+    delay = 0.5
+    for attempt in range(1, retries + 1):
+        try:
+            return psycopg2.connect(connect_timeout=5, **settings)
+        except psycopg2.OperationalError as e:
+            if attempt == retries:
+                raise
+            logger.info(f"Waiting for database ({attempt}/{retries}): {e}")
+            time.sleep(delay)
+            delay = min(delay * 2, 5)
+
+def discover(directory: str) -> list:
+    """Migraciones del directorio como (versión, nombre, ruta), en orden"""
+    migrations = []
+    for path in glob.glob(os.path.join(directory, '*.sql')):
+        match = MIGRATION_FILE.match(os.path.basename(path))
+        if not match:
+            logger.warning(f"Ignoring file with unexpected name: {path}")
+            continue
+        migrations.append((int(match.group(1)), match.group(2), path))
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError("Duplicate migration versions in " + directory)
+    return migrations
+
+def _read(path: str) -> str:
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+def _checksum(sql: str) -> str:
+    return hashlib.sha256(sql.encode('utf-8')).hexdigest()
+
+def _applied(connection) -> dict:
+    """{versión: checksum} de lo ya aplicado; vacío si la tabla aún no existe"""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('schema_migrations')")
+        if cursor.fetchone()[0] is None:
+            return {}
+        cursor.execute("SELECT version, checksum FROM schema_migrations")
+        return dict(cursor.fetchall())
+
+def migrate(connection, directory: str) -> int:
+    """Aplicar las migraciones pendientes; retorna cuántas se aplicaron"""
+    migrations = discover(directory)
+    connection.autocommit = True
+
+    # Camino rápido: con el esquema al día no se toma ningún lock
+    applied = _applied(connection)
+    if all(version in applied for version, _, _ in migrations):
+        logger.info("Database schema is up to date")
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", (LOCK_ID,))
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    name VARCHAR(255) NOT NULL,
+                    checksum CHAR(64) NOT NULL,
+                    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+        # Releer con el lock tomado: otra réplica pudo migrar mientras se esperaba
+        applied = _applied(connection)
+        count = 0
+        for version, name, path in migrations:
+            sql = _read(path)
+            if version in applied:
+                if applied[version].strip() != _checksum(sql):
+                    logger.warning(f"Migration {version}_{name} changed after being applied")
+                continue
+            logger.info(f"Applying migration {version}_{name}")
+            connection.autocommit = False
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(sql)
+                    cursor.execute(
+                        "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                        (version, name, _checksum(sql))
+                    )
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                logger.error(f"Migration {version}_{name} failed")
+                raise
+            finally:
+                connection.autocommit = True
+            count += 1
+        logger.info(f"Applied {count} migrations")
+        return count
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (LOCK_ID,))
+
+def seed(connection, directory: str) -> int:
+    """Ejecutar los scripts de datos de ejemplo; deben ser idempotentes"""
+    paths = sorted(glob.glob(os.path.join(directory, '*.sql')))
+    connection.autocommit = False
+    try:
+        with connection.cursor() as cursor:
+            for path in paths:
+                logger.info(f"Running seed {os.path.basename(path)}")
+                cursor.execute(_read(path))
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.autocommit = True
+    return len(paths)
+
+def run(directory: str, settings: dict, with_seed: bool = False) -> int:
+    """Migrar (y opcionalmente sembrar ``directory/seed``) con una conexión propia.
+
+    Es lo que llama cada servicio al arrancar, con su carpeta de migraciones
+    y los mismos parámetros de conexión que usa su aplicación.
+    """
+    connection = connect(settings)
+    try:
+        count = migrate(connection, directory)
+        if with_seed:
+            seed(connection, os.path.join(directory, 'seed'))
+        return count
+    finally:
+        connection.close()
+
+def status(connection, directory: str):
+    applied = _applied(connection)
+    for version, name, _ in discover(directory):
+        print(f"{version:04d}_{name}: {'applied' if version in applied else 'pending'}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--dir', default='migrations', help='Carpeta de migraciones del servicio')
+    parser.add_argument('--status', action='store_true')
+    parser.add_argument('--seed', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    directory = os.path.abspath(args.dir)
+    try:
+        settings = settings_from_env()
+        if args.status:
+            connection = connect(settings)
+            try:
+                status(connection, directory)
+            finally:
+                connection.close()
+        else:
+            run(directory, settings, with_seed=args.seed)
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())